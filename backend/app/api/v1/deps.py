@@ -14,7 +14,7 @@ from ...db import models
 
 def get_current_user_from_db(
     current_user: Dict[str, Any] = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ) -> models.User:
     """
     Get the current user object from database.
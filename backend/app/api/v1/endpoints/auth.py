@@ -119,7 +119,7 @@ class SignupRequest(BaseModel):
 @router.post("/login", response_model=LoginResponse)
 async def login(
     request: LoginRequest,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """
     Exchange Auth0 token for application JWT token.
@@ -200,7 +200,7 @@ async def login(
 @router.post("/signup", response_model=LoginResponse)
 async def signup(
     request: SignupRequest,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """
     Create a new user account with Auth0 token.
@@ -286,7 +286,7 @@ async def signup(
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """
     Get current authenticated user information.
@@ -321,7 +321,7 @@ async def get_current_user_info(
 @router.post("/refresh", response_model=TokenResponse)
 async def refresh_token(
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """
     Refresh JWT access token.
@@ -21,7 +21,7 @@ async def list_campaigns(
     skip: int = 0,
     limit: int = 50,
     current_user: dict = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """List all campaigns for the current user."""
     await init_db()
@@ -31,7 +31,7 @@ async def list_campaigns(
 async def create_campaign(
     campaign: schemas.CampaignCreate,
     current_user: dict = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """Create a new outreach campaign."""
     await init_db()
@@ -41,7 +41,7 @@ async def create_campaign(
 async def get_campaign(
     campaign_id: str,
     current_user: dict = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """Get specific campaign details."""
     await init_db()
@@ -54,7 +54,7 @@ async def get_campaign(
 async def delete_campaign(
     campaign_id: str,
     current_user: dict = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """Delete a campaign."""
     await init_db()
@@ -71,7 +71,7 @@ async def delete_campaign(
 async def list_campaign_drafts(
     campaign_id: str,
     current_user: dict = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """List all email drafts in a campaign."""
     await init_db()
@@ -87,7 +87,7 @@ async def update_draft(
     draft_id: str,
     draft_update: schemas.EmailDraftUpdate,
     current_user: dict = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """Update a specific email draft."""
     await init_db()
@@ -106,7 +106,7 @@ async def generate_drafts_batch(
     campaign_id: str,
     company_ids: List[str],
     current_user: dict = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """
     Trigger AI generation for drafts for selected companies.
@@ -153,7 +153,7 @@ async def generate_selected_drafts(
     campaign_id: str,
     draft_ids: List[str],
     current_user: dict = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """
     Trigger AI generation for specific selected drafts.
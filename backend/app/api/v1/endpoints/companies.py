@@ -34,7 +34,7 @@ class CompaniesListResponse(BaseModel):
 @router.get("/stats", response_model=DashboardStats)
 async def get_dashboard_stats(
     current_user: dict = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """Get dashboard statistics for the current user."""
     await init_db()
@@ -61,7 +61,7 @@ async def list_companies(
     only_embedded: bool = Query(False, description="Only show companies with embedded data"),
     crawled_status_filter: Optional[str] = Query(None, description="Filter by crawled status: 'all', 'crawled_only'"),
     current_user: dict = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """List companies for the current user."""
     await init_db()
@@ -78,7 +78,7 @@ async def list_companies(
             search_query=search,
             skip=skip,
             limit=limit,
-            crawled_only=crawled_only_filter # Pass filter to search if implemented
+            crawled_only=crawled_only_filter
         )
         # For search, we don't have an easy way to get total count yet without extra query
         total = len(companies) # Approximation for now if search is used
@@ -166,7 +166,7 @@ async def list_companies(
 async def get_company_by_domain(
     domain: str,
     current_user: dict = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """Get a specific company by domain or base name with all related data from MongoDB."""
     # Initialize MongoDB
@@ -242,7 +242,7 @@ async def get_company_by_domain(
 def get_company(
     company_id: int,
     current_user: dict = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """Get a specific company with all related data."""
     # Legacy SQL ID support
@@ -250,7 +250,7 @@ def get_company(
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    company = crud.get_company(db, company_id)
+    company = crud.get_company_with_relations(db, company_id)
     if not company:
         raise HTTPException(status_code=404, detail="Company not found")
 
@@ -265,7 +265,7 @@ def get_company(
 async def create_company(
     company: schemas.CompanyCreate,
     current_user: dict = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """Create a new company in both SQL and MongoDB."""
     await init_db()
@@ -273,15 +273,14 @@ async def create_company(
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    # Check if domain already exists (SQL)
-    existing = crud.get_company_by_domain(db, company.domain)
-    if existing:
+    # 1. Create in SQL (no-op if the domain already exists)
+    company.user_id = user.id # Set internal integer ID
+    sql_company = crud.create_company_if_absent(db, company)
+    if not sql_company:
         raise HTTPException(status_code=400, detail="Company with this domain already exists")
+    # Commit before the Mongo write so Mongo never holds a company SQL lacks
+    db.commit()
 
-    # 1. Create in SQL
-    company.user_id = user.id # Set internal integer ID
-    sql_company = crud.create_company(db, company)
-    
     # 2. Create in MongoDB
     mongo_data = {
         "user_id": current_user["sub"], # Auth0 ID
@@ -301,7 +300,7 @@ def update_company(
     company_id: int,
     company_update: schemas.CompanyUpdate,
     current_user: dict = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """Update a company (SQL only for now, TODO: Sync to Mongo)."""
     user = user_crud.get_user_by_auth0_id(db, current_user["sub"])
@@ -324,7 +323,7 @@ def update_company(
 async def delete_company(
     company_id_or_domain: str,
     current_user: dict = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """Delete a company from both SQL and MongoDB. Accepts ID or Domain."""
     await init_db()
@@ -368,7 +367,7 @@ async def get_company_contacts(
     company_id: int,
     contact_type: Optional[str] = None,
     current_user: dict = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """Get contacts for a company from MongoDB."""
     # Initialize MongoDB
@@ -401,7 +400,7 @@ def create_contact(
     company_id: int,
     contact: schemas.ContactBase,
     current_user: dict = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """Create a contact for a company."""
     user = user_crud.get_user_by_auth0_id(db, current_user["sub"])
@@ -420,7 +419,7 @@ def create_contact(
 def get_enrichment_history(
     company_id: int,
     current_user: dict = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """Get enrichment history for a company."""
     user = user_crud.get_user_by_auth0_id(db, current_user["sub"])
@@ -438,7 +437,7 @@ def get_enrichment_history(
 async def crawl_company(
     company_id: Union[str, int],
     current_user: dict = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """
     Trigger crawling for a specific company (MongoDB only storage).
@@ -502,7 +501,7 @@ async def crawl_company(
 async def crawl_companies_batch(
     company_ids: List[Union[str, int]],
     current_user: dict = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """
     Trigger crawling for multiple companies in batch.
@@ -541,7 +540,7 @@ async def crawl_companies_batch(
 async def extract_company_data(
     company_id: Union[str, int],
     current_user: dict = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """
     Trigger data extraction for a specific company (from existing crawled data).
@@ -589,7 +588,7 @@ async def extract_company_data(
 async def embed_company_data(
     company_id: Union[str, int],
     current_user: dict = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """
     Trigger RAG embedding for a specific company.
@@ -616,7 +615,7 @@ async def embed_company_data(
 def get_crawl_status(
     company_id: int,
     current_user: dict = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """
     Get the current crawl status for a company.
@@ -36,7 +36,7 @@ class DiscoveryStartResponse(BaseModel):
 async def start_discovery(
     request: DiscoveryStartRequest,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """
     Start a company discovery job.
@@ -69,13 +69,15 @@ async def start_discovery(
 
     # Create job record first
     job = crud_jobs.create_job(db, job_create, celery_task_id=None)
+    # The worker loads the job by ID, so it must be committed before dispatch
+    db.commit()
 
     # Import Celery task
     from celery_app.tasks import discover_companies_task
 
     # Dispatch to Celery with the job_id
     celery_task = discover_companies_task.delay(
-        job_id=job.id,
+        job_id=str(job.id),
         config=config.model_dump(),
         user_id=user_id
     )
@@ -83,11 +85,10 @@ async def start_discovery(
     # Update job with Celery task ID
     job.celery_task_id = celery_task.id
     db.commit()
-    db.refresh(job)
 
     return DiscoveryStartResponse(
-        job_id=job.id,
-        status=job.status,
+        job_id=str(job.id),
+        status=job.status.value,
         message=f"Discovery job started with {len(request.keywords)} keywords"
     )
 
@@ -97,7 +98,7 @@ async def list_discovery_jobs(
     skip: int = 0,
     limit: int = 50,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """
     List discovery jobs for the current user.
@@ -109,7 +110,7 @@ async def list_discovery_jobs(
             detail="Invalid token"
         )
 
-    jobs = crud_jobs.get_jobs_by_user(
+    jobs, total = crud_jobs.get_jobs_by_user(
         db,
         user_id=user_id,
         skip=skip,
@@ -119,11 +120,7 @@ async def list_discovery_jobs(
 
     return {
         "jobs": [Job.model_validate(job) for job in jobs],
-        "total": crud_jobs.count_jobs_by_user(
-            db,
-            user_id=user_id,
-            job_type=JobType.DISCOVERY.value
-        )
+        "total": total
     }
 
 
@@ -131,7 +128,7 @@ async def list_discovery_jobs(
 async def get_discovery_job(
     job_id: str,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """
     Get discovery job details.
@@ -180,7 +177,7 @@ class RevetDomainsResponse(BaseModel):
 async def revet_domains(
     request: RevetDomainsRequest,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """
     Re-vet failed/rejected domains without going through discovery again.
@@ -208,13 +205,15 @@ async def revet_domains(
     )
 
     job = crud_jobs.create_job(db, job_create, celery_task_id=None)
+    # The worker loads the job by ID, so it must be committed before dispatch
+    db.commit()
 
     # Import Celery task
     from celery_app.tasks import revet_domains_task
 
     # Dispatch to Celery
     celery_task = revet_domains_task.delay(
-        job_id=job.id,
+        job_id=str(job.id),
         domains=request.domains,
         user_id=user_id,
         min_ecommerce_keywords=request.min_ecommerce_keywords,
@@ -224,11 +223,10 @@ async def revet_domains(
     # Update job with Celery task ID
     job.celery_task_id = celery_task.id
     db.commit()
-    db.refresh(job)
 
     return RevetDomainsResponse(
-        job_id=job.id,
-        status=job.status,
+        job_id=str(job.id),
+        status=job.status.value,
         message=f"Re-vetting {len(request.domains)} domains",
         domains_count=len(request.domains)
     )
@@ -254,7 +252,7 @@ class RecrawlDomainsResponse(BaseModel):
 async def recrawl_domains(
     request: RecrawlDomainsRequest,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """
     Re-crawl or update crawled data for domains.
@@ -281,13 +279,15 @@ async def recrawl_domains(
     )
 
     job = crud_jobs.create_job(db, job_create, celery_task_id=None)
+    # The worker loads the job by ID, so it must be committed before dispatch
+    db.commit()
 
     # Import Celery task
     from celery_app.tasks import recrawl_domains_task
 
     # Dispatch to Celery
     celery_task = recrawl_domains_task.delay(
-        job_id=job.id,
+        job_id=str(job.id),
         domains=request.domains,
         user_id=user_id,
         force=request.force,
@@ -298,11 +298,10 @@ async def recrawl_domains(
     # Update job with Celery task ID
     job.celery_task_id = celery_task.id
     db.commit()
-    db.refresh(job)
 
     return RecrawlDomainsResponse(
-        job_id=job.id,
-        status=job.status,
+        job_id=str(job.id),
+        status=job.status.value,
         message=f"Re-crawling {len(request.domains)} domains",
         domains_count=len(request.domains)
     )
@@ -13,11 +13,11 @@ from ....schemas import email as schemas
 router = APIRouter()
 
 
-@router.post("/verify", response_model=schemas.EmailVerifyResponse)
+@router.post("/verify", response_model=schemas.EmailVerifyResponse, response_model_exclude_none=True)
 async def verify_emails(
     request: schemas.EmailVerifyRequest,
     current_user: dict = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """
     Verify a list of email addresses.
@@ -48,7 +48,7 @@ async def send_email(
     attachments: List[UploadFile] = File(default=[]),
     background_tasks: BackgroundTasks = None,
     current_user: dict = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """
     Send an email via Gmail API with optional attachments.
@@ -106,7 +106,7 @@ async def generate_email_draft(
     company_id: int,
     background_tasks: BackgroundTasks,
     current_user: dict = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """
     Generate an email draft for a company using AI.
@@ -31,7 +31,7 @@ async def run_enrichment(
     request: EnrichmentRequest,
     background_tasks: BackgroundTasks,
     current_user: dict = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """
     Run contact enrichment for a company.
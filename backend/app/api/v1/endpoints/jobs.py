@@ -2,11 +2,13 @@
 Job status and management endpoints.
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import Optional
 
 from ....core.security import get_current_user
-from ....db.session import get_db
+from ....db.session import get_async_db, get_db
 from ....crud import jobs as crud_jobs
 from ....schemas.job import (
     Job, JobListResponse, JobStatus, JobType
@@ -22,8 +24,9 @@ async def list_jobs(
     status: Optional[JobStatus] = Query(None, description="Filter by status"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(50, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from a previous page's next_cursor"),
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """
     List all jobs for the current user.
@@ -33,8 +36,9 @@ async def list_jobs(
     Args:
         job_type: Optional filter by job type
         status: Optional filter by status
-        page: Page number (1-indexed)
+        page: Page number (1-indexed), ignored when cursor is given
         page_size: Number of items per page
+        cursor: Keyset cursor returned as next_cursor by the previous page
         current_user: Current authenticated user
         db: Database session
 
@@ -50,37 +54,42 @@ async def list_jobs(
 
     skip = (page - 1) * page_size
 
-    # Get jobs
-    jobs = crud_jobs.get_jobs_by_user(
+    after = None
+    if cursor:
+        try:
+            after = crud_jobs.decode_job_cursor(cursor)
+        except ValueError:
+            # `status` is shadowed by the query parameter here
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    # Get jobs and total count in one query
+    jobs, total = crud_jobs.get_jobs_by_user(
         db,
         user_id=user_id,
         skip=skip,
         limit=page_size,
         job_type=job_type.value if job_type else None,
-        status=status.value if status else None
+        status=status.value if status else None,
+        after=after
     )
 
-    # Get total count
-    total = crud_jobs.count_jobs_by_user(
-        db,
-        user_id=user_id,
-        job_type=job_type.value if job_type else None,
-        status=status.value if status else None
-    )
-
-    return JobListResponse(
-        items=[Job.model_validate(job) for job in jobs],
-        total=total,
-        page=page,
-        page_size=page_size
-    )
+    # Serialize through the cached list adapter and return the response
+    # directly so FastAPI does not validate the page a second time.
+    items = JobListResponse.validate_items(jobs)
+    return JSONResponse({
+        "items": JobListResponse.serialize_items(items),
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "next_cursor": crud_jobs.encode_job_cursor(jobs[-1]) if len(jobs) == page_size else None,
+    })
 
 
 @router.get("/{job_id}", response_model=Job)
 async def get_job(
     job_id: str,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db, scope="function")
 ):
     """
     Get job details by ID.
@@ -103,7 +112,7 @@ async def get_job(
             detail="Invalid token"
         )
 
-    job = crud_jobs.get_job(db, job_id)
+    job = await crud_jobs.aget_job(db, job_id)
     if not job:
         raise ResourceNotFound("Job", job_id)
 
@@ -121,7 +130,7 @@ async def get_job(
 async def cancel_job(
     job_id: str,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """
     Cancel a running job.
@@ -156,10 +165,10 @@ async def cancel_job(
         )
 
     # Check if job can be cancelled
-    if job.status not in [JobStatus.QUEUED.value, JobStatus.RUNNING.value]:
+    if job.status not in (JobStatus.QUEUED, JobStatus.RUNNING):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Cannot cancel job with status: {job.status}"
+            detail=f"Cannot cancel job with status: {job.status.value}"
         )
 
     # Cancel the Celery task if it exists
@@ -189,7 +198,7 @@ async def cancel_job(
 async def delete_job(
     job_id: str,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """
     Delete a job record.
@@ -224,7 +233,7 @@ async def delete_job(
         )
 
     # Don't allow deletion of running jobs
-    if job.status == JobStatus.RUNNING.value:
+    if job.status == JobStatus.RUNNING:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cannot delete a running job. Cancel it first."
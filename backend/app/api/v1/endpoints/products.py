@@ -21,7 +21,7 @@ async def list_products(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
     current_user: dict = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """List products from MongoDB with pagination."""
     # Initialize MongoDB
@@ -95,7 +95,7 @@ async def list_products(
 def get_product(
     product_id: int,
     current_user: dict = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """Get a specific product."""
     user = user_crud.get_user_by_auth0_id(db, current_user["sub"])
@@ -118,7 +118,7 @@ def get_product(
 def create_product(
     product: schemas.ProductCreate,
     current_user: dict = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """Create a new product."""
     user = user_crud.get_user_by_auth0_id(db, current_user["sub"])
@@ -138,7 +138,7 @@ def update_product(
     product_id: int,
     product_update: schemas.ProductUpdate,
     current_user: dict = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """Update a product."""
     user = user_crud.get_user_by_auth0_id(db, current_user["sub"])
@@ -162,7 +162,7 @@ def update_product(
 def delete_product(
     product_id: int,
     current_user: dict = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """Delete a product."""
     user = user_crud.get_user_by_auth0_id(db, current_user["sub"])
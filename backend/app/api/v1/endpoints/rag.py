@@ -39,7 +39,7 @@ class RAGQueryResponse(BaseModel):
 async def query_rag(
     request: RAGQueryRequest,
     current_user: dict = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """
     Query the B2B intelligence agent.
@@ -86,7 +86,7 @@ async def query_rag(
 async def embed_company_data(
     company_id: int,
     current_user: dict = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """
     Embed company data into the RAG vector database.
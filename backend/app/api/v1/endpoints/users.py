@@ -3,10 +3,11 @@ User management API endpoints.
 """
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from ....core.security import get_current_active_user
-from ....db.session import get_db
+from ....db.session import get_async_db, get_db
 from ....crud import users as crud
 from ....schemas import user as schemas
 
@@ -14,12 +15,12 @@ router = APIRouter()
 
 
 @router.get("/me", response_model=schemas.User)
-def read_current_user(
+async def read_current_user(
     current_user: dict = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db, scope="function")
 ):
     """Get current user information."""
-    user = crud.get_user_by_auth0_id(db, current_user["sub"])
+    user = await crud.aget_user_by_auth0_id(db, current_user["sub"])
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
@@ -28,7 +29,7 @@ def read_current_user(
 @router.post("/", response_model=schemas.User, status_code=status.HTTP_201_CREATED)
 def create_user(
     user: schemas.UserCreate,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """Create a new user."""
     db_user = crud.get_user_by_email(db, user.email)
@@ -47,7 +48,7 @@ def update_user(
     user_id: int,
     user_update: schemas.UserUpdate,
     current_user: dict = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """Update user information."""
     # Verify user can only update their own profile
@@ -64,7 +65,7 @@ def update_user(
 @router.get("/me/subscription", response_model=schemas.Subscription)
 def read_current_user_subscription(
     current_user: dict = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db, scope="function")
 ):
     """Get current user's active subscription."""
     user = crud.get_user_by_auth0_id(db, current_user["sub"])
@@ -0,0 +1,91 @@
+"""
+Short-lived Redis cache for read-heavy queries.
+
+Entries for one owner (e.g. a user) live in a single Redis hash so a write
+can drop them all with one DEL. The cache is best-effort: when Redis is
+unreachable, lookups miss and callers fall through to the database.
+"""
+import asyncio
+import threading
+import weakref
+from typing import Any, Optional
+
+import orjson
+from redis import Redis
+from redis.asyncio import Redis as AsyncRedis
+from redis.exceptions import RedisError
+
+from .config import settings
+
+# Upper bound on staleness for writes that bypass invalidation
+CACHE_TTL_SECONDS = 30
+
+# redis.asyncio connections are bound to the loop that opened them, and
+# repositories run on both the API loop and the sync-wrapper worker loop
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncRedis]" = weakref.WeakKeyDictionary()
+
+
+# Sync client for invalidations from sync code (Celery tasks); redis-py
+# resets its connection pool after a fork, so one client per process is safe
+_sync_client: Optional[Redis] = None
+_sync_client_lock = threading.Lock()
+
+
+def _client() -> AsyncRedis:
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = AsyncRedis.from_url(settings.REDIS_URL)
+        _clients[loop] = client
+    return client
+
+
+async def cache_get(namespace: str, key: str) -> Optional[Any]:
+    """Return the cached value for key in namespace, or None on a miss"""
+    try:
+        raw = await _client().hget(namespace, key)
+    except RedisError as e:
+        print(f"Cache read failed for {namespace}: {e}")
+        return None
+    return orjson.loads(raw) if raw is not None else None
+
+
+async def cache_set(namespace: str, key: str, value: Any, ttl: int = CACHE_TTL_SECONDS) -> None:
+    """
+    Cache a JSON-serializable value under key in namespace.
+
+    The namespace expires ttl seconds after its first entry (EXPIRE NX), so
+    no entry outlives the TTL.
+    """
+    try:
+        async with _client().pipeline(transaction=False) as pipe:
+            pipe.hset(namespace, key, orjson.dumps(value))
+            pipe.expire(namespace, ttl, nx=True)
+            await pipe.execute()
+    except RedisError as e:
+        print(f"Cache write failed for {namespace}: {e}")
+
+
+async def cache_invalidate(*namespaces: str) -> None:
+    """Drop every cached entry in the given namespaces"""
+    if not namespaces:
+        return
+    try:
+        await _client().delete(*namespaces)
+    except RedisError as e:
+        print(f"Cache invalidation failed for {', '.join(namespaces)}: {e}")
+
+
+def cache_invalidate_sync(*namespaces: str) -> None:
+    """Drop every cached entry in the given namespaces, from sync code"""
+    global _sync_client
+
+    if not namespaces:
+        return
+    with _sync_client_lock:
+        if _sync_client is None:
+            _sync_client = Redis.from_url(settings.REDIS_URL)
+    try:
+        _sync_client.delete(*namespaces)
+    except RedisError as e:
+        print(f"Cache invalidation failed for {', '.join(namespaces)}: {e}")
@@ -83,6 +83,23 @@ class Settings(BaseSettings):
     ELASTICSEARCH_URL: Optional[str] = None
     ELASTICSEARCH_API_KEY: Optional[str] = None
 
+    # MongoDB database used when DATABASE_URL doesn't name one
+    MONGODB_DB: str = "b2b_osint"
+
+    # MongoDB client tuning (Motor and pymongo connection pools, wire compression, timeouts).
+    # Pools are per process, so size them for every Celery worker process, not just one.
+    MONGO_MAX_POOL_SIZE: int = 50
+    MONGO_MIN_POOL_SIZE: int = 10
+    MONGO_MAX_IDLE_TIME_MS: int = 60000
+    MONGO_COMPRESSORS: str = "zstd,snappy,zlib"  # unavailable codecs are skipped by pymongo
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = 5000
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: int = 10000
+
+    # MongoDB Atlas Vector Search (RAG); falls back to in-app cosine scoring when off
+    ATLAS_VECTOR_SEARCH_ENABLED: bool = False
+    RAG_VECTOR_INDEX_NAME: str = "rag_embedding_vector"
+    RAG_VECTOR_NUM_CANDIDATES: int = 200
+
     # Application Limits
     MAX_CRAWL_DEPTH: int = 3
     MAX_PAGES_PER_DOMAIN: int = 100
@@ -11,6 +11,13 @@ from typing import Any, Dict, Optional
 class B2BOSINTException(Exception):
     """Base exception for all B2B OSINT Tool errors"""
 
+    # Error name reported in API responses, resolved once per class
+    _error_name: str = "B2BOSINTException"
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._error_name = cls.__name__
+
     def __init__(
         self,
         message: str,
@@ -25,7 +32,7 @@ class B2BOSINTException(Exception):
     def to_dict(self) -> Dict[str, Any]:
         """Convert exception to dictionary for API response"""
         return {
-            "error": self.__class__.__name__,
+            "error": self._error_name,
             "message": self.message,
             "status_code": self.status_code,
             "details": self.details
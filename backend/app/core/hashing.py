@@ -0,0 +1,28 @@
+"""
+Content hashing shared by the crawler and the RAG pipeline.
+"""
+import hashlib
+
+import xxhash
+
+
+def compute_content_hash(content: str) -> str:
+    """
+    SHA-256 hex digest of text, used to deduplicate pages and chunks.
+
+    The text is encoded once and hashed in a single call, so OpenSSL's
+    hardware-accelerated SHA-256 (SHA-NI) sees one contiguous buffer.
+    Undecodable characters are dropped, matching the hashes already stored.
+    """
+    return hashlib.sha256(content.encode("utf-8", errors="ignore")).hexdigest()
+
+
+def compute_content_digest(content: str) -> str:
+    """
+    128-bit XXH3 hex digest of text, for "seen this page before?" checks.
+
+    Not cryptographic: only used where a collision costs at most one
+    skipped duplicate page. Several times faster than SHA-256 and half the
+    key size in the dedup indexes.
+    """
+    return xxhash.xxh3_128_hexdigest(content.encode("utf-8", errors="ignore"))
@@ -2,8 +2,13 @@
 Security utilities for authentication and authorization.
 Handles JWT tokens, password hashing, and Auth0 integration.
 """
+import base64
+import hashlib
+import hmac
+import time
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
+import orjson
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
@@ -55,6 +60,63 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
     return encoded_jwt
 
 
+def _b64url_decode(segment: str) -> bytes:
+    """Decode a base64url JWT segment, restoring stripped padding."""
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+def _fast_decode_hs256(token: str, key: bytes) -> Dict[str, Any]:
+    """
+    Verify and decode an HS256 JWT without going through jose.
+
+    Args:
+        token: JWT token string
+        key: HMAC secret
+
+    Returns:
+        Decoded token payload
+
+    Raises:
+        JWTError: If the token is malformed, the signature doesn't match,
+            or the token has expired
+    """
+    try:
+        header_b64, payload_b64, signature_b64 = token.split(".")
+        header = orjson.loads(_b64url_decode(header_b64))
+        signature = _b64url_decode(signature_b64)
+    except (ValueError, orjson.JSONDecodeError) as e:
+        raise JWTError("Malformed token") from e
+    if not isinstance(header, dict):
+        raise JWTError("Malformed token")
+
+    if header.get("alg") != "HS256":
+        raise JWTError("Unexpected token algorithm")
+
+    expected = hmac.new(key, f"{header_b64}.{payload_b64}".encode(), hashlib.sha256).digest()
+    if not hmac.compare_digest(expected, signature):
+        raise JWTError("Signature verification failed")
+
+    try:
+        payload = orjson.loads(_b64url_decode(payload_b64))
+    except (ValueError, orjson.JSONDecodeError) as e:
+        raise JWTError("Malformed token payload") from e
+    if not isinstance(payload, dict):
+        raise JWTError("Malformed token payload")
+
+    now = time.time()
+    exp = payload.get("exp")
+    if exp is not None and (not isinstance(exp, (int, float)) or now >= exp):
+        raise JWTError("Token has expired")
+    nbf = payload.get("nbf")
+    if nbf is not None and (not isinstance(nbf, (int, float)) or now < nbf):
+        raise JWTError("Token is not yet valid")
+
+    return payload
+
+
+_SECRET_KEY_BYTES = settings.SECRET_KEY.encode()
+
+
 def decode_token(token: str) -> Dict[str, Any]:
     """
     Decode and verify a JWT token.
@@ -69,6 +131,8 @@ def decode_token(token: str) -> Dict[str, Any]:
         HTTPException: If token is invalid or expired
     """
     try:
+        if settings.ALGORITHM == "HS256":
+            return _fast_decode_hs256(token, _SECRET_KEY_BYTES)
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         return payload
     except JWTError:
@@ -178,16 +242,6 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     return payload
 
 
-def get_current_active_user(current_user: Dict[str, Any] = Depends(get_current_user)) -> Dict[str, Any]:
-    """
-    Dependency to get the current active user.
-    Can be extended to check if user is active/enabled.
-
-    Args:
-        current_user: Current user from get_current_user dependency
-
-    Returns:
-        Current active user
-    """
-    # Add additional checks here (e.g., is_active flag)
-    return current_user
+# Alias rather than a pass-through dependency so FastAPI resolves a single
+# node per request. Add active/enabled checks inside get_current_user.
+get_current_active_user = get_current_user
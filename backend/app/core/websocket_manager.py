@@ -5,21 +5,46 @@ Handles WebSocket connections, disconnections, and message broadcasting
 
 from typing import Dict, List
 from fastapi import WebSocket
-import json
 import logging
+import time
 from datetime import datetime
 
+import orjson
+
 logger = logging.getLogger(__name__)
 
+# (epoch millisecond, ISO string) of the most recently formatted timestamp
+_last_timestamp = (0, "")
+
+
+def _utc_timestamp() -> str:
+    """Return the current UTC time as an ISO string, formatted at most once per millisecond."""
+    global _last_timestamp
+    now_ms = time.time_ns() // 1_000_000
+    if now_ms != _last_timestamp[0]:
+        iso = datetime.utcfromtimestamp(now_ms / 1000).isoformat(timespec="milliseconds")
+        _last_timestamp = (now_ms, iso)
+    return _last_timestamp[1]
+
+
+def _encode_message(message: dict) -> str:
+    """
+    Serialize a message once for all recipients, adding a timestamp if missing.
+
+    The caller's dict is never mutated.
+    """
+    if "timestamp" not in message:
+        message = {**message, "timestamp": _utc_timestamp()}
+    return orjson.dumps(message).decode()
+
 
 class ConnectionManager:
     """Manages WebSocket connections for real-time updates"""
 
     def __init__(self):
         # Store active connections grouped by user_id
+        # (each WebSocket carries its own user_id on websocket.state)
         self.active_connections: Dict[str, List[WebSocket]] = {}
-        # Store reverse mapping for quick lookup
-        self.websocket_to_user: Dict[WebSocket, str] = {}
 
     async def connect(self, websocket: WebSocket, user_id: str):
         """
@@ -35,7 +60,7 @@ class ConnectionManager:
             self.active_connections[user_id] = []
 
         self.active_connections[user_id].append(websocket)
-        self.websocket_to_user[websocket] = user_id
+        websocket.state.user_id = user_id
 
         logger.info(f"WebSocket connected for user {user_id}. Total connections: {len(self.active_connections[user_id])}")
 
@@ -46,7 +71,7 @@ class ConnectionManager:
         Args:
             websocket: The WebSocket connection to remove
         """
-        user_id = self.websocket_to_user.get(websocket)
+        user_id = getattr(websocket.state, "user_id", None)
 
         if user_id and user_id in self.active_connections:
             if websocket in self.active_connections[user_id]:
@@ -56,10 +81,6 @@ class ConnectionManager:
             if not self.active_connections[user_id]:
                 del self.active_connections[user_id]
 
-            # Remove from reverse mapping
-            if websocket in self.websocket_to_user:
-                del self.websocket_to_user[websocket]
-
             logger.info(f"WebSocket disconnected for user {user_id}")
 
     async def send_personal_message(self, message: dict, user_id: str):
@@ -74,15 +95,21 @@ class ConnectionManager:
             logger.warning(f"No active connections for user {user_id}")
             return
 
-        # Add timestamp if not present
-        if "timestamp" not in message:
-            message["timestamp"] = datetime.utcnow().isoformat()
+        await self._send_payload(_encode_message(message), user_id)
+
+    async def _send_payload(self, payload: str, user_id: str):
+        """
+        Send an already-encoded payload to all connections of a user
 
+        Args:
+            payload: JSON-encoded message
+            user_id: The target user ID
+        """
         dead_connections = []
 
-        for connection in self.active_connections[user_id]:
+        for connection in self.active_connections.get(user_id, []):
             try:
-                await connection.send_json(message)
+                await connection.send_text(payload)
             except Exception as e:
                 logger.error(f"Error sending message to user {user_id}: {e}")
                 dead_connections.append(connection)
@@ -98,16 +125,13 @@ class ConnectionManager:
         Args:
             message: The message dictionary to broadcast
         """
-        # Add timestamp if not present
-        if "timestamp" not in message:
-            message["timestamp"] = datetime.utcnow().isoformat()
-
+        payload = _encode_message(message)
         dead_connections = []
 
         for user_id, connections in self.active_connections.items():
             for connection in connections:
                 try:
-                    await connection.send_json(message)
+                    await connection.send_text(payload)
                 except Exception as e:
                     logger.error(f"Error broadcasting to user {user_id}: {e}")
                     dead_connections.append(connection)
@@ -125,12 +149,10 @@ class ConnectionManager:
             team_id: The team ID (for logging)
             user_ids: List of user IDs in the team
         """
-        # Add timestamp if not present
-        if "timestamp" not in message:
-            message["timestamp"] = datetime.utcnow().isoformat()
+        payload = _encode_message(message)
 
         for user_id in user_ids:
-            await self.send_personal_message(message, user_id)
+            await self._send_payload(payload, user_id)
 
         logger.info(f"Message sent to team {team_id} ({len(user_ids)} users)")
 
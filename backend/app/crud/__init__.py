@@ -1,4 +1,4 @@
 """CRUD operations for database models."""
-from . import companies, products, users
+from . import companies, discovery, products, users
 
-__all__ = ["companies", "products", "users"]
+__all__ = ["companies", "discovery", "products", "users"]
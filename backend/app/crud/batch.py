@@ -0,0 +1,126 @@
+"""
+Batched INSERT helpers shared by the CRUD modules.
+Rows are written with INSERT ... RETURNING so callers get populated model
+instances back without a follow-up refresh() SELECT. Databases without
+RETURNING (SQLite < 3.35) fall back to ORM add + flush.
+"""
+from typing import Any, Dict, List, Optional, Type, TypeVar
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from ..db.unit_of_work import UNIT_OF_WORK_KEY, commit_or_flush
+
+ModelT = TypeVar("ModelT")
+
+# Rows per multi-row INSERT
+DEFAULT_BATCH_SIZE = 1000
+
+
+def supports_returning(db: Session) -> bool:
+    """Whether the bound database can return rows from (multi-row) INSERTs."""
+    return db.get_bind().dialect.insert_executemany_returning
+
+
+def insert_one(db: Session, model: Type[ModelT], row: Dict[str, Any]) -> ModelT:
+    """
+    Insert a single row and commit (flush only inside a unit of work).
+
+    Args:
+        db: Database session
+        model: ORM model class
+        row: Column values for the new row
+
+    Returns:
+        The created model instance
+    """
+    if supports_returning(db):
+        db_obj = db.scalars(insert(model).returning(model), [row]).one()
+    else:
+        db_obj = model(**row)
+        db.add(db_obj)
+        db.flush()
+        db.refresh(db_obj)
+    commit_or_flush(db)
+    return db_obj
+
+
+class BatchWriter:
+    """
+    Accumulate rows and write them with multi-row INSERT ... RETURNING.
+
+    Rows are flushed whenever ``batch_size`` is reached and on exit; the
+    transaction is committed once when the block exits cleanly and rolled
+    back on error (inside a unit of work both are left to the owning
+    scope). With ``returning=False`` rows are written as a plain executemany
+    (like ``bulk_insert_mappings``) and no model instances are built.
+
+    Example:
+        with BatchWriter(db, models.Job) as writer:
+            for row in rows:
+                writer.add(row)
+        jobs = writer.created
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        model: Type[ModelT],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        returning: bool = True
+    ):
+        self.db = db
+        self.model = model
+        self.batch_size = batch_size
+        self.returning = returning
+        self._use_orm_add = returning and not supports_returning(db)
+        self.created: List[ModelT] = []
+        self._pending: List[Dict[str, Any]] = []
+        self._stmt = insert(model).returning(model) if returning else insert(model)
+
+    def add(self, row: Dict[str, Any]) -> None:
+        """Queue a row, flushing when the batch is full."""
+        self._pending.append(row)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def extend(self, rows: List[Dict[str, Any]]) -> None:
+        """Queue many rows at once, flushing full batches straight from the list."""
+        if self._pending:
+            for row in rows:
+                self.add(row)
+            return
+        full = len(rows) - len(rows) % self.batch_size
+        for i in range(0, full, self.batch_size):
+            self._write(rows[i:i + self.batch_size])
+        self._pending = list(rows[full:])
+
+    def flush(self) -> None:
+        """Write all queued rows in one multi-row INSERT."""
+        if not self._pending:
+            return
+        self._write(self._pending)
+        self._pending = []
+
+    def _write(self, rows: List[Dict[str, Any]]) -> None:
+        if self._use_orm_add:
+            objs = [self.model(**row) for row in rows]
+            self.db.add_all(objs)
+            self.db.flush()
+            self.created.extend(objs)
+        elif self.returning:
+            self.created.extend(self.db.scalars(self._stmt, rows))
+        else:
+            self.db.execute(self._stmt, rows)
+
+    def __enter__(self) -> "BatchWriter":
+        return self
+
+    def __exit__(self, exc_type: Optional[type], exc: Optional[BaseException], tb: Any) -> None:
+        if exc_type is not None:
+            self._pending = []
+            if not self.db.info.get(UNIT_OF_WORK_KEY):
+                self.db.rollback()
+            return
+        self.flush()
+        commit_or_flush(self.db)
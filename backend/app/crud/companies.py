@@ -1,22 +1,47 @@
 """
 CRUD operations for Company, Contact, and SocialMedia models.
 """
-from typing import Optional, List
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from typing import Optional, List, Iterator
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import or_, func, select, bindparam
 
 from ..db import models
+from ..db.unit_of_work import commit_or_flush
 from ..schemas import company as schemas
+from .discovery import dialect_insert
 
 
 def get_company(db: Session, company_id: int) -> Optional[models.Company]:
-    """Get company by ID."""
-    return db.query(models.Company).filter(models.Company.id == company_id).first()
+    """Get company by ID (served from the session identity map when already loaded)."""
+    return db.get(models.Company, company_id)
+
+
+# Statements built once at import and reused with bound parameters
+_SEL_COMPANY_BY_DOMAIN = select(models.Company).where(models.Company.domain == bindparam("domain"))
+_SEL_COMPANY_CONTACTS = select(models.Contact).where(models.Contact.company_id == bindparam("company_id"))
+_SEL_COMPANY_CONTACTS_BY_TYPE = _SEL_COMPANY_CONTACTS.where(models.Contact.type == bindparam("contact_type"))
+_SEL_COMPANY_SOCIAL_MEDIA = select(models.SocialMedia).where(
+    models.SocialMedia.company_id == bindparam("company_id")
+)
+_SEL_COMPANY_ENRICHMENT_HISTORY = select(models.EnrichmentHistory).where(
+    models.EnrichmentHistory.company_id == bindparam("company_id")
+).order_by(models.EnrichmentHistory.enriched_at.desc())
+
+# Relationships serialized by schemas.CompanyWithRelations
+_COMPANY_RELATIONS = (
+    selectinload(models.Company.contacts),
+    selectinload(models.Company.social_media),
+)
+
+
+def get_company_with_relations(db: Session, company_id: int) -> Optional[models.Company]:
+    """Get company by ID with contacts and social media loaded up front."""
+    return db.get(models.Company, company_id, options=_COMPANY_RELATIONS)
 
 
 def get_company_by_domain(db: Session, domain: str) -> Optional[models.Company]:
     """Get company by domain."""
-    return db.query(models.Company).filter(models.Company.domain == domain).first()
+    return db.scalars(_SEL_COMPANY_BY_DOMAIN, {"domain": domain}).first()
 
 
 def get_companies(db: Session, user_id: Optional[int] = None, skip: int = 0, limit: int = 100) -> List[models.Company]:
@@ -27,39 +52,64 @@ def get_companies(db: Session, user_id: Optional[int] = None, skip: int = 0, lim
     return query.offset(skip).limit(limit).all()
 
 
+def get_companies_iter(db: Session, user_id: Optional[int] = None, batch_size: int = 1000) -> Iterator[models.Company]:
+    """
+    Stream companies in batches instead of materializing the full result set.
+
+    Use this for exports and other large scans; get_companies stays the
+    entry point for small paginated reads.
+    """
+    stmt = select(models.Company)
+    if user_id:
+        stmt = stmt.where(models.Company.user_id == user_id)
+    return db.execute(stmt.execution_options(yield_per=batch_size)).scalars()
+
+
 def count_companies(db: Session, user_id: Optional[int] = None) -> int:
     """Count total companies for a user."""
-    query = db.query(models.Company)
+    stmt = select(func.count()).select_from(models.Company)
     if user_id:
-        query = query.filter(models.Company.user_id == user_id)
-    return query.count()
+        stmt = stmt.where(models.Company.user_id == user_id)
+    return db.execute(stmt).scalar_one()
 
 
 def count_companies_with_contacts(db: Session, user_id: Optional[int] = None) -> int:
     """Count companies that have at least one contact."""
-    query = db.query(models.Company).filter(models.Company.contact_score > 0)
+    stmt = select(func.count()).select_from(models.Company).where(models.Company.contact_score > 0)
     if user_id:
-        query = query.filter(models.Company.user_id == user_id)
-    return query.count()
+        stmt = stmt.where(models.Company.user_id == user_id)
+    return db.execute(stmt).scalar_one()
 
 
 def count_total_contacts(db: Session, user_id: Optional[int] = None) -> int:
     """Count total contacts across all companies for a user."""
-    query = db.query(models.Contact)
+    stmt = select(func.count(models.Contact.id)).select_from(models.Contact)
     if user_id:
-        query = query.join(models.Company).filter(models.Company.user_id == user_id)
-    return query.count()
+        stmt = stmt.join(models.Company).where(models.Company.user_id == user_id)
+    return db.execute(stmt).scalar_one()
 
 
 def search_companies(db: Session, search_term: str, user_id: Optional[int] = None, skip: int = 0, limit: int = 100) -> List[models.Company]:
-    """Search companies by name or domain."""
-    query = db.query(models.Company).filter(
-        or_(
-            models.Company.company_name.ilike(f"%{search_term}%"),
-            models.Company.domain.ilike(f"%{search_term}%"),
-            models.Company.description.ilike(f"%{search_term}%")
+    """
+    Search companies by name, domain, or description.
+
+    On PostgreSQL this uses the GIN-indexed search_vector column; other
+    backends (SQLite dev fallback) use substring matching.
+    """
+    query = db.query(models.Company)
+    if db.get_bind().dialect.name == "postgresql":
+        query = query.filter(
+            models.Company.search_vector.op("@@")(func.plainto_tsquery("english", search_term))
+        )
+    else:
+        pattern = f"%{search_term}%"
+        query = query.filter(
+            or_(
+                models.Company.company_name.ilike(pattern),
+                models.Company.domain.ilike(pattern),
+                models.Company.description.ilike(pattern)
+            )
         )
-    )
     if user_id:
         query = query.filter(models.Company.user_id == user_id)
     return query.offset(skip).limit(limit).all()
@@ -78,8 +128,33 @@ def create_company(db: Session, company: schemas.CompanyCreate) -> models.Compan
         search_mode=company.search_mode
     )
     db.add(db_company)
-    db.commit()
-    db.refresh(db_company)
+    commit_or_flush(db)
+    return db_company
+
+
+def create_company_if_absent(db: Session, company: schemas.CompanyCreate) -> Optional[models.Company]:
+    """
+    Create a company unless its domain is already taken.
+
+    Uses INSERT ... ON CONFLICT (domain) DO NOTHING, so the existence check
+    and the insert are one statement.
+
+    Returns:
+        The created company, or None if the domain already exists
+    """
+    import json
+    stmt = dialect_insert(db, models.Company).values(
+        user_id=company.user_id,
+        domain=company.domain,
+        company_name=company.company_name,
+        description=company.description,
+        smykm_notes=json.dumps(company.smykm_notes) if company.smykm_notes else None,
+        contact_score=company.contact_score,
+        search_mode=company.search_mode
+    )
+    stmt = stmt.on_conflict_do_nothing(index_elements=["domain"]).returning(models.Company)
+    db_company = db.scalars(stmt).one_or_none()
+    commit_or_flush(db)
     return db_company
 
 
@@ -99,8 +174,7 @@ def update_company(db: Session, company_id: int, company_update: schemas.Company
     for field, value in update_data.items():
         setattr(db_company, field, value)
 
-    db.commit()
-    db.refresh(db_company)
+    commit_or_flush(db)
     return db_company
 
 
@@ -111,7 +185,7 @@ def delete_company(db: Session, company_id: int) -> bool:
         return False
 
     db.delete(db_company)
-    db.commit()
+    commit_or_flush(db)
     return True
 
 
@@ -119,32 +193,29 @@ def delete_company(db: Session, company_id: int) -> bool:
 
 def create_contact(db: Session, contact: schemas.ContactCreate) -> models.Contact:
     """Create a new contact."""
-    import json
     db_contact = models.Contact(
         company_id=contact.company_id,
         type=contact.type,
         value=contact.value,
         source=contact.source,
         confidence=contact.confidence,
-        extra_metadata=json.dumps(contact.metadata) if contact.metadata else None,
+        extra_metadata=contact.metadata or None,
         is_primary=contact.is_primary
     )
     db.add(db_contact)
-    db.commit()
-    db.refresh(db_contact)
+    commit_or_flush(db)
     return db_contact
 
 
 def get_company_contacts(db: Session, company_id: int) -> List[models.Contact]:
     """Get all contacts for a company."""
-    return db.query(models.Contact).filter(models.Contact.company_id == company_id).all()
+    return db.scalars(_SEL_COMPANY_CONTACTS, {"company_id": company_id}).all()
 
 
 def get_contacts_by_type(db: Session, company_id: int, contact_type: str) -> List[models.Contact]:
     """Get contacts by type for a company."""
-    return db.query(models.Contact).filter(
-        models.Contact.company_id == company_id,
-        models.Contact.type == contact_type
+    return db.scalars(
+        _SEL_COMPANY_CONTACTS_BY_TYPE, {"company_id": company_id, "contact_type": contact_type}
     ).all()
 
 
@@ -154,35 +225,30 @@ def create_social_media(db: Session, social: schemas.SocialMediaCreate) -> model
     """Create a new social media profile."""
     db_social = models.SocialMedia(**social.model_dump())
     db.add(db_social)
-    db.commit()
-    db.refresh(db_social)
+    commit_or_flush(db)
     return db_social
 
 
 def get_company_social_media(db: Session, company_id: int) -> List[models.SocialMedia]:
     """Get all social media profiles for a company."""
-    return db.query(models.SocialMedia).filter(models.SocialMedia.company_id == company_id).all()
+    return db.scalars(_SEL_COMPANY_SOCIAL_MEDIA, {"company_id": company_id}).all()
 
 
 # Enrichment History CRUD operations
 
 def create_enrichment_history(db: Session, enrichment: schemas.EnrichmentHistoryCreate) -> models.EnrichmentHistory:
     """Create enrichment history entry."""
-    import json
     db_enrichment = models.EnrichmentHistory(
         company_id=enrichment.company_id,
         source=enrichment.source,
         status=enrichment.status,
-        details=json.dumps(enrichment.details) if enrichment.details else None
+        details=enrichment.details or None
     )
     db.add(db_enrichment)
-    db.commit()
-    db.refresh(db_enrichment)
+    commit_or_flush(db)
     return db_enrichment
 
 
 def get_company_enrichment_history(db: Session, company_id: int) -> List[models.EnrichmentHistory]:
     """Get enrichment history for a company."""
-    return db.query(models.EnrichmentHistory).filter(
-        models.EnrichmentHistory.company_id == company_id
-    ).order_by(models.EnrichmentHistory.enriched_at.desc()).all()
+    return db.scalars(_SEL_COMPANY_ENRICHMENT_HISTORY, {"company_id": company_id}).all()
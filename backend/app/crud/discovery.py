@@ -0,0 +1,63 @@
+"""
+CRUD operations for discovery bookkeeping (queries, discovered domains, aliases).
+Writes use INSERT ... ON CONFLICT so existence checks don't need their own SELECT.
+"""
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from ..db import models
+
+
+def dialect_insert(db: Session, model):
+    """Return a dialect-specific INSERT construct supporting ON CONFLICT."""
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql.insert(model)
+    return sqlite.insert(model)
+
+
+def get_or_create_discovery_query(db: Session, engine: str, query: str) -> int:
+    """
+    Get the ID of a discovery query, creating the record if needed.
+
+    A no-op ON CONFLICT DO UPDATE makes RETURNING yield the existing row's
+    ID, so this is always a single statement.
+    """
+    stmt = dialect_insert(db, models.DiscoveryQuery).values(engine=engine, query=query)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["engine", "query"],
+        set_={"engine": stmt.excluded.engine}
+    ).returning(models.DiscoveryQuery.id)
+    return db.execute(stmt).scalar_one()
+
+
+def add_discovered_domains(db: Session, rows: List[Dict[str, Any]]) -> None:
+    """
+    Record discovered domains in one statement, skipping (domain, query_id) pairs already stored.
+
+    Args:
+        db: Database session
+        rows: Dicts with domain, query_id and engine keys
+    """
+    if not rows:
+        return
+    stmt = dialect_insert(db, models.DiscoveredDomain).values(rows)
+    db.execute(stmt.on_conflict_do_nothing(index_elements=["domain", "query_id"]))
+
+
+def add_domain_alias(
+    db: Session,
+    primary_domain: str,
+    alias_domain: str,
+    confidence: Optional[float] = None,
+    source: Optional[str] = None
+) -> None:
+    """Record a domain alias, ignoring pairs that already exist."""
+    stmt = dialect_insert(db, models.DomainAlias).values(
+        primary_domain=primary_domain,
+        alias_domain=alias_domain,
+        confidence=confidence,
+        source=source
+    )
+    db.execute(stmt.on_conflict_do_nothing(index_elements=["primary_domain", "alias_domain"]))
@@ -1,168 +1,230 @@
 """
 CRUD operations for Job model.
 """
-from typing import Optional, List
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from typing import Optional, List, Tuple, Union
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import bindparam, desc, func, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
 from ..db import models
+from ..db.unit_of_work import commit_or_flush
 from ..schemas import job as schemas
+from .batch import insert_one
 
+# Statuses resolved once instead of per call
+_QUEUED = schemas.JobStatus.QUEUED
+_RUNNING = schemas.JobStatus.RUNNING
+_TERMINAL_STATUSES = frozenset({
+    schemas.JobStatus.COMPLETED,
+    schemas.JobStatus.FAILED,
+    schemas.JobStatus.CANCELLED,
+})
 
-def generate_job_id() -> str:
-    """Generate a unique job ID."""
-    return f"job_{uuid.uuid4().hex[:12]}"
+
+# Job IDs arrive as strings from paths and Celery task args
+JobId = Union[str, uuid.UUID]
+
+
+def _as_job_uuid(job_id: JobId) -> Optional[uuid.UUID]:
+    """Coerce a job ID to a UUID, or None if it isn't a valid job ID."""
+    if isinstance(job_id, uuid.UUID):
+        return job_id
+    try:
+        return uuid.UUID(job_id)
+    except (TypeError, ValueError, AttributeError):
+        return None
 
 
 def create_job(db: Session, job: schemas.JobCreate, celery_task_id: Optional[str] = None) -> models.Job:
     """Create a new job."""
-    import json
-    job_id = generate_job_id()
-
-    db_job = models.Job(
-        id=job_id,
-        user_id=job.user_id,
-        job_type=job.job_type.value,
-        status=schemas.JobStatus.QUEUED.value,
-        progress=0,
-        config=json.dumps(job.config) if isinstance(job.config, dict) else job.config,
-        celery_task_id=celery_task_id
-    )
-
-    db.add(db_job)
-    db.commit()
-    db.refresh(db_job)
-    return db_job
+    return insert_one(db, models.Job, {
+        "user_id": job.user_id,
+        "job_type": job.job_type.value,
+        "status": _QUEUED,
+        "progress": 0,
+        "config": job.config,
+        "celery_task_id": celery_task_id,
+    })
 
 
-def get_job(db: Session, job_id: str) -> Optional[models.Job]:
+def get_job(db: Session, job_id: JobId) -> Optional[models.Job]:
     """Get job by ID."""
-    return db.query(models.Job).filter(models.Job.id == job_id).first()
+    key = _as_job_uuid(job_id)
+    if key is None:
+        return None
+    return db.get(models.Job, key)
 
 
-def get_jobs_by_user(
-    db: Session,
-    user_id: int,
-    skip: int = 0,
-    limit: int = 50,
-    job_type: Optional[str] = None,
-    status: Optional[str] = None
-) -> List[models.Job]:
-    """Get jobs for a user with optional filters."""
-    query = db.query(models.Job).filter(models.Job.user_id == user_id)
+async def aget_job(db: AsyncSession, job_id: JobId) -> Optional[models.Job]:
+    """Get job by ID on an async session."""
+    key = _as_job_uuid(job_id)
+    if key is None:
+        return None
+    return await db.get(models.Job, key)
 
-    if job_type:
-        query = query.filter(models.Job.job_type == job_type)
 
+def _job_filters(user_id: int, job_type: Optional[str] = None, status: Optional[str] = None) -> list:
+    """Build the WHERE clauses shared by job listing queries."""
+    filters = [models.Job.user_id == user_id]
+    if job_type:
+        filters.append(models.Job.job_type == job_type)
     if status:
-        query = query.filter(models.Job.status == status)
-
-    return query.order_by(desc(models.Job.created_at)).offset(skip).limit(limit).all()
+        filters.append(models.Job.status == status)
+    return filters
 
 
-def count_jobs_by_user(
-    db: Session,
-    user_id: int,
-    job_type: Optional[str] = None,
-    status: Optional[str] = None
-) -> int:
-    """Count jobs for a user with optional filters."""
-    query = db.query(models.Job).filter(models.Job.user_id == user_id)
+def encode_job_cursor(job: models.Job) -> str:
+    """Encode a job's (created_at, id) sort key as an opaque pagination cursor."""
+    return f"{job.created_at.isoformat()}|{job.id}"
 
-    if job_type:
-        query = query.filter(models.Job.job_type == job_type)
 
-    if status:
-        query = query.filter(models.Job.status == status)
+def decode_job_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """
+    Decode a cursor produced by encode_job_cursor.
 
-    return query.count()
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    created_at, _, job_id = cursor.partition("|")
+    if not job_id:
+        raise ValueError(f"Invalid job cursor: {cursor}")
+    return datetime.fromisoformat(created_at), uuid.UUID(job_id)
 
 
-def update_job(db: Session, job_id: str, job_update: schemas.JobUpdate) -> Optional[models.Job]:
-    """Update job status and progress."""
-    import json
-    db_job = get_job(db, job_id)
-    if not db_job:
+def get_jobs_by_user(
+    db: Session,
+    user_id: int,
+    skip: int = 0,
+    limit: int = 50,
+    job_type: Optional[str] = None,
+    status: Optional[str] = None,
+    after: Optional[Tuple[datetime, uuid.UUID]] = None
+) -> Tuple[List[models.Job], int]:
+    """
+    Get a page of jobs for a user with optional filters.
+
+    The total matching count is computed in the same query with a
+    COUNT(*) OVER () window, so callers don't need a separate count.
+    When ``after`` (a decoded cursor) is given, the page starts right after
+    that (created_at, id) key instead of using OFFSET.
+
+    Returns:
+        Tuple of (jobs, total)
+    """
+    filters = _job_filters(user_id, job_type, status)
+    windowed = (
+        select(models.Job, func.count().over().label("total"))
+        .where(*filters)
+        .subquery()
+    )
+    job = aliased(models.Job, windowed)
+    stmt = (
+        select(job, windowed.c.total)
+        .order_by(desc(windowed.c.created_at), desc(windowed.c.id))
+        .limit(limit)
+    )
+    if after is not None:
+        stmt = stmt.where(tuple_(windowed.c.created_at, windowed.c.id) < tuple_(*after))
+    else:
+        stmt = stmt.offset(skip)
+
+    rows = db.execute(stmt).all()
+    if rows:
+        return [row[0] for row in rows], rows[0][1]
+
+    # Past the last page the window has no rows to report a total from
+    if skip or after is not None:
+        total = db.execute(select(func.count()).select_from(models.Job).where(*filters)).scalar_one()
+        return [], total
+    return [], 0
+
+
+def _update_job_returning(db: Session, job_id: JobId, values: dict) -> Optional[models.Job]:
+    """Apply an UPDATE to a single job and return the updated row in the same round-trip."""
+    key = _as_job_uuid(job_id)
+    if key is None:
         return None
+    stmt = (
+        update(models.Job)
+        .where(models.Job.id == key)
+        .values(**values)
+        .returning(models.Job)
+        .execution_options(populate_existing=True)
+    )
+    db_job = db.scalars(stmt).one_or_none()
+    commit_or_flush(db)
+    return db_job
+
 
+def update_job(db: Session, job_id: JobId, job_update: schemas.JobUpdate) -> Optional[models.Job]:
+    """Update job status and progress."""
     update_data = job_update.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        # Serialize dict fields to JSON for SQLite
-        if field == 'result' and isinstance(value, dict):
-            value = json.dumps(value)
-        setattr(db_job, field, value)
-
-    db.commit()
-    db.refresh(db_job)
-    return db_job
+    if not update_data:
+        return get_job(db, job_id)
+
+    return _update_job_returning(db, job_id, update_data)
 
 
 def update_job_status(
     db: Session,
-    job_id: str,
+    job_id: JobId,
     status: schemas.JobStatus,
     progress: Optional[int] = None,
     result: Optional[dict] = None,
     error: Optional[str] = None
 ) -> Optional[models.Job]:
     """Update job status with optional progress, result, or error."""
-    import json
-
-    db_job = get_job(db, job_id)
-    if not db_job:
-        return None
-
-    db_job.status = status.value
+    values = {"status": status}
 
     if progress is not None:
-        db_job.progress = progress
+        values["progress"] = progress
 
     if result is not None:
-        # Convert dict to JSON string for storage
-        db_job.result = json.dumps(result)
+        values["result"] = result
 
     if error is not None:
-        db_job.error = error
+        values["error"] = error
 
     # Update timestamps based on status
-    if status == schemas.JobStatus.RUNNING and not db_job.started_at:
-        db_job.started_at = datetime.utcnow()
-    elif status in [schemas.JobStatus.COMPLETED, schemas.JobStatus.FAILED, schemas.JobStatus.CANCELLED]:
-        db_job.completed_at = datetime.utcnow()
+    if status == _RUNNING:
+        values["started_at"] = func.coalesce(models.Job.started_at, datetime.now(timezone.utc))
+    elif status in _TERMINAL_STATUSES:
+        values["completed_at"] = datetime.now(timezone.utc)
         if status == schemas.JobStatus.COMPLETED:
-            db_job.progress = 100
+            values["progress"] = 100
 
-    db.commit()
-    db.refresh(db_job)
-    return db_job
+    return _update_job_returning(db, job_id, values)
 
 
-def delete_job(db: Session, job_id: str) -> bool:
+def delete_job(db: Session, job_id: JobId) -> bool:
     """Delete a job."""
     db_job = get_job(db, job_id)
     if not db_job:
         return False
 
     db.delete(db_job)
-    db.commit()
+    commit_or_flush(db)
     return True
 
 
+# Statements built once at import and reused with bound parameters
+_SEL_RUNNING_JOBS = select(models.Job).where(models.Job.status == _RUNNING)
+_SEL_STALE_JOBS = _SEL_RUNNING_JOBS.where(models.Job.started_at < bindparam("threshold"))
+
+# Default staleness window, built once
+_STALE_24H = timedelta(hours=24)
+
+
 def get_running_jobs(db: Session) -> List[models.Job]:
     """Get all currently running jobs."""
-    return db.query(models.Job).filter(
-        models.Job.status == schemas.JobStatus.RUNNING.value
-    ).all()
+    return db.scalars(_SEL_RUNNING_JOBS).all()
 
 
 def get_stale_jobs(db: Session, hours: int = 24) -> List[models.Job]:
     """Get jobs that have been running for too long."""
-    from datetime import timedelta
-    threshold = datetime.utcnow() - timedelta(hours=hours)
+    window = _STALE_24H if hours == 24 else timedelta(hours=hours)
+    threshold = datetime.now(timezone.utc) - window
 
-    return db.query(models.Job).filter(
-        models.Job.status == schemas.JobStatus.RUNNING.value,
-        models.Job.started_at < threshold
-    ).all()
+    return db.scalars(_SEL_STALE_JOBS, {"threshold": threshold}).all()
@@ -5,20 +5,35 @@ from typing import Optional, List
 from sqlalchemy.orm import Session
 
 from ..db import models
+from ..db.unit_of_work import commit_or_flush
 from ..schemas import product as schemas
+from .batch import BatchWriter, DEFAULT_BATCH_SIZE, insert_one
 
 
 def get_product(db: Session, product_id: int) -> Optional[models.Product]:
     """Get product by ID."""
-    return db.query(models.Product).filter(models.Product.id == product_id).first()
-
-
-def get_products(db: Session, company_id: Optional[int] = None, skip: int = 0, limit: int = 100) -> List[models.Product]:
-    """Get products with pagination."""
+    return db.get(models.Product, product_id)
+
+
+def get_products(
+    db: Session,
+    company_id: Optional[int] = None,
+    skip: int = 0,
+    limit: int = 100,
+    after_id: Optional[int] = None
+) -> List[models.Product]:
+    """
+    Get products with pagination.
+
+    Pass the last seen product ID as ``after_id`` to seek past it on the
+    primary key instead of using OFFSET.
+    """
     query = db.query(models.Product)
     if company_id:
         query = query.filter(models.Product.company_id == company_id)
-    return query.offset(skip).limit(limit).all()
+    if after_id is not None:
+        return query.filter(models.Product.id > after_id).order_by(models.Product.id).limit(limit).all()
+    return query.order_by(models.Product.id).offset(skip).limit(limit).all()
 
 
 def get_products_count(db: Session, company_id: Optional[int] = None) -> int:
@@ -29,48 +44,39 @@ def get_products_count(db: Session, company_id: Optional[int] = None) -> int:
     return query.count()
 
 
+def _product_row(product: schemas.ProductCreate) -> dict:
+    """Build the column values for a new product."""
+    return {
+        "company_id": product.company_id,
+        "product_external_id": product.product_external_id,
+        "name": product.name,
+        "brand": product.brand,
+        "category": product.category,
+        "price": product.price,
+        "url": product.url,
+        "image_url": product.image_url,
+        "description": product.description,
+        "specs": product.specs or None,
+        "reviews": product.reviews or None,
+    }
+
+
 def create_product(db: Session, product: schemas.ProductCreate) -> models.Product:
     """Create a new product."""
-    import json
-    db_product = models.Product(
-        company_id=product.company_id,
-        product_external_id=product.product_external_id,
-        name=product.name,
-        brand=product.brand,
-        category=product.category,
-        price=product.price,
-        url=product.url,
-        image_url=product.image_url,
-        description=product.description,
-        specs=json.dumps(product.specs) if product.specs else None,
-        reviews=json.dumps(product.reviews) if product.reviews else None
-    )
-    db.add(db_product)
-    db.commit()
-    db.refresh(db_product)
-    return db_product
+    return insert_one(db, models.Product, _product_row(product))
 
 
 def update_product(db: Session, product_id: int, product_update: schemas.ProductUpdate) -> Optional[models.Product]:
     """Update product information."""
-    import json
     db_product = get_product(db, product_id)
     if not db_product:
         return None
 
     update_data = product_update.model_dump(exclude_unset=True)
-
-    # Handle JSON fields
-    if "specs" in update_data and update_data["specs"] is not None:
-        update_data["specs"] = json.dumps(update_data["specs"])
-    if "reviews" in update_data and update_data["reviews"] is not None:
-        update_data["reviews"] = json.dumps(update_data["reviews"])
-
     for field, value in update_data.items():
         setattr(db_product, field, value)
 
-    db.commit()
-    db.refresh(db_product)
+    commit_or_flush(db)
     return db_product
 
 
@@ -81,30 +87,25 @@ def delete_product(db: Session, product_id: int) -> bool:
         return False
 
     db.delete(db_product)
-    db.commit()
+    commit_or_flush(db)
     return True
 
 
-def bulk_create_products(db: Session, products: List[schemas.ProductCreate]) -> List[models.Product]:
-    """Bulk create products."""
-    import json
-    db_products = []
-    for product in products:
-        db_product = models.Product(
-            company_id=product.company_id,
-            product_external_id=product.product_external_id,
-            name=product.name,
-            brand=product.brand,
-            category=product.category,
-            price=product.price,
-            url=product.url,
-            image_url=product.image_url,
-            description=product.description,
-            specs=json.dumps(product.specs) if product.specs else None,
-            reviews=json.dumps(product.reviews) if product.reviews else None
-        )
-        db_products.append(db_product)
-
-    db.bulk_save_objects(db_products)
-    db.commit()
-    return db_products
+def bulk_create_products(
+    db: Session,
+    products: List[schemas.ProductCreate],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    return_objects: bool = True
+) -> List[models.Product]:
+    """
+    Bulk create products.
+
+    Rows are sent as plain dicts through multi-row INSERTs in batches of
+    ``batch_size``, all inside a single transaction. Pass
+    ``return_objects=False`` to skip RETURNING and model hydration when the
+    caller doesn't need the created rows (an empty list is returned).
+    """
+    rows = [_product_row(product) for product in products]
+    with BatchWriter(db, models.Product, batch_size=batch_size, returning=return_objects) as writer:
+        writer.extend(rows)
+    return writer.created
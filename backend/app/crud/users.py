@@ -1,39 +1,119 @@
 """
 CRUD operations for User model.
 """
-from typing import Optional
-from sqlalchemy.orm import Session
+from threading import Lock
+from typing import Any, Dict, Optional
+from cachetools import TTLCache
+from sqlalchemy import bindparam, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
 
 from ..db import models
+from ..db.unit_of_work import commit_or_flush, on_commit
 from ..schemas import user as schemas
+from .batch import insert_one
+
+# Short-lived cache for the per-request auth lookups. Entries are column
+# snapshots (not session-bound ORM objects) and are dropped once an
+# update/delete commits.
+USER_CACHE_TTL_SECONDS = 60
+_USER_COLUMNS = ("id", "auth0_id", "email", "name", "created_at")
+_users_by_auth0_id: TTLCache = TTLCache(maxsize=10_000, ttl=USER_CACHE_TTL_SECONDS)
+_users_by_email: TTLCache = TTLCache(maxsize=10_000, ttl=USER_CACHE_TTL_SECONDS)
+_user_cache_lock = Lock()
+
+# Statements built once at import and reused with bound parameters
+_SEL_USER_BY_EMAIL = select(models.User).where(models.User.email == bindparam("email"))
+_SEL_USER_BY_AUTH0_ID = select(models.User).where(models.User.auth0_id == bindparam("auth0_id"))
+_SEL_ACTIVE_SUBSCRIPTION = select(models.Subscription).where(
+    models.Subscription.user_id == bindparam("user_id"),
+    models.Subscription.status == "active"
+).limit(1)
+
+
+def _cache_user(user: models.User) -> None:
+    """Store a snapshot of the user's columns under its auth0_id and email."""
+    snapshot = {column: getattr(user, column) for column in _USER_COLUMNS}
+    with _user_cache_lock:
+        _users_by_auth0_id[user.auth0_id] = snapshot
+        _users_by_email[user.email] = snapshot
+
+
+def _user_from_snapshot(snapshot: Dict[str, Any]) -> models.User:
+    """Build a detached User from a cached snapshot (re-attachable via db.add)."""
+    user = models.User(**snapshot)
+    make_transient_to_detached(user)
+    return user
+
+
+def _invalidate_user(db: Session, user: models.User) -> None:
+    """
+    Drop cached entries for a user once the session commits.
+
+    Invalidating before the commit would let a concurrent lookup re-cache
+    the old committed row for the full TTL.
+    """
+    auth0_id, email = user.auth0_id, user.email
+
+    def invalidate() -> None:
+        with _user_cache_lock:
+            _users_by_auth0_id.pop(auth0_id, None)
+            _users_by_email.pop(email, None)
+
+    on_commit(db, invalidate)
 
 
 def get_user(db: Session, user_id: int) -> Optional[models.User]:
     """Get user by ID."""
-    return db.query(models.User).filter(models.User.id == user_id).first()
+    return db.get(models.User, user_id)
 
 
 def get_user_by_email(db: Session, email: str) -> Optional[models.User]:
-    """Get user by email."""
-    return db.query(models.User).filter(models.User.email == email).first()
+    """Get user by email (cached for USER_CACHE_TTL_SECONDS)."""
+    with _user_cache_lock:
+        snapshot = _users_by_email.get(email)
+    if snapshot is not None:
+        return _user_from_snapshot(snapshot)
+
+    user = db.scalars(_SEL_USER_BY_EMAIL, {"email": email}).first()
+    if user:
+        _cache_user(user)
+    return user
 
 
 def get_user_by_auth0_id(db: Session, auth0_id: str) -> Optional[models.User]:
-    """Get user by Auth0 ID."""
-    return db.query(models.User).filter(models.User.auth0_id == auth0_id).first()
+    """Get user by Auth0 ID (cached for USER_CACHE_TTL_SECONDS)."""
+    with _user_cache_lock:
+        snapshot = _users_by_auth0_id.get(auth0_id)
+    if snapshot is not None:
+        return _user_from_snapshot(snapshot)
+
+    user = db.scalars(_SEL_USER_BY_AUTH0_ID, {"auth0_id": auth0_id}).first()
+    if user:
+        _cache_user(user)
+    return user
+
+
+async def aget_user_by_auth0_id(db: AsyncSession, auth0_id: str) -> Optional[models.User]:
+    """Get user by Auth0 ID on an async session (shares the sync lookup cache)."""
+    with _user_cache_lock:
+        snapshot = _users_by_auth0_id.get(auth0_id)
+    if snapshot is not None:
+        return _user_from_snapshot(snapshot)
+
+    user = (await db.scalars(_SEL_USER_BY_AUTH0_ID, {"auth0_id": auth0_id})).first()
+    if user:
+        _cache_user(user)
+    return user
 
 
 def create_user(db: Session, user: schemas.UserCreate) -> models.User:
     """Create a new user."""
-    db_user = models.User(
-        auth0_id=user.auth0_id,
-        email=user.email,
-        name=user.name
-    )
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
-    return db_user
+    return insert_one(db, models.User, {
+        "auth0_id": user.auth0_id,
+        "email": user.email,
+        "name": user.name
+    })
 
 
 def update_user(db: Session, user_id: int, user_update: schemas.UserUpdate) -> Optional[models.User]:
@@ -42,12 +122,12 @@ def update_user(db: Session, user_id: int, user_update: schemas.UserUpdate) -> O
     if not db_user:
         return None
 
+    _invalidate_user(db, db_user)
     update_data = user_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_user, field, value)
 
-    db.commit()
-    db.refresh(db_user)
+    commit_or_flush(db)
     return db_user
 
 
@@ -57,23 +137,17 @@ def delete_user(db: Session, user_id: int) -> bool:
     if not db_user:
         return False
 
+    _invalidate_user(db, db_user)
     db.delete(db_user)
-    db.commit()
+    commit_or_flush(db)
     return True
 
 
 def get_user_subscription(db: Session, user_id: int) -> Optional[models.Subscription]:
     """Get active subscription for a user."""
-    return db.query(models.Subscription).filter(
-        models.Subscription.user_id == user_id,
-        models.Subscription.status == "active"
-    ).first()
+    return db.scalars(_SEL_ACTIVE_SUBSCRIPTION, {"user_id": user_id}).first()
 
 
 def create_subscription(db: Session, subscription: schemas.SubscriptionCreate) -> models.Subscription:
     """Create a new subscription."""
-    db_subscription = models.Subscription(**subscription.model_dump())
-    db.add(db_subscription)
-    db.commit()
-    db.refresh(db_subscription)
-    return db_subscription
+    return insert_one(db, models.Subscription, subscription.model_dump())
@@ -1,6 +1,6 @@
 """Database package."""
 # MongoDB imports (primary)
-from .mongodb_session import init_db, close_db, get_mongo_client, get_database
+from .mongodb_session import init_db, close_db, get_mongo_client, get_database, run_sync
 from . import mongodb_models
 
 # SQLAlchemy imports (legacy - for backward compatibility if needed)
@@ -13,5 +13,6 @@ __all__ = [
     "close_db",
     "get_mongo_client",
     "get_database",
+    "run_sync",
     "mongodb_models"
 ]
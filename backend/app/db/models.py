@@ -2,12 +2,19 @@
 SQLAlchemy ORM models for the B2B OSINT Tool.
 Based on schema_recommendation.md.
 """
+import uuid
+
 from sqlalchemy import (
-    Column, Integer, String, Text, Float, Boolean, DateTime, ForeignKey, UniqueConstraint, Index
+    Column, Integer, String, Text, Float, Boolean, DateTime, ForeignKey, UniqueConstraint, Index, JSON, Enum, Uuid
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 from .base import Base
+from ..schemas.job import JobStatus
+
+# Native JSONB on PostgreSQL, JSON text on the SQLite fallback; Python None maps to SQL NULL
+JSONType = JSONB(none_as_null=True).with_variant(JSON(none_as_null=True), "sqlite")
 
 
 class User(Base):
@@ -45,13 +52,17 @@ class Job(Base):
     """Job model for background tasks."""
     __tablename__ = "jobs"
 
-    id = Column(String, primary_key=True)
+    # Native 16-byte uuid on PostgreSQL (CHAR(32) on the SQLite fallback)
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     job_type = Column(String, nullable=False)  # discovery, crawling, enrichment, etc.
-    status = Column(String, nullable=False)  # queued, running, completed, failed, cancelled
+    status = Column(
+        Enum(JobStatus, name="job_status", values_callable=lambda enum: [member.value for member in enum]),
+        nullable=False
+    )  # queued, running, completed, failed, cancelled
     progress = Column(Integer, default=0)
-    config = Column(Text)  # JSON configuration
-    result = Column(Text)  # JSON result
+    config = Column(JSONType)  # JSON configuration
+    result = Column(JSONType)  # JSON result
     error = Column(Text)
     celery_task_id = Column(String)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -59,7 +70,10 @@ class Job(Base):
     completed_at = Column(DateTime(timezone=True))
 
     __table_args__ = (
-        Index("idx_jobs_user_id", "user_id"),
+        # (user_id, created_at DESC) serves get_jobs_by_user pagination without a sort
+        # and replaces the single-column user_id index
+        Index("idx_jobs_user_created", user_id, created_at.desc()),
+        Index("idx_jobs_user_status_created", user_id, status, created_at.desc()),
         Index("idx_jobs_status", "status"),
         Index("idx_jobs_created_at", "created_at"),
     )
@@ -94,6 +108,9 @@ class Company(Base):
     relevance_status = Column(String, default='pending')  # pending, relevant, irrelevant
     relevance_reason = Column(Text)  # Reason for marking as irrelevant
 
+    # Full-text search vector (generated column on PostgreSQL, see migrations/add_company_search_vector.sql)
+    search_vector = deferred(Column(TSVECTOR().with_variant(Text(), "sqlite")))
+
     # Extraction and embedding status
     extracted_at = Column(DateTime(timezone=True))
     embedded_at = Column(DateTime(timezone=True))
@@ -112,6 +129,7 @@ class Company(Base):
     __table_args__ = (
         Index("idx_companies_domain", "domain"),
         Index("idx_companies_user_id", "user_id"),
+        Index("idx_companies_search_vector", "search_vector", postgresql_using="gin"),
     )
 
 
@@ -125,7 +143,7 @@ class Contact(Base):
     value = Column(String, nullable=False)
     source = Column(String)  # website, google, linkedin, social
     confidence = Column(Float)
-    extra_metadata = Column(Text)  # JSON for extra details
+    extra_metadata = Column(JSONType)  # JSON for extra details
     is_primary = Column(Boolean, default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
@@ -171,8 +189,8 @@ class Product(Base):
     url = Column(String)
     image_url = Column(String)
     description = Column(Text)
-    specs = Column(Text)  # JSON blob
-    reviews = Column(Text)  # JSON list
+    specs = Column(JSONType)  # JSON blob
+    reviews = Column(JSONType)  # JSON list
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
@@ -278,7 +296,7 @@ class EnrichmentHistory(Base):
     company_id = Column(Integer, ForeignKey("companies.id", ondelete="CASCADE"), nullable=False)
     source = Column(String, nullable=False)
     status = Column(String, nullable=False)  # success, failure
-    details = Column(Text)  # JSON blob
+    details = Column(JSONType)  # JSON blob
     enriched_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
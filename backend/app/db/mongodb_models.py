@@ -6,10 +6,12 @@ Beanie provides async ODM with Pydantic validation.
 """
 
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Sequence, Union
+import numpy as np
 from pydantic import EmailStr, Field
 from beanie import Document, Indexed, Link
-from pymongo import IndexModel, ASCENDING, DESCENDING
+from bson.binary import Binary
+from pymongo import IndexModel, ASCENDING, DESCENDING, HASHED, TEXT
 
 
 # ============================================
@@ -124,6 +126,30 @@ class Company(Document):
             IndexModel([("domain", ASCENDING), ("user_id", ASCENDING)]),
             IndexModel([("created_at", DESCENDING)]),
             IndexModel([("relevance_status", ASCENDING)]),  # For filtering irrelevant companies
+            # Equality + sort: per-user listings come back in created_at order without an in-memory sort
+            IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING)]),
+            # Partial indexes for the selective listing/count filters; queries must use
+            # the same predicates (see company_repo) for the planner to pick them
+            IndexModel(
+                [("user_id", ASCENDING), ("created_at", DESCENDING)],
+                name="user_created_crawled",
+                partialFilterExpression={"crawl_status": "completed"}
+            ),
+            IndexModel(
+                [("user_id", ASCENDING), ("created_at", DESCENDING)],
+                name="user_created_embedded",
+                partialFilterExpression={"embedded_at": {"$type": "date"}}
+            ),
+            IndexModel(
+                [("user_id", ASCENDING)],
+                name="user_with_contacts",
+                partialFilterExpression={"contacts.0": {"$exists": True}}
+            ),
+            # Text search over name/domain, scoped by the user_id equality prefix
+            IndexModel(
+                [("user_id", ASCENDING), ("company_name", TEXT), ("domain", TEXT)],
+                name="user_company_text"
+            ),
         ]
 
 
@@ -152,6 +178,11 @@ class Product(Document):
             IndexModel([("domain", ASCENDING)]),
             IndexModel([("brand", ASCENDING)]),
             IndexModel([("category", ASCENDING)]),
+            # Text search over product fields, scoped by the domain equality prefix
+            IndexModel(
+                [("domain", ASCENDING), ("name", TEXT), ("brand", TEXT), ("category", TEXT), ("description", TEXT)],
+                name="domain_product_text"
+            ),
         ]
 
 
@@ -182,6 +213,12 @@ class DiscoveredDomain(Document):
         ]
 
 
+# Cache lifetimes, enforced server-side by TTL indexes
+QUERY_CACHE_TTL_SECONDS = 7 * 24 * 3600
+VETTING_RESULT_TTL_SECONDS = 14 * 24 * 3600
+EMAIL_VERIFICATION_TTL_SECONDS = 30 * 24 * 3600
+
+
 class QueryCache(Document):
     """Cache for completed search queries"""
     engine: str
@@ -193,6 +230,8 @@ class QueryCache(Document):
         name = "query_cache"
         indexes = [
             IndexModel([("engine", ASCENDING), ("query", ASCENDING)], unique=True),
+            # Expired queries are dropped by MongoDB and get re-run on the next discovery
+            IndexModel([("completed_at", ASCENDING)], expireAfterSeconds=QUERY_CACHE_TTL_SECONDS),
         ]
 
 
@@ -209,6 +248,7 @@ class VettingResult(Document):
         name = "vetting_results"
         indexes = [
             IndexModel([("domain", ASCENDING)], unique=True),
+            IndexModel([("vetted_at", ASCENDING)], expireAfterSeconds=VETTING_RESULT_TTL_SECONDS),
         ]
 
 
@@ -218,31 +258,33 @@ class VettingResult(Document):
 
 class CrawledPage(Document):
     """Individual crawled page"""
-    domain: Indexed(str)
+    domain: str
     url: Indexed(str)
     title: Optional[str] = None
     content: str = ""
-    content_hash: Indexed(str)  # SHA256 for deduplication
+    content_digest: Optional[str] = None  # XXH3-128 of the content, for deduplication
+    content_hash: Optional[str] = None  # SHA256, only on pages crawled before content_digest
     depth: int = 0
     crawled_at: datetime = Field(default_factory=datetime.utcnow)
 
     class Settings:
         name = "crawled_pages"
         indexes = [
-            IndexModel([("domain", ASCENDING)]),
+            # Also serves domain-only queries; depth=0 finds the homepage
+            IndexModel([("domain", ASCENDING), ("depth", ASCENDING)]),
             IndexModel([("url", ASCENDING)]),
-            IndexModel([("content_hash", ASCENDING)]),
+            # Hashed: equality-only dedup lookups on uniformly distributed digest keys
+            IndexModel([("content_digest", HASHED)]),
             IndexModel([("crawled_at", DESCENDING)]),
         ]
 
 
 class CrawlState(Document):
-    """Crawl state tracking for a domain"""
+    """Crawl state summary for a domain (visited URLs/hashes live in their own collections)"""
     domain: Indexed(str, unique=True)
-    visited_urls: List[str] = []
-    visited_hashes: List[str] = []
     is_complete: bool = False
     pages_crawled: int = 0
+    urls_visited: int = 0
     started_at: datetime = Field(default_factory=datetime.utcnow)
     completed_at: Optional[datetime] = None
 
@@ -253,6 +295,37 @@ class CrawlState(Document):
         ]
 
 
+class VisitedUrl(Document):
+    """A URL visited while crawling a domain (one document per URL)"""
+    domain: str
+    url: str
+    visited_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "visited_urls"
+        indexes = [
+            IndexModel([("domain", ASCENDING), ("url", ASCENDING)], unique=True),
+        ]
+
+
+class CrawledContentHash(Document):
+    """
+    A page digest seen while crawling a domain, used to skip duplicate pages.
+
+    New entries hold XXH3-128 content digests; crawls recorded earlier hold
+    SHA-256 hashes, which simply never match a new digest.
+    """
+    domain: str
+    content_hash: str
+    seen_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "crawl_content_hashes"
+        indexes = [
+            IndexModel([("domain", ASCENDING), ("content_hash", ASCENDING)], unique=True),
+        ]
+
+
 # ============================================
 # Enrichment Models
 # ============================================
@@ -311,6 +384,7 @@ class Campaign(Document):
             IndexModel([("user_id", ASCENDING)]),
             IndexModel([("status", ASCENDING)]),
             IndexModel([("created_at", DESCENDING)]),
+            IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING)]),
         ]
 
 
@@ -350,6 +424,10 @@ class EmailDraft(Document):
             IndexModel([("campaign_id", ASCENDING)]),
             IndexModel([("status", ASCENDING)]),
             IndexModel([("created_at", DESCENDING)]),
+            # Equality + sort for the per-campaign / per-company / per-user draft listings
+            IndexModel([("campaign_id", ASCENDING), ("created_at", DESCENDING)]),
+            IndexModel([("company_id", ASCENDING), ("created_at", DESCENDING)]),
+            IndexModel([("user_id", ASCENDING), ("status", ASCENDING), ("created_at", DESCENDING)]),
         ]
 
 
@@ -366,6 +444,7 @@ class EmailVerificationCache(Document):
         name = "email_verification_cache"
         indexes = [
             IndexModel([("email", ASCENDING)], unique=True),
+            IndexModel([("verified_at", ASCENDING)], expireAfterSeconds=EMAIL_VERIFICATION_TTL_SECONDS),
         ]
 
 
@@ -387,15 +466,22 @@ class EmailWhitelist(Document):
 # RAG Models
 # ============================================
 
+# OpenAI text-embedding-3-small
+RAG_EMBEDDING_DIMENSIONS = 1536
+
+# BSON vector binary (subtype 9): a dtype/padding header then packed values.
+# Atlas Vector Search can index this layout directly.
+BSON_VECTOR_SUBTYPE = 9
+_FLOAT32_VECTOR_HEADER = b"\x27\x00"
+
 class RAGEmbedding(Document):
-    """RAG embeddings stored in MongoDB"""
-    domain: Indexed(str)
+    """RAG chunk metadata; the vector itself lives in RAGEmbeddingVector"""
+    domain: str
     chunk_id: Indexed(str, unique=True)
     collection_name: str  # raw_pages, products, companies
 
     # Content
     content: str  # The actual text chunk
-    embedding: List[float]  # 1536 dimensions for OpenAI text-embedding-3-small
 
     # Content metadata
     content_hash: str
@@ -413,12 +499,90 @@ class RAGEmbedding(Document):
     class Settings:
         name = "rag_embeddings"
         indexes = [
-            IndexModel([("domain", ASCENDING)]),
+            # Also serves domain-only listing, counting and deletes
+            IndexModel([("domain", ASCENDING), ("collection_name", ASCENDING)]),
             IndexModel([("chunk_id", ASCENDING)], unique=True),
             IndexModel([("collection_name", ASCENDING)]),
-            IndexModel([("content_hash", ASCENDING)]),
+            IndexModel([("content_hash", HASHED)]),
+        ]
+
+
+class RAGEmbeddingVector(Document):
+    """
+    Embedding vector for a RAGEmbedding chunk, joined on chunk_id.
+
+    Kept apart from the chunk metadata so listing, counting and deleting
+    chunks never touch the multi-KB vectors. domain and collection_name are
+    copied here so similarity search can scope the scan without a join.
+    """
+    chunk_id: Indexed(str, unique=True)
+    domain: str
+    collection_name: str
+
+    # BSON float32 vector (1536 dims for OpenAI text-embedding-3-small);
+    # older documents hold headerless packed float32 or a list of doubles
+    embedding: Union[bytes, List[float]]
+    # Sign bits of the embedding (1 bit per dimension, 192 bytes) for the
+    # Hamming pre-filter; absent on documents embedded before it was added
+    embedding_bq: Optional[bytes] = None
+    # Whether embedding was scaled to unit length at ingest; search only
+    # computes norms for legacy rows without it
+    normalized: bool = False
+
+    class Settings:
+        name = "rag_embedding_vectors"
+        indexes = [
+            IndexModel([("chunk_id", ASCENDING)], unique=True),
+            IndexModel([("domain", ASCENDING), ("collection_name", ASCENDING)]),
         ]
 
+    @staticmethod
+    def normalize_vector(vector: Union[Sequence[float], np.ndarray]) -> np.ndarray:
+        """Scale a vector to unit length as float32 (zero vectors stay zero)"""
+        vec = np.asarray(vector, dtype=np.float32)
+        return vec / (np.linalg.norm(vec) + 1e-12)
+
+    @staticmethod
+    def pack_vector(vector: Union[Sequence[float], np.ndarray]) -> Binary:
+        """Pack a vector as a BSON float32 vector (4 bytes per dimension + 2-byte header)"""
+        data = _FLOAT32_VECTOR_HEADER + np.asarray(vector, dtype="<f4").tobytes()
+        return Binary(data, BSON_VECTOR_SUBTYPE)
+
+    @staticmethod
+    def unpack_vector(stored: Union[bytes, List[float]]) -> np.ndarray:
+        """Read a stored embedding (BSON vector, packed buffer or legacy list) as float32"""
+        if isinstance(stored, (bytes, bytearray, memoryview)):
+            # float32 payloads are a multiple of 4 bytes; 2 extra means a vector header
+            offset = len(_FLOAT32_VECTOR_HEADER) if len(stored) % 4 == 2 else 0
+            return np.frombuffer(stored, dtype="<f4", offset=offset)
+        return np.asarray(stored, dtype=np.float32)
+
+    @staticmethod
+    def unpack_vectors(stored: List[Union[bytes, List[float]]]) -> np.ndarray:
+        """
+        Decode many stored embeddings into one (N, d) float32 matrix.
+
+        Same-length binary vectors (the normal case) are decoded with a single
+        frombuffer over the concatenated payloads instead of one array per row.
+        """
+        width = len(stored[0]) if isinstance(stored[0], (bytes, bytearray)) else None
+        if width is None or any(not isinstance(vec, (bytes, bytearray)) or len(vec) != width for vec in stored):
+            return np.vstack([RAGEmbeddingVector.unpack_vector(vec) for vec in stored])
+
+        raw = np.frombuffer(b"".join(stored), dtype=np.uint8).reshape(len(stored), width)
+        if width % 4 == 2:
+            raw = raw[:, len(_FLOAT32_VECTOR_HEADER):]
+        return np.ascontiguousarray(raw).view("<f4")
+
+    @staticmethod
+    def quantize_vector(vector: Union[Sequence[float], np.ndarray]) -> bytes:
+        """Binary-quantize a vector to its packed sign bits"""
+        return np.packbits(np.asarray(vector, dtype=np.float32) > 0).tobytes()
+
+    def to_vector(self) -> np.ndarray:
+        """This document's embedding as a float32 array"""
+        return self.unpack_vector(self.embedding)
+
 
 class RAGQuery(Document):
     """RAG query history for analytics"""
@@ -452,11 +616,14 @@ DOCUMENT_MODELS = [
     VettingResult,
     CrawledPage,
     CrawlState,
+    VisitedUrl,
+    CrawledContentHash,
     EnrichmentResult,
     Campaign,
     EmailDraft,
     EmailVerificationCache,
     EmailWhitelist,
     RAGEmbedding,
+    RAGEmbeddingVector,
     RAGQuery,
 ]
@@ -5,9 +5,13 @@ Handles MongoDB connection initialization and Beanie ODM setup.
 """
 
 import asyncio
+import os
+import threading
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import MongoClient
+from pymongo.database import Database
 from beanie import init_beanie
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from ..core.config import get_settings
 from .mongodb_models import DOCUMENT_MODELS
@@ -18,6 +22,54 @@ settings = get_settings()
 _mongo_client: Optional[AsyncIOMotorClient] = None
 _initialized_loops = set()
 
+# Native pymongo client for sync callers, owned by the process that created it
+_sync_client: Optional[MongoClient] = None
+_sync_client_pid: Optional[int] = None
+_sync_client_lock = threading.Lock()
+
+# Background event loop behind run_sync. Created on first use so importing
+# this module doesn't start a thread. It owns a dedicated Motor client created
+# once on that loop, and never touches _mongo_client, so sync callers don't
+# swap the client out from under the API or Celery loops.
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+_worker_thread: Optional[threading.Thread] = None
+_worker_loop_lock = threading.Lock()
+_worker_client: Optional[AsyncIOMotorClient] = None
+
+# Client Beanie's document classes are currently bound to (init_beanie is
+# process-wide, so a loop re-binds it only if another loop bound it since)
+_beanie_client: Optional[AsyncIOMotorClient] = None
+
+
+def mongo_client_options() -> Dict[str, Any]:
+    """
+    Connection pool, compression and timeout options for MongoDB clients.
+
+    One client is shared per event loop (see init_db), so Celery prefork
+    workers hold a single pool each rather than one per task.
+    """
+    return {
+        "maxPoolSize": settings.MONGO_MAX_POOL_SIZE,
+        "minPoolSize": settings.MONGO_MIN_POOL_SIZE,
+        "maxIdleTimeMS": settings.MONGO_MAX_IDLE_TIME_MS,
+        "compressors": settings.MONGO_COMPRESSORS,
+        "retryWrites": True,
+        "serverSelectionTimeoutMS": settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "waitQueueTimeoutMS": settings.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+    }
+
+
+async def _bind_beanie(client: AsyncIOMotorClient, force: bool = False) -> None:
+    """Point Beanie's document classes at client, unless they already are"""
+    global _beanie_client
+
+    if force or _beanie_client is not client:
+        await init_beanie(
+            database=client.get_default_database(settings.MONGODB_DB),
+            document_models=DOCUMENT_MODELS
+        )
+        _beanie_client = client
+
 
 async def init_db(force: bool = False):
     """
@@ -29,6 +81,11 @@ async def init_db(force: bool = False):
     """
     global _mongo_client
 
+    # run_sync's worker loop keeps its own client and never touches _mongo_client
+    if threading.current_thread() is _worker_thread:
+        await _init_worker_db()
+        return
+
     # Get current event loop ID
     try:
         loop = asyncio.get_running_loop()
@@ -59,27 +116,26 @@ async def init_db(force: bool = False):
 
     # Create Motor async client (reuse if exists)
     if _mongo_client is None:
-        _mongo_client = AsyncIOMotorClient(settings.DATABASE_URL)
+        _mongo_client = AsyncIOMotorClient(settings.DATABASE_URL, **mongo_client_options())
         _initialized_loops.clear() # Reset init tracking for new client
 
     # Get database (MongoDB will extract db name from connection string)
-    database = _mongo_client.get_default_database()
+    database = _mongo_client.get_default_database(settings.MONGODB_DB)
 
     # Initialize Beanie with all document models
-    # We need to re-init Beanie if we created a new client OR if this loop hasn't initialized it yet
-    if loop_id and loop_id not in _initialized_loops:
-        await init_beanie(
-            database=database,
-            document_models=DOCUMENT_MODELS
-        )
+    # We need to re-init Beanie if we created a new client, if this loop hasn't
+    # initialized it yet, or if the run_sync worker loop re-bound it since
+    if loop_id and (force or loop_id not in _initialized_loops or _beanie_client is not _mongo_client):
+        await _bind_beanie(_mongo_client, force=True)
+        if not _initialized_loops:
+            # Imported here: the repositories package imports this module
+            from .repositories.rag_repo import ensure_vector_search_index
+            await ensure_vector_search_index(database)
         _initialized_loops.add(loop_id)
         # print(f"MongoDB connected: {database.name} (Loop: {loop_id})")
     elif not loop_id:
-         # Fallback for no-loop context (shouldn't happen with async def)
-         await init_beanie(
-            database=database,
-            document_models=DOCUMENT_MODELS
-        )
+        # Fallback for no-loop context (shouldn't happen with async def)
+        await _bind_beanie(_mongo_client, force=True)
 
 
 async def close_db():
@@ -92,13 +148,17 @@ async def close_db():
     if _mongo_client:
         _mongo_client.close()
         print("MongoDB connection closed")
+    close_sync_db()
 
 
 def get_mongo_client() -> AsyncIOMotorClient:
     """
     Get the MongoDB client instance.
     Use this for operations not covered by Beanie.
+    On the run_sync worker loop this is the worker's dedicated client.
     """
+    if _worker_client is not None and threading.current_thread() is _worker_thread:
+        return _worker_client
     if _mongo_client is None:
         raise RuntimeError("MongoDB client not initialized. Call init_db() first.")
     return _mongo_client
@@ -109,4 +169,74 @@ async def get_database():
     Get the default database.
     """
     client = get_mongo_client()
-    return client.get_default_database()
+    return client.get_default_database(settings.MONGODB_DB)
+
+
+def _get_worker_loop() -> asyncio.AbstractEventLoop:
+    global _worker_loop, _worker_thread
+    with _worker_loop_lock:
+        if _worker_loop is None:
+            _worker_loop = asyncio.new_event_loop()
+            _worker_thread = threading.Thread(target=_worker_loop.run_forever, name="mongo-sync-loop", daemon=True)
+            _worker_thread.start()
+    return _worker_loop
+
+
+async def _init_worker_db() -> None:
+    # The worker client is created once, on the worker loop; Beanie is only
+    # re-bound to it if another loop re-initialized Beanie in the meantime
+    global _worker_client
+
+    if _worker_client is None:
+        _worker_client = AsyncIOMotorClient(
+            settings.DATABASE_URL, io_loop=asyncio.get_running_loop(), **mongo_client_options()
+        )
+    await _bind_beanie(_worker_client)
+
+
+async def _with_worker_db(coro):
+    await _init_worker_db()
+    return await coro
+
+
+def run_sync(coro):
+    """
+    Run an async repository coroutine from sync code and wait for its result.
+
+    The coroutine runs on a shared background event loop with its own Motor
+    client, so this works from plain sync code and from within an existing
+    event loop.
+    """
+    loop = _get_worker_loop()
+    if threading.current_thread() is _worker_thread:
+        coro.close()
+        raise RuntimeError("run_sync cannot be called from the Mongo worker loop")
+    return asyncio.run_coroutine_threadsafe(_with_worker_db(coro), loop).result()
+
+
+def get_sync_database() -> Database:
+    """
+    Get the default database on a native pymongo client.
+
+    For sync code (discovery, crawling, Celery tasks): pymongo pools its own
+    connections, so calls skip the Motor executor and the shared event loop.
+    The client is created lazily and again after a fork, since pymongo
+    clients must not be shared across processes (Celery prefork).
+    """
+    global _sync_client, _sync_client_pid
+
+    pid = os.getpid()
+    with _sync_client_lock:
+        if _sync_client is None or _sync_client_pid != pid:
+            _sync_client = MongoClient(settings.DATABASE_URL, **mongo_client_options())
+            _sync_client_pid = pid
+    return _sync_client.get_default_database(settings.MONGODB_DB)
+
+
+def close_sync_db():
+    """Close the native pymongo client, if this process opened one"""
+    global _sync_client
+
+    if _sync_client is not None and _sync_client_pid == os.getpid():
+        _sync_client.close()
+    _sync_client = None
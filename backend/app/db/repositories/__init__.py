@@ -14,7 +14,9 @@ from .company_repo import (
     update_company_enrichment,
     delete_company,
     count_companies_by_user,
-    search_companies
+    search_companies,
+    invalidate_company_cache,
+    invalidate_company_cache_sync
 )
 
 from .product_repo import (
@@ -30,6 +32,7 @@ from .product_repo import (
 
 from .discovery_repo import (
     add_discovered_domain,
+    add_discovered_domains,
     get_discovered_domains,
     get_discovered_domains_set,
     save_query_cache,
@@ -46,20 +49,29 @@ from .crawling_repo import (
     mark_crawl_complete,
     get_visited_urls,
     get_content_hashes,
+    get_crawl_bootstrap,
+    add_visited_urls,
+    add_content_hashes,
     is_domain_crawled,
     get_crawl_status_batch,
     save_crawled_page,
+    save_crawled_pages,
     get_crawled_pages,
+    iter_crawled_pages,
     get_crawled_page_count,
     get_crawl_state_sync,
     update_crawl_state_sync,
     get_visited_urls_sync,
     get_content_hashes_sync,
+    get_crawl_bootstrap_sync,
     is_domain_crawled_sync,
     get_crawl_status_batch_sync,
     mark_crawl_complete_sync,
     save_crawled_page_sync,
+    flush_crawled_pages_sync,
+    save_crawled_pages_sync,
     get_crawled_pages_sync,
+    iter_crawled_pages_sync,
     get_crawled_page_count_sync
 )
 
@@ -72,6 +84,7 @@ from .rag_repo import (
     count_embeddings_by_domain,
     search_similar_embeddings,
     cosine_similarity,
+    invalidate_domain_vectors,
     get_embedding_by_chunk_id_sync,
     create_embeddings_bulk_sync,
     delete_embeddings_by_domain_sync,
@@ -91,6 +104,8 @@ __all__ = [
     "delete_company",
     "count_companies_by_user",
     "search_companies",
+    "invalidate_company_cache",
+    "invalidate_company_cache_sync",
     # Product
     "get_product_by_id",
     "get_products_by_company",
@@ -102,6 +117,7 @@ __all__ = [
     "search_products",
     # Discovery
     "add_discovered_domain",
+    "add_discovered_domains",
     "get_discovered_domains",
     "get_discovered_domains_set",
     "save_query_cache",
@@ -116,20 +132,29 @@ __all__ = [
     "mark_crawl_complete",
     "get_visited_urls",
     "get_content_hashes",
+    "get_crawl_bootstrap",
+    "add_visited_urls",
+    "add_content_hashes",
     "is_domain_crawled",
     "get_crawl_status_batch",
     "save_crawled_page",
+    "save_crawled_pages",
     "get_crawled_pages",
+    "iter_crawled_pages",
     "get_crawled_page_count",
     "get_crawl_state_sync",
     "update_crawl_state_sync",
     "get_visited_urls_sync",
     "get_content_hashes_sync",
+    "get_crawl_bootstrap_sync",
     "is_domain_crawled_sync",
     "get_crawl_status_batch_sync",
     "mark_crawl_complete_sync",
     "save_crawled_page_sync",
+    "flush_crawled_pages_sync",
+    "save_crawled_pages_sync",
     "get_crawled_pages_sync",
+    "iter_crawled_pages_sync",
     "get_crawled_page_count_sync",
     # RAG
     "create_embedding",
@@ -140,6 +165,7 @@ __all__ = [
     "count_embeddings_by_domain",
     "search_similar_embeddings",
     "cosine_similarity",
+    "invalidate_domain_vectors",
     "get_embedding_by_chunk_id_sync",
     "create_embeddings_bulk_sync",
     "delete_embeddings_by_domain_sync",
@@ -0,0 +1,200 @@
+"""
+Bulk Insert Helpers
+
+Unordered multi-document inserts and batched deletes shared by the
+repositories, and a batcher that coalesces concurrent single-document
+inserts from sync code.
+"""
+
+import atexit
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from pymongo.collection import Collection
+from pymongo.errors import BulkWriteError
+
+# MongoDB duplicate-key error code
+DUPLICATE_KEY = 11000
+
+
+async def insert_many_unordered(model, documents: List[Dict[str, Any]]) -> int:
+    """
+    Insert documents in one unordered batch, skipping unique-index duplicates.
+
+    Returns the number of documents actually inserted.
+    """
+    if not documents:
+        return 0
+    try:
+        result = await model.get_motor_collection().insert_many(documents, ordered=False)
+        return len(result.inserted_ids)
+    except BulkWriteError as e:
+        raise_unless_duplicates(e)
+        return e.details["nInserted"]
+
+
+def insert_many_unordered_sync(collection, documents: List[Dict[str, Any]]) -> int:
+    """insert_many_unordered on a pymongo collection (sync)"""
+    if not documents:
+        return 0
+    try:
+        return len(collection.insert_many(documents, ordered=False).inserted_ids)
+    except BulkWriteError as e:
+        raise_unless_duplicates(e)
+        return e.details["nInserted"]
+
+
+def inserted_ids_after(error: BulkWriteError, documents: List[Dict[str, Any]]) -> List[Any]:
+    """IDs of the documents an unordered insert_many still inserted despite write errors"""
+    # The driver assigns _id client-side, so the documents already carry theirs
+    failed = {write_error["index"] for write_error in error.details["writeErrors"]}
+    return [doc["_id"] for i, doc in enumerate(documents) if i not in failed]
+
+
+# Documents removed per delete round-trip by the batched deletes
+DELETE_BATCH_SIZE = 1000
+
+
+async def delete_many_batched(model, query: Dict[str, Any], batch_size: int = DELETE_BATCH_SIZE) -> int:
+    """
+    Delete the documents matching query in _id batches, returning the number deleted.
+
+    Each batch is a short delete_many, so removing a large domain doesn't
+    run as one long operation and other writers interleave between batches.
+    """
+    collection = model.get_motor_collection()
+    deleted = 0
+    while True:
+        ids = [doc["_id"] async for doc in collection.find(query, {"_id": 1}).limit(batch_size)]
+        if not ids:
+            return deleted
+        deleted += (await collection.delete_many({"_id": {"$in": ids}})).deleted_count
+
+
+def delete_many_batched_sync(collection, query: Dict[str, Any], batch_size: int = DELETE_BATCH_SIZE) -> int:
+    """delete_many_batched on a pymongo collection (sync)"""
+    deleted = 0
+    while True:
+        ids = [doc["_id"] for doc in collection.find(query, {"_id": 1}).limit(batch_size)]
+        if not ids:
+            return deleted
+        deleted += collection.delete_many({"_id": {"$in": ids}}).deleted_count
+
+
+def raise_unless_duplicates(error: BulkWriteError) -> None:
+    """Re-raise a bulk write error unless every failure was a duplicate key"""
+    if any(write_error["code"] != DUPLICATE_KEY for write_error in error.details["writeErrors"]):
+        raise error
+
+
+# Queue entry that asks the flusher to report once everything before it is written
+_FLUSH = object()
+
+
+class InsertBatcher:
+    """
+    Coalesces single-document inserts from many threads into unordered insert_many calls.
+
+    submit() queues a document and returns a Future; a background thread
+    writes whatever has queued up, at most max_batch documents or max_wait
+    seconds after the first one, in a single round-trip. The Future resolves
+    to the document's ID, or None if it was a duplicate.
+    """
+
+    def __init__(
+        self,
+        get_collection: Callable[[], Collection],
+        max_batch: int = 500,
+        max_wait: float = 0.02
+    ):
+        self._get_collection = get_collection
+        self._max_batch = max_batch
+        self._max_wait = max_wait
+        self._lock = threading.Lock()
+        self._queue: Optional[queue.SimpleQueue] = None
+        self._pid: Optional[int] = None
+        _batchers.append(self)
+
+    def submit(self, document: Dict[str, Any]) -> Future:
+        """Queue a document for the next batch"""
+        future = Future()
+        self._get_queue().put((document, future))
+        return future
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """Block until every document submitted so far has been written"""
+        if self._queue is None or self._pid != os.getpid():
+            return
+        done = Future()
+        self._queue.put((_FLUSH, done))
+        done.result(timeout)
+
+    def _get_queue(self) -> queue.SimpleQueue:
+        # One flusher per process: threads don't survive a fork (Celery prefork)
+        with self._lock:
+            if self._queue is None or self._pid != os.getpid():
+                self._queue = queue.SimpleQueue()
+                self._pid = os.getpid()
+                threading.Thread(target=self._run, args=(self._queue,), name="mongo-insert-batcher", daemon=True).start()
+            return self._queue
+
+    def _run(self, pending: queue.SimpleQueue) -> None:
+        while True:
+            batch: List[Tuple[Dict[str, Any], Future]] = []
+            flushes: List[Future] = []
+            item = pending.get()
+            deadline = time.monotonic() + self._max_wait
+            while True:
+                if item[0] is _FLUSH:
+                    flushes.append(item[1])
+                    break
+                batch.append(item)
+                remaining = deadline - time.monotonic()
+                if len(batch) >= self._max_batch or remaining <= 0:
+                    break
+                try:
+                    item = pending.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            self._write(batch)
+            for done in flushes:
+                done.set_result(None)
+
+    def _write(self, batch: List[Tuple[Dict[str, Any], Future]]) -> None:
+        if not batch:
+            return
+        documents = [document for document, _ in batch]
+        # Index -> error to raise, or None for a skipped duplicate
+        errors: Dict[int, Optional[Exception]] = {}
+        try:
+            self._get_collection().insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            for write_error in e.details["writeErrors"]:
+                errors[write_error["index"]] = None if write_error["code"] == DUPLICATE_KEY else e
+        except Exception as e:
+            errors = {i: e for i in range(len(batch))}
+
+        for i, (document, future) in enumerate(batch):
+            if i not in errors:
+                future.set_result(str(document["_id"]))
+            elif errors[i] is None:
+                future.set_result(None)
+            else:
+                future.set_exception(errors[i])
+
+
+_batchers: List[InsertBatcher] = []
+
+
+@atexit.register
+def flush_insert_batchers(timeout: Optional[float] = 10) -> None:
+    """Write out everything still queued in this process's insert batchers"""
+    for batcher in _batchers:
+        try:
+            batcher.flush(timeout)
+        except Exception as e:
+            print(f"Warning: Failed to flush queued MongoDB inserts: {e}")
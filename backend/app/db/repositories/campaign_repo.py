@@ -3,9 +3,23 @@ Campaign and Email Draft Repository
 """
 from typing import List, Optional, Dict, Any
 from datetime import datetime
-from beanie import PydanticObjectId
+from beanie import PydanticObjectId, UpdateResponse
 from app.db.mongodb_models import Campaign, EmailDraft
 
+
+async def _set_by_id(model, doc_id: str, update_data: Dict[str, Any]):
+    """$set fields on one document by ID and return it, in a single findOneAndUpdate"""
+    try:
+        object_id = PydanticObjectId(doc_id)
+    except Exception:
+        return None
+
+    update_data['updated_at'] = datetime.utcnow()
+    return await model.find_one(model.id == object_id).update(
+        {"$set": update_data},
+        response_type=UpdateResponse.NEW_DOCUMENT
+    )
+
 # --- Campaign Operations ---
 
 async def create_campaign(user_id: str, campaign_data: Dict[str, Any]) -> Campaign:
@@ -25,13 +39,7 @@ async def get_campaigns_by_user(user_id: str, skip: int = 0, limit: int = 50) ->
     ).sort("-created_at").skip(skip).limit(limit).to_list()
 
 async def update_campaign(campaign_id: str, update_data: Dict[str, Any]) -> Optional[Campaign]:
-    campaign = await get_campaign(campaign_id)
-    if not campaign:
-        return None
-    
-    update_data['updated_at'] = datetime.utcnow()
-    await campaign.set(update_data)
-    return campaign
+    return await _set_by_id(Campaign, campaign_id, update_data)
 
 async def delete_campaign(campaign_id: str) -> bool:
     campaign = await get_campaign(campaign_id)
@@ -68,10 +76,4 @@ async def get_draft_by_company(company_id: str) -> Optional[EmailDraft]:
     ).sort("-created_at").first_or_none()
 
 async def update_draft(draft_id: str, update_data: Dict[str, Any]) -> Optional[EmailDraft]:
-    draft = await get_draft(draft_id)
-    if not draft:
-        return None
-    
-    update_data['updated_at'] = datetime.utcnow()
-    await draft.set(update_data)
-    return draft
+    return await _set_by_id(EmailDraft, draft_id, update_data)
@@ -4,12 +4,50 @@ Company Repository
 CRUD operations for Company documents.
 """
 
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Type, Union
 from datetime import datetime
-from beanie import PydanticObjectId
+from beanie import PydanticObjectId, UpdateResponse
+from pydantic import BaseModel, Field
 
+from ...core.cache import cache_get, cache_invalidate, cache_invalidate_sync, cache_set
 from ..mongodb_models import Company
 
+# Filters written to match the partial indexes on Company exactly
+_EMBEDDED = {"embedded_at": {"$type": "date"}}
+_HAS_CONTACTS = {"contacts.0": {"$exists": True}}
+
+
+def _cache_namespace(user_id: str) -> str:
+    """Redis hash holding a user's cached company listings and counts"""
+    return f"cmp:{user_id}"
+
+
+async def invalidate_company_cache(*user_ids: str) -> None:
+    """Drop cached listings and counts for users whose companies changed"""
+    await cache_invalidate(*{_cache_namespace(user_id) for user_id in user_ids if user_id})
+
+
+def invalidate_company_cache_sync(*user_ids: str) -> None:
+    """Sync variant of invalidate_company_cache, for raw pymongo writes"""
+    cache_invalidate_sync(*{_cache_namespace(user_id) for user_id in user_ids if user_id})
+
+
+class CompanyListView(BaseModel):
+    """Projection of the Company fields rendered by company listings"""
+    id: PydanticObjectId = Field(alias="_id")
+    domain: str
+    company_name: Optional[str] = None
+    description: Optional[str] = None
+    contacts: List[Dict[str, Any]] = []
+    social_media: List[Dict[str, Any]] = []
+    crawl_status: Optional[str] = None
+    relevance_status: Optional[str] = None
+    extracted_at: Optional[datetime] = None
+    enriched_at: Optional[datetime] = None
+    embedded_at: Optional[datetime] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
 
 async def get_company_by_id(company_id: str) -> Optional[Company]:
     """Get company by ID"""
@@ -45,9 +83,24 @@ async def get_companies_by_user(
     limit: int = 100,
     exclude_irrelevant: bool = False,
     only_embedded: bool = False,
-    crawled_only: bool = False
-) -> List[Company]:
-    """Get all companies for a user with pagination (shows all by default, including those pending review)"""
+    crawled_only: bool = False,
+    projection_model: Optional[Type[BaseModel]] = CompanyListView
+) -> List[Union[Company, BaseModel]]:
+    """
+    Get all companies for a user with pagination (shows all by default, including those pending review).
+
+    Only the listing fields (CompanyListView) are fetched by default; pass
+    projection_model=None to load full Company documents. Default listings
+    are cached in Redis for a few seconds and dropped on company writes
+    (including the raw embedded_at update in the embed task).
+    """
+    cacheable = projection_model is CompanyListView
+    if cacheable:
+        cache_key = f"list:{skip}:{limit}:{exclude_irrelevant:d}{only_embedded:d}{crawled_only:d}"
+        cached = await cache_get(_cache_namespace(user_id), cache_key)
+        if cached is not None:
+            return [CompanyListView.model_validate(row) for row in cached]
+
     # Build query filters
     expressions = [Company.user_id == user_id]
     
@@ -55,20 +108,30 @@ async def get_companies_by_user(
         expressions.append(Company.relevance_status != 'irrelevant')
     
     if only_embedded:
-        expressions.append(Company.embedded_at != None)
+        expressions.append(_EMBEDDED)
 
     if crawled_only:
         expressions.append(Company.crawl_status == 'completed')
 
-    return await Company.find(
-        *expressions
-    ).sort("-created_at").skip(skip).limit(limit).to_list()
+    query = Company.find(*expressions).sort("-created_at").skip(skip).limit(limit)
+    if projection_model is not None:
+        query = query.project(projection_model)
+    companies = await query.to_list()
+
+    if cacheable:
+        await cache_set(
+            _cache_namespace(user_id),
+            cache_key,
+            [company.model_dump(mode="json", by_alias=True) for company in companies]
+        )
+    return companies
 
 
 async def create_company(company_data: Dict[str, Any]) -> Company:
     """Create a new company"""
     company = Company(**company_data)
     await company.insert()
+    await invalidate_company_cache(company.user_id)
     return company
 
 
@@ -76,16 +139,16 @@ async def update_company(
     domain: str,
     update_data: Dict[str, Any]
 ) -> Optional[Company]:
-    """Update company by domain"""
-    company = await get_company_by_domain(domain)
-    if not company:
-        return None
-
+    """Update company by domain (one findOneAndUpdate round-trip, returns the updated document)"""
     # Update timestamp
     update_data['updated_at'] = datetime.utcnow()
 
-    # Use set() for updates
-    await company.set(update_data)
+    company = await Company.find_one(Company.domain == domain).update(
+        {"$set": update_data},
+        response_type=UpdateResponse.NEW_DOCUMENT
+    )
+    if company:
+        await invalidate_company_cache(company.user_id)
     return company
 
 
@@ -201,6 +264,7 @@ async def delete_company(domain: str) -> bool:
         return False
 
     await company.delete()
+    await invalidate_company_cache(company.user_id)
     return True
 
 
@@ -210,7 +274,12 @@ async def count_companies_by_user(
     only_embedded: bool = False,
     crawled_only: bool = False
 ) -> int:
-    """Count companies for a user (counts all by default, including those pending review)"""
+    """Count companies for a user (counts all by default, including those pending review; cached like listings)"""
+    cache_key = f"count:{exclude_irrelevant:d}{only_embedded:d}{crawled_only:d}"
+    cached = await cache_get(_cache_namespace(user_id), cache_key)
+    if cached is not None:
+        return cached
+
     # Build query filters
     expressions = [Company.user_id == user_id]
     
@@ -218,63 +287,79 @@ async def count_companies_by_user(
         expressions.append(Company.relevance_status != 'irrelevant')
         
     if only_embedded:
-        expressions.append(Company.embedded_at != None)
+        expressions.append(_EMBEDDED)
 
     if crawled_only:
         expressions.append(Company.crawl_status == 'completed')
 
-    return await Company.find(
+    total = await Company.find(
         *expressions
     ).count()
+    await cache_set(_cache_namespace(user_id), cache_key, total)
+    return total
 
 
 async def count_companies_with_contacts(user_id: str) -> int:
     """Count companies that have at least one contact"""
     return await Company.find(
         Company.user_id == user_id,
-        {"contacts": {"$ne": []}}  # contacts is not empty
+        _HAS_CONTACTS
     ).count()
 
 
 async def count_total_contacts(user_id: str) -> int:
-    """Count total number of contacts across all companies"""
-    # Fetch all companies for user
-    # Note: Ideally we use projection here, but for stability we'll fetch full docs for now
-    # or use a specific Pydantic model for projection if we defined one.
-    companies = await Company.find(
-        Company.user_id == user_id
-    ).to_list()
-    
-    total = 0
-    for comp in companies:
-        if comp.contacts:
-            total += len(comp.contacts)
-            
-    return total
+    """Count total number of contacts across all companies (summed server-side)"""
+    result = await Company.aggregate([
+        {"$match": {"user_id": user_id}},
+        {"$group": {"_id": None, "total": {"$sum": {"$size": {"$ifNull": ["$contacts", []]}}}}}
+    ]).to_list()
+    return result[0]["total"] if result else 0
+
+
+def _is_domain_query(search_query: str) -> bool:
+    """Whether a search looks like a (partial) domain rather than words"""
+    return "." in search_query and not any(c.isspace() for c in search_query)
 
 
 async def search_companies(
     user_id: str,
     search_query: str,
     skip: int = 0,
-    limit: int = 100
-) -> List[Company]:
-    """Search companies by name or domain"""
-    # Case-insensitive regex search
-    import re
-    regex = re.compile(search_query, re.IGNORECASE)
+    limit: int = 100,
+    crawled_only: bool = False,
+    projection_model: Optional[Type[BaseModel]] = CompanyListView
+) -> List[Union[Company, BaseModel]]:
+    """
+    Search companies by name or domain.
 
-    companies = await Company.find(
-        Company.user_id == user_id,
-        {
-            "$or": [
-                {"domain": regex},
-                {"company_name": regex}
-            ]
-        }
-    ).skip(skip).limit(limit).to_list()
+    Word queries use the user_company_text index and come back by relevance.
+    Domain-like queries ("acme.co") match as an anchored domain prefix, which
+    the domain index can serve.
+    """
+    query = search_query.strip()
+    if not query:
+        return []
 
-    return companies
+    match: Dict[str, Any] = {"user_id": user_id}
+    if crawled_only:
+        match["crawl_status"] = "completed"
+
+    if _is_domain_query(query):
+        import re
+        match["domain"] = {"$regex": f"^{re.escape(query.lower())}"}
+        find = Company.find(match).sort("domain").skip(skip).limit(limit)
+        if projection_model is not None:
+            find = find.project(projection_model)
+        return await find.to_list()
+
+    match["$text"] = {"$search": query}
+    pipeline = [
+        {"$match": match},
+        {"$sort": {"score": {"$meta": "textScore"}}},
+        {"$skip": skip},
+        {"$limit": limit},
+    ]
+    return await Company.aggregate(pipeline, projection_model=projection_model or Company).to_list()
 
 
 async def update_company_relevance(
@@ -4,51 +4,94 @@ Crawling Repository
 Data access layer for crawl state and crawled pages.
 """
 
-import asyncio
-from typing import List, Dict, Optional, Set
+import threading
+from concurrent.futures import Future
+from typing import Any, AsyncIterator, Iterable, Iterator, List, Dict, NamedTuple, Optional, Set
 from datetime import datetime
-from beanie.operators import In
-import concurrent.futures
-from functools import wraps
+from cachetools import TTLCache
+from pydantic import BaseModel
+from pymongo import ReturnDocument
 
-from app.db.mongodb_models import CrawlState, CrawledPage
-from app.db.mongodb_session import get_database
-
-
-def _run_async_in_thread(coro):
-    """
-    Run an async coroutine in a separate thread with its own event loop.
-    This allows calling async functions from within an existing event loop.
-    """
-    def run_in_thread():
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            return loop.run_until_complete(coro)
-        finally:
-            loop.close()
-
-    # Check if we're already in an event loop
-    try:
-        asyncio.get_running_loop()
-        # We're in an event loop, run in thread
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-            future = executor.submit(run_in_thread)
-            return future.result()
-    except RuntimeError:
-        # No running event loop, safe to use asyncio.run
-        return asyncio.run(coro)
+from app.db.mongodb_models import CrawlState, CrawledPage, VisitedUrl, CrawledContentHash
+from app.db.mongodb_session import get_database, get_sync_database, run_sync
+from .bulk import InsertBatcher, delete_many_batched, insert_many_unordered, insert_many_unordered_sync
 
 
 # ============================================================================
 # Crawl State Operations
 # ============================================================================
 
+# Per-domain crawl completion, checked repeatedly while scheduling crawls.
+# State writes through this module refresh the entry; the TTL bounds
+# staleness for updates made by other processes.
+CRAWLED_CACHE_TTL_SECONDS = 60
+_crawled_cache: TTLCache = TTLCache(maxsize=10_000, ttl=CRAWLED_CACHE_TTL_SECONDS)
+_crawled_cache_lock = threading.Lock()
+
+
+def _get_cached_crawled(domain: str) -> Optional[bool]:
+    with _crawled_cache_lock:
+        return _crawled_cache.get(domain)
+
+
+def _cache_crawled(domain: str, is_complete: bool) -> bool:
+    with _crawled_cache_lock:
+        _crawled_cache[domain] = is_complete
+    return is_complete
+
+
+class CrawlStatusView(BaseModel):
+    """Projection of the CrawlState fields reported by get_crawl_status_batch"""
+    domain: str
+    is_complete: bool = False
+    pages_crawled: Optional[int] = 0
+    urls_visited: Optional[int] = 0
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+
+
+def _crawl_status_pipeline(domains: List[str]) -> List[Dict]:
+    """
+    Aggregation returning only the CrawlStatusView fields for the given domains.
+
+    States written before urls_visited existed still carry a visited_urls
+    array; the server counts it with $size so the array itself never ships.
+    """
+    return [
+        {"$match": {"domain": {"$in": domains}}},
+        {"$project": {
+            "_id": 0,
+            "domain": 1,
+            "is_complete": 1,
+            "pages_crawled": 1,
+            "started_at": 1,
+            "completed_at": 1,
+            "urls_visited": {"$ifNull": ["$urls_visited", {"$size": {"$ifNull": ["$visited_urls", []]}}]},
+        }},
+    ]
+
+
 async def get_crawl_state(domain: str) -> Optional[CrawlState]:
     """Get crawl state for a domain"""
     return await CrawlState.find_one({"domain": domain})
 
 
+async def add_visited_urls(domain: str, urls: List[str]) -> int:
+    """Record URLs as visited for a domain; already-recorded URLs are ignored"""
+    now = datetime.utcnow()
+    return await insert_many_unordered(VisitedUrl, [
+        {"domain": domain, "url": url, "visited_at": now} for url in set(urls)
+    ])
+
+
+async def add_content_hashes(domain: str, content_hashes: List[str]) -> int:
+    """Record content hashes for a domain; already-recorded hashes are ignored"""
+    now = datetime.utcnow()
+    return await insert_many_unordered(CrawledContentHash, [
+        {"domain": domain, "content_hash": h, "seen_at": now} for h in set(content_hashes)
+    ])
+
+
 async def create_crawl_state(
     domain: str,
     visited_urls: List[str] = None,
@@ -56,14 +99,16 @@ async def create_crawl_state(
     is_complete: bool = False
 ) -> CrawlState:
     """Create a new crawl state record"""
+    urls_visited = await add_visited_urls(domain, visited_urls or [])
+    await add_content_hashes(domain, content_hashes or [])
     state = CrawlState(
         domain=domain,
-        visited_urls=visited_urls or [],
-        visited_hashes=content_hashes or [],
         is_complete=is_complete,
+        urls_visited=urls_visited,
         started_at=datetime.utcnow()
     )
     await state.insert()
+    _cache_crawled(domain, state.is_complete)
     return state
 
 
@@ -74,33 +119,40 @@ async def update_crawl_state(
     is_complete: bool = None,
     pages_crawled: int = None
 ) -> Optional[CrawlState]:
-    """Update crawl state for a domain"""
-    state = await get_crawl_state(domain)
+    """
+    Update crawl state for a domain.
 
-    if not state:
-        # Create new state if doesn't exist
-        return await create_crawl_state(
-            domain=domain,
-            visited_urls=visited_urls or [],
-            content_hashes=content_hashes or [],
-            is_complete=is_complete if is_complete is not None else False
-        )
-
-    # Update existing state
-    if visited_urls is not None:
-        state.visited_urls = visited_urls
-    if content_hashes is not None:
-        state.visited_hashes = content_hashes
+    visited_urls and content_hashes are added to what's already recorded,
+    so callers only need to pass what's new since the last update.
+    """
+    urls_added = await add_visited_urls(domain, visited_urls) if visited_urls else 0
+    if content_hashes:
+        await add_content_hashes(domain, content_hashes)
+
+    now = datetime.utcnow()
+    fields = {}
     if is_complete is not None:
-        state.is_complete = is_complete
+        fields["is_complete"] = is_complete
     if pages_crawled is not None:
-        state.pages_crawled = pages_crawled
-
+        fields["pages_crawled"] = pages_crawled
     if is_complete:
-        state.completed_at = datetime.utcnow()
-
-    await state.save()
-    return state
+        fields["completed_at"] = now
+    defaults = {"is_complete": False, "pages_crawled": 0, "started_at": now}
+
+    # One upsert: the counter is incremented in place, so concurrent
+    # checkpoints don't overwrite each other and no read is needed first
+    update = {
+        "$inc": {"urls_visited": urls_added},
+        "$setOnInsert": {k: v for k, v in defaults.items() if k not in fields},
+    }
+    if fields:
+        update["$set"] = fields
+
+    doc = await CrawlState.get_motor_collection().find_one_and_update(
+        {"domain": domain}, update, upsert=True, return_document=ReturnDocument.AFTER
+    )
+    _cache_crawled(domain, doc.get("is_complete", False))
+    return CrawlState.model_validate(doc)
 
 
 async def mark_crawl_complete(domain: str, pages_crawled: int, unique_pages: int) -> Optional[CrawlState]:
@@ -113,38 +165,93 @@ async def mark_crawl_complete(domain: str, pages_crawled: int, unique_pages: int
 
 
 async def get_visited_urls(domain: str) -> Set[str]:
-    """Get set of visited URLs for a domain"""
-    state = await get_crawl_state(domain)
-    if state and state.visited_urls:
-        return set(state.visited_urls)
-    return set()
+    """Get set of visited URLs for a domain (covered by the (domain, url) index)"""
+    cursor = VisitedUrl.get_motor_collection().find({"domain": domain}, {"_id": 0, "url": 1})
+    return {doc["url"] async for doc in cursor}
 
 
 async def get_content_hashes(domain: str) -> Set[str]:
-    """Get set of content hashes for a domain"""
-    state = await get_crawl_state(domain)
-    if state and state.visited_hashes:
-        return set(state.visited_hashes)
-    return set()
+    """Get set of content hashes for a domain (covered by the (domain, content_hash) index)"""
+    cursor = CrawledContentHash.get_motor_collection().find({"domain": domain}, {"_id": 0, "content_hash": 1})
+    return {doc["content_hash"] async for doc in cursor}
+
+
+class CrawlBootstrap(NamedTuple):
+    """Everything a crawler loads before resuming a domain"""
+    visited_urls: Set[str]
+    content_hashes: Set[str]
+    is_complete: bool
+
+
+# Rows per round-trip when streaming a domain's crawl bootstrap
+BOOTSTRAP_BATCH_SIZE = 5000
+
+
+def _crawl_bootstrap_pipeline(domain: str) -> List[Dict]:
+    """
+    One aggregation over visited_urls that also streams the domain's content
+    hashes and completion flag, via $unionWith, so resuming a crawl costs a
+    single command instead of three queries.
+    """
+    return [
+        {"$match": {"domain": domain}},
+        {"$project": {"_id": 0, "url": 1}},
+        {"$unionWith": {
+            "coll": CrawledContentHash.Settings.name,
+            "pipeline": [{"$match": {"domain": domain}}, {"$project": {"_id": 0, "content_hash": 1}}]
+        }},
+        {"$unionWith": {
+            "coll": CrawlState.Settings.name,
+            "pipeline": [{"$match": {"domain": domain}}, {"$project": {"_id": 0, "is_complete": 1}}]
+        }},
+    ]
+
+
+def _fold_crawl_bootstrap(domain: str, docs: Iterable[Dict[str, Any]]) -> CrawlBootstrap:
+    """Sort the bootstrap pipeline's mixed rows into a CrawlBootstrap"""
+    bootstrap = CrawlBootstrap(set(), set(), False)
+    for doc in docs:
+        if "url" in doc:
+            bootstrap.visited_urls.add(doc["url"])
+        elif "content_hash" in doc:
+            bootstrap.content_hashes.add(doc["content_hash"])
+        elif doc.get("is_complete"):
+            bootstrap = bootstrap._replace(is_complete=True)
+    _cache_crawled(domain, bootstrap.is_complete)
+    return bootstrap
+
+
+async def get_crawl_bootstrap(domain: str) -> CrawlBootstrap:
+    """Get a domain's visited URLs, content hashes and completion flag in one aggregation"""
+    cursor = VisitedUrl.get_motor_collection().aggregate(
+        _crawl_bootstrap_pipeline(domain), batchSize=BOOTSTRAP_BATCH_SIZE
+    )
+    return _fold_crawl_bootstrap(domain, await cursor.to_list(None))
 
 
 async def is_domain_crawled(domain: str) -> bool:
     """Check if domain has been fully crawled"""
+    cached = _get_cached_crawled(domain)
+    if cached is not None:
+        return cached
     state = await get_crawl_state(domain)
-    return state is not None and state.is_complete
+    return _cache_crawled(domain, state is not None and state.is_complete)
 
 
 async def get_crawl_status_batch(domains: List[str]) -> Dict[str, Dict]:
     """Get crawl status for multiple domains"""
-    # Use dict syntax for 'in' query: {"domain": {"$in": domains}}
-    states = await CrawlState.find({"domain": {"$in": domains}}).to_list()
+    cursor = CrawlState.get_motor_collection().aggregate(_crawl_status_pipeline(domains))
+    return _crawl_status_map([CrawlStatusView.model_validate(doc) async for doc in cursor], domains)
+
 
+def _crawl_status_map(states: List[CrawlStatusView], domains: List[str]) -> Dict[str, Dict]:
+    """Build the per-domain status dicts, including domains with no crawl state yet"""
     status_map = {}
     for state in states:
         status_map[state.domain] = {
             "fully_crawled": state.is_complete,
             "pages": state.pages_crawled or 0,
-            "visited_urls": len(state.visited_urls) if state.visited_urls else 0,
+            "visited_urls": state.urls_visited or 0,
             "in_progress": not state.is_complete and (state.pages_crawled or 0) > 0,
             "started_at": state.started_at.isoformat() if state.started_at else None,
             "completed_at": state.completed_at.isoformat() if state.completed_at else None
@@ -174,7 +281,7 @@ async def save_crawled_page(
     url: str,
     title: Optional[str],
     content: str,
-    content_hash: str,
+    content_digest: str,
     depth: int,
     links: List[str] = None
 ) -> CrawledPage:
@@ -184,7 +291,7 @@ async def save_crawled_page(
         url=url,
         title=title,
         content=content,
-        content_hash=content_hash,
+        content_digest=content_digest,
         depth=depth,
         links=links or [],
         crawled_at=datetime.utcnow()
@@ -193,14 +300,68 @@ async def save_crawled_page(
     return page
 
 
+async def save_crawled_pages(pages: List[Dict]) -> int:
+    """
+    Save a batch of crawled pages in one unordered insert.
+
+    Each dict has the save_crawled_page fields; returns the number inserted.
+    """
+    return await insert_many_unordered(CrawledPage, _crawled_page_docs(pages))
+
+
+def _crawled_page_docs(pages: List[Dict]) -> List[Dict]:
+    """Build crawled page documents for a batch insert"""
+    now = datetime.utcnow()
+    return [
+        {
+            "domain": page["domain"],
+            "url": page["url"],
+            "title": page.get("title"),
+            "content": page["content"],
+            "content_digest": page["content_digest"],
+            "depth": page["depth"],
+            "crawled_at": now,
+        }
+        for page in pages
+    ]
+
+
 async def get_crawled_pages(domain: str, limit: int = 1000) -> List[CrawledPage]:
-    """Get crawled pages for a domain"""
-    return await CrawledPage.find({"domain": domain}).limit(limit).to_list()
+    """Get crawled pages for a domain (prefer iter_crawled_pages when processing one at a time)"""
+    return [page async for page in iter_crawled_pages(domain, limit)]
+
+
+# Pages carry their full text, so stream them in small batches
+PAGE_STREAM_BATCH_SIZE = 50
+
+
+class CrawledPageView(BaseModel):
+    """Projection of the CrawledPage fields read by the extraction and RAG chunking code"""
+    url: str
+    title: Optional[str] = None
+    content: str = ""
+    depth: int = 0
+
+
+async def iter_crawled_pages(
+    domain: str,
+    limit: int = 1000,
+    batch_size: int = PAGE_STREAM_BATCH_SIZE
+) -> AsyncIterator[CrawledPage]:
+    """
+    Stream crawled pages for a domain, batch_size documents per round-trip.
+
+    Use this instead of get_crawled_pages when the pages are processed one
+    at a time, so only one batch is held in memory.
+    """
+    cursor = CrawledPage.get_motor_collection().find({"domain": domain}).limit(limit).batch_size(batch_size)
+    async for doc in cursor:
+        yield CrawledPage.model_validate(doc)
 
 
 async def get_crawled_page_count(domain: str) -> int:
     """Get count of crawled pages for a domain"""
-    return await CrawledPage.find({"domain": domain}).count()
+    return await CrawledPage.get_motor_collection().count_documents({"domain": domain})
 
 
 async def get_homepage(domain: str) -> Optional[CrawledPage]:
@@ -211,9 +372,8 @@ async def get_homepage(domain: str) -> Optional[CrawledPage]:
 
 
 async def delete_crawled_pages(domain: str) -> int:
-    """Delete all crawled pages for a domain"""
-    result = await CrawledPage.find({"domain": domain}).delete()
-    return result.deleted_count
+    """Delete all crawled pages for a domain, in batches"""
+    return await delete_many_batched(CrawledPage, {"domain": domain})
 
 
 async def delete_crawled_pages_by_domain(domain: str) -> int:
@@ -224,10 +384,12 @@ async def delete_crawled_pages_by_domain(domain: str) -> int:
 # ============================================================================
 # Sync Wrappers (for synchronous code)
 # ============================================================================
+# Hot read and batch-insert paths run on the native pymongo client; the rest
+# return Beanie documents and go through the shared event loop.
 
 def get_crawl_state_sync(domain: str) -> Optional[CrawlState]:
     """Sync wrapper for get_crawl_state"""
-    return _run_async_in_thread(get_crawl_state(domain))
+    return run_sync(get_crawl_state(domain))
 
 
 def update_crawl_state_sync(
@@ -238,32 +400,51 @@ def update_crawl_state_sync(
     pages_crawled: int = None
 ) -> Optional[CrawlState]:
     """Sync wrapper for update_crawl_state"""
-    return _run_async_in_thread(update_crawl_state(domain, visited_urls, content_hashes, is_complete, pages_crawled))
+    return run_sync(update_crawl_state(domain, visited_urls, content_hashes, is_complete, pages_crawled))
 
 
 def get_visited_urls_sync(domain: str) -> Set[str]:
-    """Sync wrapper for get_visited_urls"""
-    return _run_async_in_thread(get_visited_urls(domain))
+    """Get set of visited URLs for a domain (sync)"""
+    cursor = get_sync_database().visited_urls.find({"domain": domain}, {"_id": 0, "url": 1})
+    return {doc["url"] for doc in cursor}
 
 
 def get_content_hashes_sync(domain: str) -> Set[str]:
-    """Sync wrapper for get_content_hashes"""
-    return _run_async_in_thread(get_content_hashes(domain))
+    """Get set of content hashes for a domain (sync)"""
+    cursor = get_sync_database().crawl_content_hashes.find({"domain": domain}, {"_id": 0, "content_hash": 1})
+    return {doc["content_hash"] for doc in cursor}
+
+
+def get_crawl_bootstrap_sync(domain: str) -> CrawlBootstrap:
+    """Get a domain's visited URLs, content hashes and completion flag in one aggregation (sync)"""
+    cursor = get_sync_database().visited_urls.aggregate(
+        _crawl_bootstrap_pipeline(domain), batchSize=BOOTSTRAP_BATCH_SIZE
+    )
+    return _fold_crawl_bootstrap(domain, cursor)
 
 
 def is_domain_crawled_sync(domain: str) -> bool:
-    """Sync wrapper for is_domain_crawled"""
-    return _run_async_in_thread(is_domain_crawled(domain))
+    """Check if domain has been fully crawled (sync)"""
+    cached = _get_cached_crawled(domain)
+    if cached is not None:
+        return cached
+    state = get_sync_database().crawl_states.find_one({"domain": domain}, {"_id": 0, "is_complete": 1})
+    return _cache_crawled(domain, state is not None and state.get("is_complete", False))
 
 
 def get_crawl_status_batch_sync(domains: List[str]) -> Dict[str, Dict]:
-    """Sync wrapper for get_crawl_status_batch"""
-    return _run_async_in_thread(get_crawl_status_batch(domains))
+    """Get crawl status for multiple domains (sync)"""
+    cursor = get_sync_database().crawl_states.aggregate(_crawl_status_pipeline(domains))
+    return _crawl_status_map([CrawlStatusView.model_validate(doc) for doc in cursor], domains)
 
 
 def mark_crawl_complete_sync(domain: str, pages_crawled: int, unique_pages: int) -> Optional[CrawlState]:
     """Sync wrapper for mark_crawl_complete"""
-    return _run_async_in_thread(mark_crawl_complete(domain, pages_crawled, unique_pages))
+    return run_sync(mark_crawl_complete(domain, pages_crawled, unique_pages))
+
+
+# Single-page saves from concurrent crawler threads share insert_many calls
+_page_batcher = InsertBatcher(lambda: get_sync_database().crawled_pages)
 
 
 def save_crawled_page_sync(
@@ -271,19 +452,62 @@ def save_crawled_page_sync(
     url: str,
     title: Optional[str],
     content: str,
-    content_hash: str,
+    content_digest: str,
     depth: int,
     links: List[str] = None
-) -> CrawledPage:
-    """Sync wrapper for save_crawled_page"""
-    return _run_async_in_thread(save_crawled_page(domain, url, title, content, content_hash, depth, links))
+) -> Future:
+    """
+    Queue a crawled page for the next batched insert (sync).
+
+    Returns a Future resolving to the page ID once written. Call
+    flush_crawled_pages_sync() to wait for everything queued so far.
+    """
+    return _page_batcher.submit(_crawled_page_docs([{
+        "domain": domain,
+        "url": url,
+        "title": title,
+        "content": content,
+        "content_digest": content_digest,
+        "depth": depth,
+    }])[0])
+
+
+def flush_crawled_pages_sync(timeout: Optional[float] = None) -> None:
+    """Wait until every page queued by save_crawled_page_sync is written"""
+    _page_batcher.flush(timeout)
+
+
+def save_crawled_pages_sync(pages: List[Dict]) -> int:
+    """Save a batch of crawled pages in one unordered insert (sync)"""
+    return insert_many_unordered_sync(get_sync_database().crawled_pages, _crawled_page_docs(pages))
 
 
 def get_crawled_pages_sync(domain: str, limit: int = 1000) -> List[CrawledPage]:
     """Sync wrapper for get_crawled_pages"""
-    return _run_async_in_thread(get_crawled_pages(domain, limit))
+    return run_sync(get_crawled_pages(domain, limit))
+
+
+def iter_crawled_pages_sync(
+    domain: str,
+    limit: int = 1000,
+    batch_size: int = PAGE_STREAM_BATCH_SIZE
+) -> Iterator[CrawledPageView]:
+    """
+    Stream crawled pages for a domain as CrawledPageView, batch_size per round-trip (sync).
+
+    Stopping early closes the cursor, so pages past that point are never fetched.
+    """
+    cursor = get_sync_database().crawled_pages.find(
+        {"domain": domain},
+        {"_id": 0, **{name: 1 for name in CrawledPageView.model_fields}}
+    ).limit(limit).batch_size(batch_size)
+    try:
+        for doc in cursor:
+            yield CrawledPageView.model_validate(doc)
+    finally:
+        cursor.close()
 
 
 def get_crawled_page_count_sync(domain: str) -> int:
-    """Sync wrapper for get_crawled_page_count"""
-    return _run_async_in_thread(get_crawled_page_count(domain))
+    """Get count of crawled pages for a domain (sync)"""
+    return get_sync_database().crawled_pages.count_documents({"domain": domain})
@@ -5,43 +5,90 @@ CRUD operations for discovery-related documents (DiscoveredDomain, QueryCache, V
 """
 
 from typing import List, Optional, Dict, Any, Set
+from concurrent.futures import Future
 from datetime import datetime
+from threading import Lock
+
+from cachetools import TTLCache
 
 from ..mongodb_models import DiscoveredDomain, QueryCache, VettingResult
+from ..mongodb_session import get_sync_database
+from .bulk import InsertBatcher, insert_many_unordered, insert_many_unordered_sync
+
+# Short-lived per-process caches for lookups repeated during a discovery run.
+# Saves through this module refresh their entries; the TTL bounds staleness
+# for writes made by other processes.
+LOOKUP_CACHE_TTL_SECONDS = 60
+_query_done_cache: TTLCache = TTLCache(maxsize=10_000, ttl=LOOKUP_CACHE_TTL_SECONDS)
+_vetting_cache: TTLCache = TTLCache(maxsize=10_000, ttl=LOOKUP_CACHE_TTL_SECONDS)
+_lookup_cache_lock = Lock()
+
+# Cached "no vetting result yet", distinct from a cache miss
+_NOT_VETTED = object()
+
+VETTING_FLAGS = ('has_product_schema', 'has_cart', 'has_platform_fp')
+
+
+def _cache_get(cache: TTLCache, key: str, default: Any = None) -> Any:
+    with _lookup_cache_lock:
+        return cache.get(key, default)
+
+
+def _cache_put(cache: TTLCache, key: str, value: Any) -> None:
+    with _lookup_cache_lock:
+        cache[key] = value
 
 
 # ============================================
 # Discovered Domains
 # ============================================
 
-async def add_discovered_domain(
+def _discovered_domain_data(
     domain: str,
     engine: str,
     query: str,
     user_id: Optional[str] = None,
     vetting_result: Optional[Dict[str, bool]] = None
-) -> DiscoveredDomain:
-    """Add a discovered domain"""
-    data = {
+) -> Dict[str, Any]:
+    """Build the field values for a discovered domain"""
+    vetting_result = vetting_result or {}
+    return {
         'domain': domain,
         'engine': engine,
         'query': query,
         'user_id': user_id,
+        'has_cart': vetting_result.get('has_cart', False),
+        'has_product_schema': vetting_result.get('has_product_schema', False),
+        'has_platform_fp': vetting_result.get('has_platform_fp', False),
         'discovered_at': datetime.utcnow()
     }
 
-    if vetting_result:
-        data.update({
-            'has_cart': vetting_result.get('has_cart', False),
-            'has_product_schema': vetting_result.get('has_product_schema', False),
-            'has_platform_fp': vetting_result.get('has_platform_fp', False)
-        })
 
-    discovered = DiscoveredDomain(**data)
+async def add_discovered_domain(
+    domain: str,
+    engine: str,
+    query: str,
+    user_id: Optional[str] = None,
+    vetting_result: Optional[Dict[str, bool]] = None
+) -> DiscoveredDomain:
+    """Add a discovered domain"""
+    discovered = DiscoveredDomain(**_discovered_domain_data(domain, engine, query, user_id, vetting_result))
     await discovered.insert()
     return discovered
 
 
+async def add_discovered_domains(rows: List[Dict[str, Any]]) -> int:
+    """
+    Add a batch of discovered domains in one unordered insert.
+
+    Each row has the add_discovered_domain arguments; returns the number inserted.
+    """
+    return await insert_many_unordered(DiscoveredDomain, [
+        DiscoveredDomain(**_discovered_domain_data(**row)).model_dump(exclude={'id', 'revision_id'})
+        for row in rows
+    ])
+
+
 async def get_discovered_domains(
     skip: int = 0,
     limit: int = 100
@@ -50,10 +97,26 @@ async def get_discovered_domains(
     return await DiscoveredDomain.find().skip(skip).limit(limit).to_list()
 
 
+# Documents per round-trip when streaming one-field projections into sets
+SET_STREAM_BATCH_SIZE = 5000
+
+# Unique domain names, deduplicated server-side. Unlike distinct() the result is
+# a cursor, so it isn't capped at 16MB; the $sort lets it walk the domain index.
+DISTINCT_DOMAINS_PIPELINE = [
+    {'$sort': {'domain': 1}},
+    {'$group': {'_id': '$domain'}},
+]
+
+# The unique (engine, query) index covers the completed-queries projection
+QUERY_CACHE_KEY_INDEX = [('engine', 1), ('query', 1)]
+
+
 async def get_discovered_domains_set() -> Set[str]:
-    """Get set of all discovered domain names (for deduplication)"""
-    domains = await DiscoveredDomain.find_all().to_list()
-    return {d.domain for d in domains if d.domain}
+    """Get set of all discovered domain names (for deduplication), grouped server-side"""
+    cursor = DiscoveredDomain.get_motor_collection().aggregate(
+        DISTINCT_DOMAINS_PIPELINE, batchSize=SET_STREAM_BATCH_SIZE
+    )
+    return {doc['_id'] async for doc in cursor if doc['_id']}
 
 
 # ============================================
@@ -64,43 +127,35 @@ async def save_query_cache(
     engine: str,
     query: str,
     domains: List[str]
-) -> QueryCache:
-    """Save completed query to cache"""
-    # Try to update existing, or create new
-    existing = await QueryCache.find_one(
-        QueryCache.engine == engine,
-        QueryCache.query == query
+) -> None:
+    """Save completed query to cache in a single upsert on the unique (engine, query) index"""
+    await QueryCache.get_motor_collection().update_one(
+        {'engine': engine, 'query': query},
+        {'$set': {'domains': domains, 'completed_at': datetime.utcnow()}},
+        upsert=True
     )
-
-    if existing:
-        existing.domains = domains
-        existing.completed_at = datetime.utcnow()
-        await existing.save()
-        return existing
-    else:
-        cache = QueryCache(
-            engine=engine,
-            query=query,
-            domains=domains,
-            completed_at=datetime.utcnow()
-        )
-        await cache.insert()
-        return cache
+    _cache_put(_query_done_cache, f"{engine}::{query}", True)
 
 
 async def get_completed_queries() -> Set[str]:
-    """Get set of completed query keys (engine::query format)"""
-    queries = await QueryCache.find().to_list()
-    return {f"{q.engine}::{q.query}" for q in queries}
+    """Get set of completed query keys (engine::query format), read from the (engine, query) index alone"""
+    cursor = QueryCache.get_motor_collection().find(
+        {}, {'_id': 0, 'engine': 1, 'query': 1}
+    ).hint(QUERY_CACHE_KEY_INDEX).batch_size(SET_STREAM_BATCH_SIZE)
+    return {f"{q['engine']}::{q['query']}" async for q in cursor}
 
 
 async def is_query_completed(engine: str, query: str) -> bool:
     """Check if a query has been completed"""
-    cache = await QueryCache.find_one(
-        QueryCache.engine == engine,
-        QueryCache.query == query
-    )
-    return cache is not None
+    key = f"{engine}::{query}"
+    done = _cache_get(_query_done_cache, key)
+    if done is None:
+        done = await QueryCache.find_one(
+            QueryCache.engine == engine,
+            QueryCache.query == query
+        ) is not None
+        _cache_put(_query_done_cache, key, done)
+    return done
 
 
 # ============================================
@@ -113,60 +168,71 @@ async def save_vetting_result(
     has_cart: bool = False,
     has_platform_fp: bool = False,
     decision: str = "UNKNOWN"
-) -> VettingResult:
-    """Save or update vetting result for a domain"""
-    # Try to update existing
-    existing = await VettingResult.find_one(VettingResult.domain == domain)
-
-    if existing:
-        existing.has_product_schema = has_product_schema
-        existing.has_cart = has_cart
-        existing.has_platform_fp = has_platform_fp
-        existing.decision = decision
-        existing.vetted_at = datetime.utcnow()
-        await existing.save()
-        return existing
-    else:
-        result = VettingResult(
-            domain=domain,
-            has_product_schema=has_product_schema,
-            has_cart=has_cart,
-            has_platform_fp=has_platform_fp,
-            decision=decision,
-            vetted_at=datetime.utcnow()
-        )
-        await result.insert()
-        return result
+) -> None:
+    """Save or update vetting result for a domain in a single upsert on the unique domain index"""
+    await VettingResult.get_motor_collection().update_one(
+        {'domain': domain},
+        {'$set': {
+            'has_product_schema': has_product_schema,
+            'has_cart': has_cart,
+            'has_platform_fp': has_platform_fp,
+            'decision': decision,
+            'vetted_at': datetime.utcnow()
+        }},
+        upsert=True
+    )
+    _cache_put(_vetting_cache, domain, {
+        'has_product_schema': has_product_schema,
+        'has_cart': has_cart,
+        'has_platform_fp': has_platform_fp
+    })
+
+
+def _vetting_flags(doc: Optional[Dict[str, Any]]) -> Optional[Dict[str, bool]]:
+    """Vetting flags from a projected VettingResult document, or None if there is none"""
+    if doc is None:
+        return None
+    return {flag: doc.get(flag, False) for flag in VETTING_FLAGS}
+
+
+def _cached_vetting_result(domain: str) -> Any:
+    """Cached vetting flags for a domain (copied), None if cached as not vetted, or _NOT_VETTED on a miss"""
+    cached = _cache_get(_vetting_cache, domain, _NOT_VETTED)
+    if cached is _NOT_VETTED:
+        return _NOT_VETTED
+    return dict(cached) if cached is not None else None
 
 
 async def get_vetting_result(domain: str) -> Optional[Dict[str, bool]]:
     """Get vetting result for a domain"""
-    result = await VettingResult.find_one(VettingResult.domain == domain)
-    if result:
-        return {
-            'has_product_schema': result.has_product_schema,
-            'has_cart': result.has_cart,
-            'has_platform_fp': result.has_platform_fp
-        }
-    return None
+    cached = _cached_vetting_result(domain)
+    if cached is not _NOT_VETTED:
+        return cached
+    doc = await VettingResult.get_motor_collection().find_one(
+        {'domain': domain}, {'_id': 0, **{flag: 1 for flag in VETTING_FLAGS}}
+    )
+    result = _vetting_flags(doc)
+    _cache_put(_vetting_cache, domain, result)
+    return dict(result) if result is not None else None
 
 
 async def update_vetting_decision(domain: str, decision: str) -> bool:
     """Update vetting decision for a domain"""
-    result = await VettingResult.find_one(VettingResult.domain == domain)
-    if result:
-        result.decision = decision
-        result.vetted_at = datetime.utcnow()
-        await result.save()
-        return True
-    return False
+    result = await VettingResult.get_motor_collection().update_one(
+        {'domain': domain},
+        {'$set': {'decision': decision, 'vetted_at': datetime.utcnow()}}
+    )
+    return result.matched_count > 0
 
 
 # ============================================
-# Synchronous Wrappers (for sync code like discovery service)
+# Synchronous Versions (for sync code like discovery service)
 # ============================================
+# These run on the native pymongo client rather than hopping through Motor's
+# executor and the shared event loop, so they return plain values, not documents.
 
-import asyncio
+# Single-domain adds from concurrent discovery workers share insert_many calls
+_domain_batcher = InsertBatcher(lambda: get_sync_database().discovered_domains)
 
 
 def add_discovered_domain_sync(
@@ -175,24 +241,53 @@ def add_discovered_domain_sync(
     query: str,
     user_id: Optional[str] = None,
     vetting_result: Optional[Dict[str, bool]] = None
-) -> DiscoveredDomain:
-    """Sync wrapper for add_discovered_domain"""
-    return asyncio.run(add_discovered_domain(domain, engine, query, user_id, vetting_result))
+) -> Future:
+    """
+    Queue a discovered domain for the next batched insert (sync).
+
+    Returns a Future resolving to the new document ID once written. Call
+    flush_discovered_domains_sync() to wait for everything queued so far.
+    """
+    return _domain_batcher.submit(_discovered_domain_data(domain, engine, query, user_id, vetting_result))
+
+
+def flush_discovered_domains_sync(timeout: Optional[float] = None) -> None:
+    """Wait until every domain queued by add_discovered_domain_sync is written"""
+    _domain_batcher.flush(timeout)
+
+
+def add_discovered_domains_sync(rows: List[Dict[str, Any]]) -> int:
+    """Add a batch of discovered domains in one unordered insert (sync)"""
+    return insert_many_unordered_sync(
+        get_sync_database().discovered_domains,
+        [_discovered_domain_data(**row) for row in rows]
+    )
 
 
 def get_discovered_domains_set_sync() -> Set[str]:
-    """Sync wrapper for get_discovered_domains_set"""
-    return asyncio.run(get_discovered_domains_set())
+    """Get set of all discovered domain names (sync)"""
+    cursor = get_sync_database().discovered_domains.aggregate(
+        DISTINCT_DOMAINS_PIPELINE, batchSize=SET_STREAM_BATCH_SIZE
+    )
+    return {doc['_id'] for doc in cursor if doc['_id']}
 
 
-def save_query_cache_sync(engine: str, query: str, domains: List[str]) -> QueryCache:
-    """Sync wrapper for save_query_cache"""
-    return asyncio.run(save_query_cache(engine, query, domains))
+def save_query_cache_sync(engine: str, query: str, domains: List[str]) -> None:
+    """Save completed query to cache in a single upsert (sync)"""
+    get_sync_database().query_cache.update_one(
+        {'engine': engine, 'query': query},
+        {'$set': {'domains': domains, 'completed_at': datetime.utcnow()}},
+        upsert=True
+    )
+    _cache_put(_query_done_cache, f"{engine}::{query}", True)
 
 
 def get_completed_queries_sync() -> Set[str]:
-    """Sync wrapper for get_completed_queries"""
-    return asyncio.run(get_completed_queries())
+    """Get set of completed query keys (engine::query format) (sync)"""
+    cursor = get_sync_database().query_cache.find(
+        {}, {'_id': 0, 'engine': 1, 'query': 1}
+    ).hint(QUERY_CACHE_KEY_INDEX).batch_size(SET_STREAM_BATCH_SIZE)
+    return {f"{q['engine']}::{q['query']}" for q in cursor}
 
 
 def save_vetting_result_sync(
@@ -201,11 +296,34 @@ def save_vetting_result_sync(
     has_cart: bool = False,
     has_platform_fp: bool = False,
     decision: str = "UNKNOWN"
-) -> VettingResult:
-    """Sync wrapper for save_vetting_result"""
-    return asyncio.run(save_vetting_result(domain, has_product_schema, has_cart, has_platform_fp, decision))
+) -> None:
+    """Save or update vetting result for a domain in a single upsert (sync)"""
+    get_sync_database().vetting_results.update_one(
+        {'domain': domain},
+        {'$set': {
+            'has_product_schema': has_product_schema,
+            'has_cart': has_cart,
+            'has_platform_fp': has_platform_fp,
+            'decision': decision,
+            'vetted_at': datetime.utcnow()
+        }},
+        upsert=True
+    )
+    _cache_put(_vetting_cache, domain, {
+        'has_product_schema': has_product_schema,
+        'has_cart': has_cart,
+        'has_platform_fp': has_platform_fp
+    })
 
 
 def get_vetting_result_sync(domain: str) -> Optional[Dict[str, bool]]:
-    """Sync wrapper for get_vetting_result"""
-    return asyncio.run(get_vetting_result(domain))
+    """Get vetting result for a domain (sync)"""
+    cached = _cached_vetting_result(domain)
+    if cached is not _NOT_VETTED:
+        return cached
+    doc = get_sync_database().vetting_results.find_one(
+        {'domain': domain}, {'_id': 0, **{flag: 1 for flag in VETTING_FLAGS}}
+    )
+    result = _vetting_flags(doc)
+    _cache_put(_vetting_cache, domain, result)
+    return dict(result) if result is not None else None
@@ -9,6 +9,7 @@ from datetime import datetime
 from beanie import PydanticObjectId
 
 from ..mongodb_models import Product
+from .bulk import delete_many_batched, insert_many_unordered
 
 
 async def get_product_by_id(product_id: str) -> Optional[Product]:
@@ -48,44 +49,71 @@ async def create_product(product_data: Dict[str, Any]) -> Product:
     return product
 
 
-async def create_products_bulk(products_data: List[Dict[str, Any]]) -> List[Product]:
-    """Create multiple products at once"""
-    products = [Product(**data) for data in products_data]
-    await Product.insert_many(products)
-    return products
+async def create_products_bulk(products_data: List[Dict[str, Any]], validate: bool = True) -> int:
+    """
+    Create multiple products in one unordered insert; returns the number inserted.
+
+    Products are checked against the Product model unless validate is False,
+    and written as plain dicts rather than through Beanie's document encoder.
+    """
+    if validate:
+        documents = [
+            Product(**data).model_dump(exclude={'id', 'revision_id'})
+            for data in products_data
+        ]
+    else:
+        now = datetime.utcnow()
+        documents = [{'created_at': now, **data} for data in products_data]
+    return await insert_many_unordered(Product, documents)
 
 
 async def delete_products_by_domain(domain: str) -> int:
-    """Delete all products for a domain"""
-    result = await Product.find(Product.domain == domain).delete()
-    return result.deleted_count
+    """Delete all products for a domain, in batches"""
+    return await delete_many_batched(Product, {"domain": domain})
 
 
 async def count_products_by_domain(domain: str) -> int:
     """Count products for a domain"""
-    return await Product.find(Product.domain == domain).count()
+    return await Product.get_motor_collection().count_documents({"domain": domain})
 
 
 async def search_products(
     domain: str,
     search_query: str,
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    fuzzy: bool = False
 ) -> List[Product]:
-    """Search products by name, brand, or category"""
-    import re
-    regex = re.compile(search_query, re.IGNORECASE)
-
-    products = await Product.find(
-        Product.domain == domain,
-        {
-            "$or": [
-                {"name": regex},
-                {"brand": regex},
-                {"category": regex},
-                {"description": regex}
-            ]
-        }
-    ).skip(skip).limit(limit).to_list()
-
-    return products
+    """
+    Search products by name, brand, category, or description.
+
+    Uses the domain_product_text index and returns matches by relevance.
+    With fuzzy=True, matches the query as a case-insensitive substring
+    instead (catches partial words, but scans the domain's products).
+    """
+    query = search_query.strip()
+    if not query:
+        return []
+
+    if fuzzy:
+        import re
+        pattern = {"$regex": re.escape(query), "$options": "i"}
+        return await Product.find(
+            Product.domain == domain,
+            {
+                "$or": [
+                    {"name": pattern},
+                    {"brand": pattern},
+                    {"category": pattern},
+                    {"description": pattern}
+                ]
+            }
+        ).skip(skip).limit(limit).to_list()
+
+    pipeline = [
+        {"$match": {"domain": domain, "$text": {"$search": query}}},
+        {"$sort": {"score": {"$meta": "textScore"}}},
+        {"$skip": skip},
+        {"$limit": limit},
+    ]
+    return await Product.aggregate(pipeline, projection_model=Product).to_list()
@@ -4,26 +4,126 @@ RAG Repository
 Operations for RAG embeddings and vector search.
 """
 
-from typing import List, Optional, Dict, Any
+from typing import List, NamedTuple, Optional, Dict, Any, Tuple, Union
 from datetime import datetime
+from threading import Lock
 import numpy as np
-from beanie import PydanticObjectId
+from cachetools import TTLCache
+from beanie.operators import In
+from pydantic import BaseModel
+from pymongo.errors import BulkWriteError, OperationFailure
 
-from ..mongodb_models import RAGEmbedding
+from ...core.config import get_settings
+from ..mongodb_models import RAGEmbedding, RAGEmbeddingVector, RAG_EMBEDDING_DIMENSIONS
+from .bulk import (
+    delete_many_batched,
+    delete_many_batched_sync,
+    inserted_ids_after,
+    insert_many_unordered,
+    raise_unless_duplicates
+)
+
+settings = get_settings()
+
+class _VectorIndex(NamedTuple):
+    """Searchable vectors for one scope: unit-length float32 rows or, for large scopes, 1-bit codes"""
+    chunk_ids: List[str]
+    matrix: Optional[np.ndarray]
+    bits: Optional[np.ndarray]
+
+
+# Per-domain cache of vector indexes so repeat searches skip the Mongo scan
+# and the decode. Writes through this module invalidate the domain; the TTL
+# bounds staleness for writes from other processes (e.g. the Celery embed task).
+VECTOR_CACHE_TTL_SECONDS = 300
+_vector_cache: TTLCache = TTLCache(maxsize=32, ttl=VECTOR_CACHE_TTL_SECONDS)
+_vector_cache_lock = Lock()
+
+VectorCacheKey = Tuple[str, Optional[Tuple[str, ...]]]
+
+
+def _vector_cache_key(domain: str, collection_names: Optional[List[str]]) -> VectorCacheKey:
+    return domain, tuple(sorted(collection_names)) if collection_names else None
+
+
+def _get_cached_index(key: VectorCacheKey) -> Optional[_VectorIndex]:
+    with _vector_cache_lock:
+        return _vector_cache.get(key)
+
+
+def _cache_index(key: VectorCacheKey, index: _VectorIndex) -> None:
+    with _vector_cache_lock:
+        _vector_cache[key] = index
+
+
+def invalidate_domain_vectors(*domains: str) -> None:
+    """Drop cached search matrices for the given domains"""
+    with _vector_cache_lock:
+        for key in [key for key in _vector_cache if key[0] in domains]:
+            _vector_cache.pop(key, None)
+
+
+def _split_embedding(embedding_data: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Split embedding data into its chunk metadata and its vector document.
+
+    The vector is normalized to unit length once here, so search never
+    recomputes stored norms, and packed as a BSON float32 vector plus its
+    1-bit code.
+    """
+    metadata = {k: v for k, v in embedding_data.items() if k not in ("embedding", "embedding_bq")}
+    metadata.setdefault("embedded_at", datetime.utcnow())
+    vector = embedding_data["embedding"]
+    if isinstance(vector, (bytes, bytearray)):
+        packed, bits = vector, embedding_data.get("embedding_bq")
+        normalized = embedding_data.get("normalized", False)
+    else:
+        unit = RAGEmbeddingVector.normalize_vector(vector)
+        packed, bits = RAGEmbeddingVector.pack_vector(unit), RAGEmbeddingVector.quantize_vector(unit)
+        normalized = True
+    return metadata, {
+        "chunk_id": embedding_data["chunk_id"],
+        "domain": embedding_data["domain"],
+        "collection_name": embedding_data["collection_name"],
+        "embedding": packed,
+        "embedding_bq": bits,
+        "normalized": normalized
+    }
 
 
 async def create_embedding(embedding_data: Dict[str, Any]) -> RAGEmbedding:
-    """Create a new RAG embedding"""
-    embedding = RAGEmbedding(**embedding_data)
+    """Create a new RAG embedding (metadata and vector)"""
+    metadata, vector = _split_embedding(embedding_data)
+    # Vector first: a chunk whose metadata exists counts as embedded
+    await RAGEmbeddingVector(**vector).insert()
+    embedding = RAGEmbedding(**metadata)
     await embedding.insert()
+    invalidate_domain_vectors(embedding.domain)
     return embedding
 
 
-async def create_embeddings_bulk(embeddings_data: List[Dict[str, Any]]) -> List[RAGEmbedding]:
-    """Create multiple RAG embeddings in bulk"""
-    embeddings = [RAGEmbedding(**data) for data in embeddings_data]
-    await RAGEmbedding.insert_many(embeddings)
-    return embeddings
+async def create_embeddings_bulk(embeddings_data: List[Dict[str, Any]]) -> List[str]:
+    """
+    Create multiple RAG embeddings in bulk, returning the inserted metadata IDs.
+
+    The inserts are unordered, so chunks already embedded (duplicate chunk_id)
+    are skipped without aborting the rest of the batch. Documents go to the
+    raw collections as plain dicts, without building Beanie models.
+    """
+    if not embeddings_data:
+        return []
+    split = [_split_embedding(data) for data in embeddings_data]
+    await insert_many_unordered(RAGEmbeddingVector, [vector for _, vector in split])
+
+    documents = [metadata for metadata, _ in split]
+    try:
+        result = await RAGEmbedding.get_motor_collection().insert_many(documents, ordered=False)
+        inserted_ids = result.inserted_ids
+    except BulkWriteError as e:
+        raise_unless_duplicates(e)
+        inserted_ids = inserted_ids_after(e, documents)
+    invalidate_domain_vectors(*{data["domain"] for data in embeddings_data})
+    return [str(id) for id in inserted_ids]
 
 
 async def get_embedding_by_chunk_id(chunk_id: str) -> Optional[RAGEmbedding]:
@@ -46,29 +146,240 @@ async def get_embeddings_by_domain(
 
 
 async def delete_embeddings_by_domain(domain: str) -> int:
-    """Delete all embeddings for a domain"""
-    result = await RAGEmbedding.find(RAGEmbedding.domain == domain).delete()
-    return result.deleted_count
+    """Delete all embeddings (metadata and vectors) for a domain"""
+    deleted = await delete_many_batched(RAGEmbedding, {"domain": domain})
+    await delete_many_batched(RAGEmbeddingVector, {"domain": domain})
+    invalidate_domain_vectors(domain)
+    return deleted
 
 
 async def count_embeddings_by_domain(domain: str) -> int:
     """Count embeddings for a domain"""
-    return await RAGEmbedding.find(RAGEmbedding.domain == domain).count()
+    return await RAGEmbedding.get_motor_collection().count_documents({"domain": domain})
+
+
+def cosine_similarity(vec1: Union[List[float], bytes], vec2: Union[List[float], bytes]) -> float:
+    """Calculate cosine similarity between two vectors (lists or packed float32)"""
+    a = RAGEmbeddingVector.normalize_vector(RAGEmbeddingVector.unpack_vector(vec1))
+    b = RAGEmbeddingVector.normalize_vector(RAGEmbeddingVector.unpack_vector(vec2))
+    return float(np.dot(a, b))
+
+
+# Upper bound on embeddings scored per search
+MAX_SCAN_EMBEDDINGS = 10000
+
+# Scopes with at least this many embeddings are searched on 1-bit codes first
+BQ_MIN_ROWS = 2048
+# Hamming-stage survivors per requested result, rescored with full vectors
+BQ_RESCORE_FACTOR = 10
+
+# Atlas rejects $vectorSearch with more candidates than this
+ATLAS_MAX_NUM_CANDIDATES = 10000
+
+# MongoDB error code for an index that already exists
+_INDEX_ALREADY_EXISTS = 68
+
+
+def vector_search_index_model() -> Dict[str, Any]:
+    """Atlas vectorSearch index over rag_embedding_vectors.embedding with filterable scope fields"""
+    return {
+        "name": settings.RAG_VECTOR_INDEX_NAME,
+        "type": "vectorSearch",
+        "definition": {
+            "fields": [
+                {
+                    "type": "vector",
+                    "path": "embedding",
+                    "numDimensions": RAG_EMBEDDING_DIMENSIONS,
+                    "similarity": "cosine"
+                },
+                {"type": "filter", "path": "domain"},
+                {"type": "filter", "path": "collection_name"},
+            ]
+        }
+    }
+
+
+async def ensure_vector_search_index(database) -> None:
+    """Create the Atlas vectorSearch index if vector search is enabled and it's missing"""
+    if not settings.ATLAS_VECTOR_SEARCH_ENABLED:
+        return
+    try:
+        await database.command({
+            "createSearchIndexes": RAGEmbeddingVector.Settings.name,
+            "indexes": [vector_search_index_model()]
+        })
+    except OperationFailure as e:
+        if e.code != _INDEX_ALREADY_EXISTS:
+            print(f"Could not create vector search index: {e}")
+
+
+def _vector_search_pipeline(
+    query_embedding: List[float],
+    domain: Optional[str],
+    collection_names: Optional[List[str]],
+    limit: int
+) -> List[Dict[str, Any]]:
+    """$vectorSearch over the vectors, joined to the chunk metadata of each hit"""
+    stage: Dict[str, Any] = {
+        "index": settings.RAG_VECTOR_INDEX_NAME,
+        "path": "embedding",
+        "queryVector": [float(x) for x in query_embedding],
+        "numCandidates": min(max(settings.RAG_VECTOR_NUM_CANDIDATES, limit * 20), ATLAS_MAX_NUM_CANDIDATES),
+        "limit": limit,
+    }
+    scope: Dict[str, Any] = {}
+    if domain:
+        scope["domain"] = domain
+    if collection_names:
+        scope["collection_name"] = {"$in": collection_names}
+    if scope:
+        stage["filter"] = scope
+
+    return [
+        {"$vectorSearch": stage},
+        {"$project": {"_id": 0, "chunk_id": 1, "score": {"$meta": "vectorSearchScore"}}},
+        {"$lookup": {
+            "from": RAGEmbedding.Settings.name,
+            "localField": "chunk_id",
+            "foreignField": "chunk_id",
+            "as": "chunk"
+        }},
+        {"$unwind": "$chunk"},
+        {"$replaceRoot": {"newRoot": {"$mergeObjects": ["$chunk", {"score": "$score"}]}}},
+    ]
+
+
+def _vector_search_results(docs: List[Dict[str, Any]], min_similarity: float) -> List[Dict[str, Any]]:
+    """Format $vectorSearch output; Atlas reports cosine as (1 + cos) / 2"""
+    results = []
+    for doc in docs:
+        similarity = 2.0 * doc["score"] - 1.0
+        if similarity >= min_similarity:
+            results.append(_format_result(doc, similarity))
+    return results
+
 
+class _EmbeddingVector(BaseModel):
+    """Projection holding only what's needed to score a chunk"""
+    chunk_id: str
+    embedding: Union[bytes, List[float]]
+    normalized: bool = False
 
-def cosine_similarity(vec1: List[float], vec2: List[float]) -> float:
-    """Calculate cosine similarity between two vectors"""
-    a = np.array(vec1)
-    b = np.array(vec2)
 
-    dot_product = np.dot(a, b)
-    norm_a = np.linalg.norm(a)
-    norm_b = np.linalg.norm(b)
+class _EmbeddingBits(BaseModel):
+    """Projection holding a chunk's 1-bit code"""
+    chunk_id: str
+    embedding_bq: Optional[bytes] = None
 
-    if norm_a == 0 or norm_b == 0:
-        return 0.0
 
-    return float(dot_product / (norm_a * norm_b))
+def _vector_matrix(stored: List[Union[bytes, List[float]]], normalized: List[bool]) -> np.ndarray:
+    """
+    Stack stored embeddings into an (N, d) float32 matrix with unit-length rows.
+
+    Rows flagged normalized were scaled at ingest and are used as-is; only
+    legacy rows get their norms computed here.
+    """
+    matrix = RAGEmbeddingVector.unpack_vectors(stored)
+    stale = ~np.asarray(normalized, dtype=bool)
+    if stale.any():
+        matrix = np.array(matrix)
+        rows = matrix[stale]
+        matrix[stale] = rows / np.clip(np.linalg.norm(rows, axis=1, keepdims=True), 1e-12, None)
+    return matrix
+
+
+def _bits_matrix(codes: List[bytes]) -> np.ndarray:
+    """Stack 1-bit codes into an (N, d/8) uint8 matrix"""
+    return np.frombuffer(b"".join(codes), dtype=np.uint8).reshape(len(codes), -1)
+
+
+def _use_bits(codes: List[Optional[bytes]]) -> bool:
+    """Whether a scope is large enough, and fully quantized, for the Hamming stage"""
+    return len(codes) >= BQ_MIN_ROWS and all(codes)
+
+
+def _hamming_candidates(bits: np.ndarray, query_embedding: List[float], k: int) -> np.ndarray:
+    """Rows with the k smallest Hamming distances to the query's sign bits"""
+    query_bits = np.frombuffer(RAGEmbeddingVector.quantize_vector(query_embedding), dtype=np.uint8)
+    distances = np.bitwise_count(bits ^ query_bits).sum(axis=1, dtype=np.uint32)
+    if k >= len(distances):
+        return np.arange(len(distances))
+    return np.argpartition(distances, k)[:k]
+
+
+def _rescore(
+    query_embedding: List[float],
+    vectors: List[Tuple[str, Union[bytes, List[float]], bool]],
+    limit: int,
+    min_similarity: float
+) -> List[Tuple[str, float]]:
+    """Exact cosine ranking of (chunk_id, stored vector, normalized) rows (the rescoring stage)"""
+    if not vectors:
+        return []
+    matrix = _vector_matrix([vec for _, vec, _ in vectors], [unit for _, _, unit in vectors])
+    scores = _cosine_scores(query_embedding, matrix)
+    return [(vectors[i][0], float(scores[i])) for i in _top_matches(scores, limit, min_similarity)]
+
+
+def _join_results(ranked: List[Tuple[str, float]], docs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Attach chunk metadata to ranked (chunk_id, similarity) pairs, keeping the ranking"""
+    docs_by_chunk = {doc["chunk_id"]: doc for doc in docs}
+    return [
+        _format_result(docs_by_chunk[chunk_id], similarity)
+        for chunk_id, similarity in ranked
+        if chunk_id in docs_by_chunk
+    ]
+
+
+async def _load_vector_index(query: Dict[str, Any]) -> Optional[_VectorIndex]:
+    """Load the vectors for a search scope, as 1-bit codes when the scope is large"""
+    heads = await RAGEmbeddingVector.find(query).limit(MAX_SCAN_EMBEDDINGS).project(_EmbeddingBits).to_list()
+    if not heads:
+        return None
+    codes = [h.embedding_bq for h in heads]
+    if _use_bits(codes):
+        return _VectorIndex([h.chunk_id for h in heads], None, _bits_matrix(codes))
+
+    candidates = await RAGEmbeddingVector.find(query).limit(MAX_SCAN_EMBEDDINGS).project(_EmbeddingVector).to_list()
+    if not candidates:
+        return None
+    return _VectorIndex(
+        [c.chunk_id for c in candidates],
+        _vector_matrix([c.embedding for c in candidates], [c.normalized for c in candidates]),
+        None
+    )
+
+
+def _cosine_scores(query_embedding: List[float], matrix: np.ndarray) -> np.ndarray:
+    """Cosine scores against unit-length rows: normalize the query once, then one BLAS matrix-vector product"""
+    return matrix @ RAGEmbeddingVector.normalize_vector(query_embedding)
+
+
+def _top_matches(scores: np.ndarray, limit: int, min_similarity: float) -> List[int]:
+    """Indices of the best-scoring rows, highest first"""
+    if limit < len(scores):
+        # Partial selection is O(N); only the k winners get sorted
+        candidates = np.argpartition(-scores, limit)[:limit]
+        order = candidates[np.argsort(-scores[candidates])]
+    else:
+        order = np.argsort(-scores)
+    return [int(i) for i in order if scores[i] >= min_similarity]
+
+
+def _format_result(doc: Dict[str, Any], similarity: float) -> Dict[str, Any]:
+    """Shape a stored chunk metadata document as a search result"""
+    return {
+        "chunk_id": doc["chunk_id"],
+        "content": doc["content"],
+        "domain": doc["domain"],
+        "url": doc.get("url"),
+        "title": doc.get("title"),
+        "collection_name": doc["collection_name"],
+        "similarity": similarity,
+        "metadata": doc.get("metadata") or {},
+        "tokens": doc.get("tokens", 0)
+    }
 
 
 async def search_similar_embeddings(
@@ -81,6 +392,9 @@ async def search_similar_embeddings(
     """
     Search for similar embeddings using cosine similarity.
 
+    Only the vectors are loaded for scoring; chunk metadata is fetched
+    for the top matches afterwards.
+
     Returns list of results with:
     - chunk_id
     - content
@@ -91,43 +405,52 @@ async def search_similar_embeddings(
     - similarity
     - metadata
     """
+    if settings.ATLAS_VECTOR_SEARCH_ENABLED:
+        pipeline = _vector_search_pipeline(query_embedding, domain, collection_names, limit)
+        try:
+            docs = await RAGEmbeddingVector.aggregate(pipeline).to_list()
+            if docs:
+                return _vector_search_results(docs, min_similarity)
+            # A missing or still-building index answers with no hits instead of an error
+        except OperationFailure as e:
+            print(f"Vector search failed, falling back to in-app scoring: {e}")
+
     # Build query
     query = {}
     if domain:
-        query = RAGEmbedding.domain == domain
+        query["domain"] = domain
 
     if collection_names:
-        if query:
-            query = query & RAGEmbedding.collection_name.in_(collection_names)
-        else:
-            query = RAGEmbedding.collection_name.in_(collection_names)
-
-    # Get all embeddings (or a larger batch)
-    # Note: For production, you'd want to implement pagination or use vector DB
-    # For now, we'll get up to 10000 embeddings and score them
-    embeddings = await RAGEmbedding.find(query).limit(10000).to_list() if query else await RAGEmbedding.find().limit(10000).to_list()
-
-    # Calculate similarities
-    results = []
-    for emb in embeddings:
-        similarity = cosine_similarity(query_embedding, emb.embedding)
+        query["collection_name"] = {"$in": collection_names}
 
-        if similarity >= min_similarity:
-            results.append({
-                "chunk_id": emb.chunk_id,
-                "content": emb.content,
-                "domain": emb.domain,
-                "url": emb.url,
-                "title": emb.title,
-                "collection_name": emb.collection_name,
-                "similarity": similarity,
-                "metadata": emb.metadata,
-                "tokens": emb.tokens
-            })
-
-    # Sort by similarity (highest first) and limit
-    results.sort(key=lambda x: x["similarity"], reverse=True)
-    return results[:limit]
+    key = _vector_cache_key(domain, collection_names) if domain else None
+    index = _get_cached_index(key) if key else None
+    if index is None:
+        index = await _load_vector_index(query)
+        if index is None:
+            return []
+        if key:
+            _cache_index(key, index)
+    chunk_ids = index.chunk_ids
+
+    if index.bits is not None:
+        # Hamming pre-filter on 1-bit codes, then exact rescoring of the survivors
+        candidates = _hamming_candidates(index.bits, query_embedding, limit * BQ_RESCORE_FACTOR)
+        vectors = await RAGEmbeddingVector.find(
+            In(RAGEmbeddingVector.chunk_id, [chunk_ids[i] for i in candidates])
+        ).project(_EmbeddingVector).to_list()
+        ranked = _rescore(
+            query_embedding, [(v.chunk_id, v.embedding, v.normalized) for v in vectors], limit, min_similarity
+        )
+    else:
+        scores = _cosine_scores(query_embedding, index.matrix)
+        ranked = [(chunk_ids[i], float(scores[i])) for i in _top_matches(scores, limit, min_similarity)]
+
+    if not ranked:
+        return []
+
+    docs = await RAGEmbedding.find(In(RAGEmbedding.chunk_id, [chunk_id for chunk_id, _ in ranked])).to_list()
+    return _join_results(ranked, [doc.model_dump() for doc in docs])
 
 
 # Synchronous versions for Celery workers
@@ -141,15 +464,31 @@ def get_embedding_by_chunk_id_sync(chunk_id: str, db) -> Optional[Dict[str, Any]
 
 
 def create_embeddings_bulk_sync(embeddings_data: List[Dict[str, Any]], db) -> List[str]:
-    """Create multiple RAG embeddings in bulk (sync)"""
-    result = db.rag_embeddings.insert_many(embeddings_data)
-    return [str(id) for id in result.inserted_ids]
+    """Create multiple RAG embeddings (metadata and vectors) in bulk, skipping duplicate chunks (sync)"""
+    if not embeddings_data:
+        return []
+    split = [_split_embedding(data) for data in embeddings_data]
+    try:
+        db.rag_embedding_vectors.insert_many([vector for _, vector in split], ordered=False)
+    except BulkWriteError as e:
+        raise_unless_duplicates(e)
+
+    documents = [metadata for metadata, _ in split]
+    try:
+        inserted_ids = db.rag_embeddings.insert_many(documents, ordered=False).inserted_ids
+    except BulkWriteError as e:
+        raise_unless_duplicates(e)
+        inserted_ids = inserted_ids_after(e, documents)
+    invalidate_domain_vectors(*{data["domain"] for data in embeddings_data})
+    return [str(id) for id in inserted_ids]
 
 
 def delete_embeddings_by_domain_sync(domain: str, db) -> int:
-    """Delete all embeddings for a domain (sync)"""
-    result = db.rag_embeddings.delete_many({"domain": domain})
-    return result.deleted_count
+    """Delete all embeddings (metadata and vectors) for a domain (sync)"""
+    deleted = delete_many_batched_sync(db.rag_embeddings, {"domain": domain})
+    delete_many_batched_sync(db.rag_embedding_vectors, {"domain": domain})
+    invalidate_domain_vectors(domain)
+    return deleted
 
 
 def count_embeddings_by_domain_sync(domain: str, db) -> int:
@@ -157,6 +496,27 @@ def count_embeddings_by_domain_sync(domain: str, db) -> int:
     return db.rag_embeddings.count_documents({"domain": domain})
 
 
+def _load_vector_index_sync(query: Dict[str, Any], db) -> Optional[_VectorIndex]:
+    """Load the vectors for a search scope, as 1-bit codes when the scope is large (sync)"""
+    heads = list(db.rag_embedding_vectors.find(query, {"_id": 0, "chunk_id": 1, "embedding_bq": 1}).limit(MAX_SCAN_EMBEDDINGS))
+    if not heads:
+        return None
+    codes = [h.get("embedding_bq") for h in heads]
+    if _use_bits(codes):
+        return _VectorIndex([h["chunk_id"] for h in heads], None, _bits_matrix(codes))
+
+    candidates = list(db.rag_embedding_vectors.find(
+        query, {"_id": 0, "chunk_id": 1, "embedding": 1, "normalized": 1}
+    ).limit(MAX_SCAN_EMBEDDINGS))
+    if not candidates:
+        return None
+    return _VectorIndex(
+        [c["chunk_id"] for c in candidates],
+        _vector_matrix([c["embedding"] for c in candidates], [c.get("normalized", False) for c in candidates]),
+        None
+    )
+
+
 def search_similar_embeddings_sync(
     query_embedding: List[float],
     db,
@@ -170,6 +530,16 @@ def search_similar_embeddings_sync(
 
     Returns list of results with similarity scores.
     """
+    if settings.ATLAS_VECTOR_SEARCH_ENABLED:
+        pipeline = _vector_search_pipeline(query_embedding, domain, collection_names, limit)
+        try:
+            docs = list(db.rag_embedding_vectors.aggregate(pipeline))
+            if docs:
+                return _vector_search_results(docs, min_similarity)
+            # A missing or still-building index answers with no hits instead of an error
+        except OperationFailure as e:
+            print(f"Vector search failed, falling back to in-app scoring: {e}")
+
     # Build query
     query = {}
     if domain:
@@ -178,27 +548,36 @@ def search_similar_embeddings_sync(
     if collection_names:
         query["collection_name"] = {"$in": collection_names}
 
-    # Get embeddings
-    embeddings = list(db.rag_embeddings.find(query).limit(10000))
-
-    # Calculate similarities
-    results = []
-    for emb in embeddings:
-        similarity = cosine_similarity(query_embedding, emb["embedding"])
-
-        if similarity >= min_similarity:
-            results.append({
-                "chunk_id": emb["chunk_id"],
-                "content": emb["content"],
-                "domain": emb["domain"],
-                "url": emb.get("url"),
-                "title": emb.get("title"),
-                "collection_name": emb["collection_name"],
-                "similarity": similarity,
-                "metadata": emb.get("metadata", {}),
-                "tokens": emb.get("tokens", 0)
-            })
-
-    # Sort by similarity (highest first) and limit
-    results.sort(key=lambda x: x["similarity"], reverse=True)
-    return results[:limit]
+    # Score on vectors only, then load the winning chunks' metadata
+    key = _vector_cache_key(domain, collection_names) if domain else None
+    index = _get_cached_index(key) if key else None
+    if index is None:
+        index = _load_vector_index_sync(query, db)
+        if index is None:
+            return []
+        if key:
+            _cache_index(key, index)
+    chunk_ids = index.chunk_ids
+
+    if index.bits is not None:
+        # Hamming pre-filter on 1-bit codes, then exact rescoring of the survivors
+        candidates = _hamming_candidates(index.bits, query_embedding, limit * BQ_RESCORE_FACTOR)
+        vectors = db.rag_embedding_vectors.find(
+            {"chunk_id": {"$in": [chunk_ids[i] for i in candidates]}},
+            {"_id": 0, "chunk_id": 1, "embedding": 1, "normalized": 1}
+        )
+        ranked = _rescore(
+            query_embedding,
+            [(v["chunk_id"], v["embedding"], v.get("normalized", False)) for v in vectors],
+            limit,
+            min_similarity
+        )
+    else:
+        scores = _cosine_scores(query_embedding, index.matrix)
+        ranked = [(chunk_ids[i], float(scores[i])) for i in _top_matches(scores, limit, min_similarity)]
+
+    if not ranked:
+        return []
+
+    docs = db.rag_embeddings.find({"chunk_id": {"$in": [chunk_id for chunk_id, _ in ranked]}})
+    return _join_results(ranked, list(docs))
@@ -3,11 +3,16 @@ Database session management.
 Provides database connection and session handling.
 """
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from functools import lru_cache
+from typing import AsyncGenerator, Generator
 import os
 
+import orjson
+
 from ..core.config import get_settings
+from .unit_of_work import unit_of_work
 
 settings = get_settings()
 
@@ -27,15 +32,47 @@ else:
         "max_overflow": 20,
     }
 
-# Create database engine
+# Create database engine (orjson handles the JSON/JSONB columns)
 engine = create_engine(
     sqlalchemy_url,
     connect_args=connect_args,
+    json_serializer=lambda obj: orjson.dumps(obj).decode(),
+    json_deserializer=orjson.loads,
     **pool_settings
 )
 
 # Create SessionLocal class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# expire_on_commit=False keeps committed objects loaded, so writers don't need
+# a refresh() round-trip; server defaults are fetched via RETURNING on insert.
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+
+def _async_url(url: str) -> str:
+    """Map a sync database URL to its async driver (asyncpg / aiosqlite)."""
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url[len("sqlite://"):]
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    return url
+
+
+@lru_cache()
+def get_async_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    """
+    Async session factory for the hot read paths of async endpoints, so they
+    don't hop to the threadpool for every query.
+
+    The async engine is built on first use: Celery workers keep using
+    SessionLocal and never pay for (or need the drivers of) the async engine.
+    """
+    async_engine = create_async_engine(
+        _async_url(sqlalchemy_url),
+        json_serializer=lambda obj: orjson.dumps(obj).decode(),
+        json_deserializer=orjson.loads,
+        **pool_settings
+    )
+    return async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
 
 def get_db() -> Generator[Session, None, None]:
@@ -43,21 +80,50 @@ def get_db() -> Generator[Session, None, None]:
     Dependency for getting database session.
     Use this in FastAPI route dependencies.
 
+    The session runs as a unit of work: CRUD writes only flush, and the
+    request's changes are committed once after the endpoint returns (or
+    rolled back if it raises). Declare it with scope="function" so the
+    commit finishes before the response is sent and commit errors reach
+    the client.
+
     Yields:
         Database session
 
     Example:
         @app.get("/items")
-        def get_items(db: Session = Depends(get_db)):
+        def get_items(db: Session = Depends(get_db, scope="function")):
             return db.query(Item).all()
     """
     db = SessionLocal()
     try:
-        yield db
+        with unit_of_work(db):
+            yield db
     finally:
         db.close()
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency for getting an async database session.
+    Use this in async FastAPI routes.
+
+    The whole request runs in one transaction, committed when the endpoint
+    returns and rolled back if it raises. Declare it with scope="function"
+    so the commit finishes before the response is sent.
+
+    Yields:
+        Async database session
+
+    Example:
+        @app.get("/items/{item_id}")
+        async def get_item(item_id: int, db: AsyncSession = Depends(get_async_db, scope="function")):
+            return await db.get(Item, item_id)
+    """
+    async with get_async_sessionmaker()() as db:
+        async with db.begin():
+            yield db
+
+
 def init_db() -> None:
     """
     Initialize database tables.
@@ -0,0 +1,76 @@
+"""
+Unit-of-work helpers for SQLAlchemy sessions.
+Lets a caller (e.g. the request-scoped get_db dependency) own the
+transaction so CRUD writes inside it flush instead of committing one by one.
+"""
+from contextlib import contextmanager
+from typing import Callable, Generator
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# Session.info key marking a session whose commit is owned by an outer scope
+UNIT_OF_WORK_KEY = "unit_of_work"
+# Session.info key holding callbacks to run once the transaction commits
+AFTER_COMMIT_KEY = "after_commit_callbacks"
+
+
+def on_commit(db: Session, callback: Callable[[], None]) -> None:
+    """
+    Run callback once the session's current transaction has committed.
+
+    Use for side effects (e.g. cache invalidation) that must not become
+    visible before the data does. Callbacks are discarded on rollback.
+    """
+    db.info.setdefault(AFTER_COMMIT_KEY, []).append(callback)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit_callbacks(db: Session) -> None:
+    for callback in db.info.pop(AFTER_COMMIT_KEY, ()):
+        callback()
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_after_commit_callbacks(db: Session) -> None:
+    db.info.pop(AFTER_COMMIT_KEY, None)
+
+
+def commit_or_flush(db: Session) -> None:
+    """
+    Commit the session, or only flush it inside a unit of work.
+
+    CRUD functions call this instead of db.commit() so that standalone
+    callers (Celery tasks, scripts) keep per-call commits while API requests
+    get a single commit at the end.
+    """
+    if db.info.get(UNIT_OF_WORK_KEY):
+        db.flush()
+    else:
+        db.commit()
+
+
+@contextmanager
+def unit_of_work(db: Session) -> Generator[Session, None, None]:
+    """
+    Group all CRUD writes in the block into one transaction.
+
+    Commits once on clean exit and rolls back on error.
+
+    Example:
+        with unit_of_work(db):
+            crud_jobs.create_job(db, job)
+            crud_companies.update_company(db, company_id, update)
+    """
+    outer = db.info.get(UNIT_OF_WORK_KEY, False)
+    db.info[UNIT_OF_WORK_KEY] = True
+    try:
+        yield db
+        if not outer:
+            db.commit()
+    except Exception:
+        if not outer:
+            db.rollback()
+        raise
+    finally:
+        db.info[UNIT_OF_WORK_KEY] = outer
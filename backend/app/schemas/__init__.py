@@ -1,26 +1,35 @@
 """Pydantic schemas for request/response validation."""
-from .user import User, UserCreate, UserUpdate, Subscription, SubscriptionCreate
-from .company import (
-    Company, CompanyCreate, CompanyUpdate, CompanyWithRelations,
-    Contact, ContactCreate, SocialMedia, SocialMediaCreate,
-    EnrichmentHistory, EnrichmentHistoryCreate
-)
-from .product import Product, ProductCreate, ProductUpdate, ProductList
-from .email import (
-    EmailVerification, EmailDraft, EmailDraftCreate,
-    EmailSendRequest, EmailVerifyRequest, EmailVerifyResponse
-)
+from importlib import import_module
 
-__all__ = [
+# Schema modules are imported lazily: every caller imports a submodule
+# (e.g. `from ..schemas import job`), and importing this package should not
+# build every model's core schema along the way.
+_EXPORTS = {
     # User schemas
-    "User", "UserCreate", "UserUpdate", "Subscription", "SubscriptionCreate",
+    "User": ".user", "UserCreate": ".user", "UserUpdate": ".user",
+    "Subscription": ".user", "SubscriptionCreate": ".user",
     # Company schemas
-    "Company", "CompanyCreate", "CompanyUpdate", "CompanyWithRelations",
-    "Contact", "ContactCreate", "SocialMedia", "SocialMediaCreate",
-    "EnrichmentHistory", "EnrichmentHistoryCreate",
+    "Company": ".company", "CompanyCreate": ".company", "CompanyUpdate": ".company",
+    "CompanyWithRelations": ".company",
+    "Contact": ".company", "ContactCreate": ".company",
+    "SocialMedia": ".company", "SocialMediaCreate": ".company",
+    "EnrichmentHistory": ".company", "EnrichmentHistoryCreate": ".company",
     # Product schemas
-    "Product", "ProductCreate", "ProductUpdate", "ProductList",
+    "Product": ".product", "ProductCreate": ".product", "ProductUpdate": ".product",
+    "ProductList": ".product",
     # Email schemas
-    "EmailVerification", "EmailDraft", "EmailDraftCreate",
-    "EmailSendRequest", "EmailVerifyRequest", "EmailVerifyResponse",
-]
+    "EmailVerification": ".email", "EmailDraft": ".email", "EmailDraftCreate": ".email",
+    "EmailSendRequest": ".email", "EmailVerifyRequest": ".email",
+    "EmailVerifyResponse": ".email",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
@@ -1,7 +1,9 @@
 from typing import List, Optional, Dict, Any, Annotated
-from pydantic import BaseModel, Field, BeforeValidator
+from pydantic import BaseModel, ConfigDict, Field, BeforeValidator
 from datetime import datetime
 
+from .common import AuditedSchema
+
 # Helper for ObjectId serialization
 PyObjectId = Annotated[str, BeforeValidator(str)]
 
@@ -20,16 +22,12 @@ class CampaignUpdate(BaseModel):
     status: Optional[str] = None
     stats: Optional[Dict[str, int]] = None
 
-class Campaign(CampaignBase):
+class Campaign(CampaignBase, AuditedSchema):
     id: PyObjectId = Field(validation_alias="_id")
     user_id: str
     stats: Dict[str, int]
-    created_at: datetime
-    updated_at: datetime
 
-    class Config:
-        populate_by_name = True
-        from_attributes = True
+    model_config = ConfigDict(populate_by_name=True, from_attributes=True)
 
 # --- EmailDraft Schemas ---
 
@@ -49,7 +47,7 @@ class EmailDraftUpdate(BaseModel):
     status: Optional[str] = None
     to_emails: Optional[List[str]] = None
 
-class EmailDraft(EmailDraftBase):
+class EmailDraft(EmailDraftBase, AuditedSchema):
     id: PyObjectId = Field(validation_alias="_id")
     company_id: str
     campaign_id: Optional[str] = None
@@ -60,9 +58,5 @@ class EmailDraft(EmailDraftBase):
     last_error: Optional[str] = None
     sent: bool
     sent_at: Optional[datetime] = None
-    created_at: datetime
-    updated_at: datetime
 
-    class Config:
-        populate_by_name = True
-        from_attributes = True
\ No newline at end of file
+    model_config = ConfigDict(populate_by_name=True, from_attributes=True)
\ No newline at end of file
@@ -0,0 +1,17 @@
+"""
+Shared base schemas for ORM-backed API responses.
+"""
+from pydantic import BaseModel, ConfigDict
+from datetime import datetime
+
+
+class TimestampedSchema(BaseModel):
+    """Response schema read from an ORM row with a creation timestamp."""
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class AuditedSchema(TimestampedSchema):
+    """Response schema read from an ORM row with creation/update timestamps."""
+    updated_at: datetime
@@ -2,10 +2,23 @@
 Pydantic schemas for Company model.
 Used for request/response validation and serialization.
 """
-from pydantic import BaseModel, Field, HttpUrl
-from typing import Optional, List, Dict, Any, Union
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from typing import Optional, List, Dict, Any, Literal
 from datetime import datetime
 
+from .common import AuditedSchema
+
+# Fixed status vocabularies (see the Company document); Literal validation is
+# a set lookup instead of generic str coercion.
+VettingStatus = Literal['pending', 'approved', 'rejected']
+CrawlStatus = Literal['not_crawled', 'queued', 'crawling', 'completed', 'failed']
+RelevanceStatus = Literal['pending', 'relevant', 'irrelevant']
+
+
+def coerce_id(v: Any) -> Optional[str]:
+    """Normalize ORM ids (int, ObjectId, UUID) to the str used at the API boundary."""
+    return str(v) if v is not None else None
+
 
 class ContactBase(BaseModel):
     """Base contact schema."""
@@ -19,39 +32,47 @@ class ContactBase(BaseModel):
 
 class ContactCreate(ContactBase):
     """Schema for creating a contact."""
-    company_id: Union[str, int]
+    company_id: str
+
+    _coerce_ids = field_validator('company_id', mode='before')(coerce_id)
 
 
 class Contact(ContactBase):
     """Schema for contact in API responses."""
-    id: Union[str, int, None] = None
-    company_id: Union[str, int, None] = None
+    id: Optional[str] = None
+    company_id: Optional[str] = None
     created_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+    _coerce_ids = field_validator('id', 'company_id', mode='before')(coerce_id)
 
 
 class SocialMediaBase(BaseModel):
     """Base social media schema."""
     platform: str
-    url: str
+    url: str  # keep as str: HttpUrl parsing is far slower than plain str
     source: Optional[str] = None
 
 
 class SocialMediaCreate(SocialMediaBase):
     """Schema for creating a social media profile."""
-    company_id: Union[str, int]
+    company_id: str
+
+    model_config = ConfigDict(defer_build=True)
+
+    _coerce_ids = field_validator('company_id', mode='before')(coerce_id)
 
 
 class SocialMedia(SocialMediaBase):
     """Schema for social media in API responses."""
-    id: Union[str, int, None] = None
-    company_id: Union[str, int, None] = None
+    id: Optional[str] = None
+    company_id: Optional[str] = None
     created_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+    _coerce_ids = field_validator('id', 'company_id', mode='before')(coerce_id)
 
 
 class CompanyBase(BaseModel):
@@ -66,7 +87,9 @@ class CompanyBase(BaseModel):
 
 class CompanyCreate(CompanyBase):
     """Schema for creating a company."""
-    user_id: Union[str, int]
+    user_id: str
+
+    _coerce_ids = field_validator('user_id', mode='before')(coerce_id)
 
 
 class CompanyUpdate(BaseModel):
@@ -78,25 +101,25 @@ class CompanyUpdate(BaseModel):
     search_mode: Optional[str] = None
 
 
-class Company(CompanyBase):
+class Company(CompanyBase, AuditedSchema):
     """Schema for company in API responses."""
-    id: Union[str, int]
-    user_id: Union[str, int]
+    id: str
+    user_id: str
 
     # Vetting fields
-    vetting_status: Optional[str] = None  # pending, approved, rejected
+    vetting_status: Optional[VettingStatus] = None
     vetting_score: Optional[float] = None  # 0.0-1.0 keyword relevance score
     vetting_details: Optional[str] = None  # JSON with vetting details
     vetted_at: Optional[datetime] = None
 
     # Crawl fields
-    crawl_status: Optional[str] = None  # not_crawled, queued, crawling, completed, failed
+    crawl_status: Optional[CrawlStatus] = None
     crawl_progress: Optional[int] = None  # 0-100
     crawled_pages: Optional[int] = None  # Number of pages crawled
     crawled_at: Optional[datetime] = None
 
     # Relevance fields (for filtering companies with no relevant products)
-    relevance_status: Optional[str] = None  # pending, relevant, irrelevant
+    relevance_status: Optional[RelevanceStatus] = None
     relevance_reason: Optional[str] = None  # Reason for marking as irrelevant
 
     # Extraction and embedding
@@ -104,20 +127,15 @@ class Company(CompanyBase):
     embedded_at: Optional[datetime] = None
     enriched_at: Optional[datetime] = None
 
-    created_at: datetime
-    updated_at: datetime
-
-    class Config:
-        from_attributes = True
+    _coerce_ids = field_validator('id', 'user_id', mode='before')(coerce_id)
 
 
 class CompanyWithRelations(Company):
     """Schema for company with all related data."""
-    contacts: List[Contact] = []
-    social_media: List[SocialMedia] = []
+    contacts: List[Contact] = Field(default_factory=list)
+    social_media: List[SocialMedia] = Field(default_factory=list)
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class EnrichmentHistoryBase(BaseModel):
@@ -129,14 +147,19 @@ class EnrichmentHistoryBase(BaseModel):
 
 class EnrichmentHistoryCreate(EnrichmentHistoryBase):
     """Schema for creating enrichment history."""
-    company_id: Union[str, int]
+    company_id: str
+
+    model_config = ConfigDict(defer_build=True)
+
+    _coerce_ids = field_validator('company_id', mode='before')(coerce_id)
 
 
 class EnrichmentHistory(EnrichmentHistoryBase):
     """Schema for enrichment history in API responses."""
-    id: Union[str, int]
-    company_id: Union[str, int]
+    id: str
+    company_id: str
     enriched_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+    _coerce_ids = field_validator('id', 'company_id', mode='before')(coerce_id)
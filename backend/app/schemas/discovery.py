@@ -1,18 +1,16 @@
 """
 Pydantic schemas for discovery operations.
 """
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, Field
 
 
 class DiscoveryJobConfig(BaseModel):
-    """Configuration for discovery jobs."""
-    keywords: List[str] = Field(..., description="Keywords to search for")
-    search_engines: List[str] = Field(default=["google"], description="Search engines to use")
-    region: str = Field(default="US", description="Region for search results")
-    max_results_per_engine: int = Field(default=50, description="Max results per engine")
-    proxy_mode: str = Field(default="none", description="Proxy mode")
-    proxies: Optional[List[str]] = Field(default=None, description="Proxy URLs")
-    google_api_key: Optional[str] = Field(default=None, description="Google API key")
-    google_search_engine_id: Optional[str] = Field(default=None, description="Google search engine ID")
-    bing_api_key: Optional[str] = Field(default=None, description="Bing API key")
+    """Configuration for discovery job."""
+    keywords: List[str] = Field(..., min_length=1)
+    region: str = "US"
+    search_engines: List[str] = Field(default=["google"])
+    depth: str = "fast"  # fast, standard, deep
+    max_results: int = Field(default=100, ge=1, le=1000)
+    proxy_mode: str = "standard"  # none, standard, residential
+    filters: Optional[Dict[str, Any]] = None
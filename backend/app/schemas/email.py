@@ -2,10 +2,18 @@
 Pydantic schemas for Email-related models.
 Used for request/response validation and serialization.
 """
-from pydantic import BaseModel, EmailStr
-from typing import Optional, List, Dict, Any
+import re
+
+from pydantic import BaseModel, ConfigDict, EmailStr, field_validator
+from typing import Optional, List, Dict
 from datetime import datetime
 
+from .common import TimestampedSchema
+
+# Cheap syntactic check for bulk verify requests; the verifier itself does
+# the strict RFC/MX/SMTP checks, so per-element EmailStr parsing is wasted.
+_EMAIL_RE = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+
 
 class EmailVerificationBase(BaseModel):
     """Base email verification schema."""
@@ -22,8 +30,7 @@ class EmailVerification(EmailVerificationBase):
     verified_at: Optional[datetime] = None
     verification_time_seconds: Optional[float] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class EmailDraftBase(BaseModel):
@@ -37,16 +44,12 @@ class EmailDraftCreate(EmailDraftBase):
     company_id: int
 
 
-class EmailDraft(EmailDraftBase):
+class EmailDraft(EmailDraftBase, TimestampedSchema):
     """Schema for email draft in API responses."""
     id: int
     company_id: int
     gmail_draft_id: Optional[str] = None
     gmail_draft_created_at: Optional[datetime] = None
-    created_at: datetime
-
-    class Config:
-        from_attributes = True
 
 
 class EmailSendRequest(BaseModel):
@@ -60,7 +63,18 @@ class EmailSendRequest(BaseModel):
 
 class EmailVerifyRequest(BaseModel):
     """Schema for email verification request."""
-    emails: List[EmailStr]
+    emails: List[str]
+
+    @field_validator('emails')
+    @classmethod
+    def check_emails(cls, v: List[str]) -> List[str]:
+        """Reject malformed addresses with one precompiled regex pass."""
+        match = _EMAIL_RE.match
+        emails = [e.strip() for e in v]
+        bad = [e for e in emails if not match(e)]
+        if bad:
+            raise ValueError(f"Invalid email address(es): {', '.join(bad[:5])}")
+        return emails
 
 
 class EmailVerifyResponse(BaseModel):
@@ -2,10 +2,45 @@
 Pydantic schemas for Job model.
 Used for request/response validation and serialization.
 """
-from pydantic import BaseModel, Field, validator
-from typing import Optional, Dict, Any
+import orjson
+from pydantic import BaseModel, BeforeValidator, ConfigDict, Field, TypeAdapter
+from typing import Optional, Dict, Any, Iterable, Annotated
 from datetime import datetime
 from enum import Enum
+from uuid import UUID
+
+from .discovery import DiscoveryJobConfig  # noqa: F401
+from .common import TimestampedSchema
+
+# Serialized forms of an empty job config
+_EMPTY_CONFIG_JSON = ('', '{}', b'', b'{}')
+
+
+def _parse_result(v):
+    """Parse result JSON string to dict."""
+    # ORM rows already hold dicts; exact type checks keep that the fast path
+    if type(v) is str or type(v) is bytes:
+        try:
+            return orjson.loads(v)
+        except orjson.JSONDecodeError:
+            return None
+    return v
+
+
+def _parse_config(v):
+    """Parse config JSON string to dict."""
+    if type(v) is dict:
+        return v
+    # Most rows store no config; skip the decode and never hand None
+    # (NULL column / bad JSON) to the non-optional dict field.
+    if v is None or v in _EMPTY_CONFIG_JSON:
+        return {}
+    if type(v) is str or type(v) is bytes:
+        try:
+            return orjson.loads(v)
+        except orjson.JSONDecodeError:
+            return {}
+    return v
 
 
 class JobType(str, Enum):
@@ -47,68 +82,50 @@ class JobUpdate(BaseModel):
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
 
+    model_config = ConfigDict(defer_build=True)
 
-class JobInDB(JobBase):
+
+class JobInDB(JobBase, TimestampedSchema):
     """Schema for job as stored in database."""
-    id: str
+    id: UUID
     user_id: int
+    config: Annotated[Dict[str, Any], BeforeValidator(_parse_config)] = Field(default_factory=dict)
     status: JobStatus
     progress: int = 0
-    result: Optional[Dict[str, Any]] = None
+    result: Annotated[Optional[Dict[str, Any]], BeforeValidator(_parse_result)] = None
     error: Optional[str] = None
     celery_task_id: Optional[str] = None
-    created_at: datetime
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
-
-    @validator('result', pre=True)
-    def parse_result(cls, v):
-        """Parse result JSON string to dict."""
-        import json
-        if isinstance(v, str):
-            try:
-                return json.loads(v)
-            except json.JSONDecodeError:
-                return None
-        return v
-
-    @validator('config', pre=True)
-    def parse_config(cls, v):
-        """Parse config JSON string to dict."""
-        import json
-        if isinstance(v, str):
-            try:
-                return json.loads(v)
-            except json.JSONDecodeError:
-                return None
-        return v
-
 
 class Job(JobInDB):
     """Schema for job in API responses."""
     pass
 
 
+# Built once: validating/dumping a page of jobs through one adapter avoids
+# per-item model_validate calls and FastAPI re-validating the response model.
+_JOB_LIST_ADAPTER = TypeAdapter(list[Job])
+
+
 class JobListResponse(BaseModel):
     """Schema for paginated job list."""
     items: list[Job]
     total: int
     page: int = 1
     page_size: int = 50
+    next_cursor: Optional[str] = None  # Pass as ?cursor= to fetch the next page
 
+    @staticmethod
+    def validate_items(rows: Iterable[Any]) -> list[Job]:
+        """Validate ORM job rows into Job models in a single adapter pass."""
+        return _JOB_LIST_ADAPTER.validate_python(list(rows), from_attributes=True)
 
-class DiscoveryJobConfig(BaseModel):
-    """Configuration for discovery job."""
-    keywords: list[str] = Field(..., min_length=1)
-    region: str = "US"
-    search_engines: list[str] = Field(default=["google"])
-    depth: str = "fast"  # fast, standard, deep
-    max_results: int = Field(default=100, ge=1, le=1000)
-    proxy_mode: str = "standard"  # none, standard, residential
-    filters: Optional[Dict[str, Any]] = None
+    @staticmethod
+    def serialize_items(items: list[Job]) -> list[Dict[str, Any]]:
+        """Dump Job models to JSON-ready dicts in a single adapter pass."""
+        return _JOB_LIST_ADAPTER.dump_python(items, mode='json')
 
 
 class EnrichmentJobConfig(BaseModel):
@@ -120,6 +137,8 @@ class EnrichmentJobConfig(BaseModel):
     deep_scan: bool = False
     linkedin_enabled: bool = False
 
+    model_config = ConfigDict(defer_build=True)
+
 
 class CrawlingJobConfig(BaseModel):
     """Configuration for crawling job."""
@@ -130,6 +149,8 @@ class CrawlingJobConfig(BaseModel):
     extract_products: bool = True
     screenshot: bool = False
 
+    model_config = ConfigDict(defer_build=True)
+
 
 class JobProgressUpdate(BaseModel):
     """Schema for job progress updates (WebSocket)."""
@@ -139,3 +160,5 @@ class JobProgressUpdate(BaseModel):
     message: Optional[str] = None
     current_step: Optional[str] = None
     metadata: Optional[Dict[str, Any]] = None
+
+    model_config = ConfigDict(defer_build=True)
@@ -2,10 +2,29 @@
 Pydantic schemas for Product model.
 Used for request/response validation and serialization.
 """
-from pydantic import BaseModel, Field, HttpUrl
-from typing import Optional, List, Dict, Any, Union
+from pydantic import BaseModel, ConfigDict, Discriminator, Field, Tag, field_validator
+from typing import Optional, List, Dict, Any, Union, Annotated
 from datetime import datetime
 
+from .company import coerce_id
+
+
+def _review_kind(v: Any) -> str:
+    """Tag a review as a bare quote ('text') or a structured dict ('struct')."""
+    return 'text' if isinstance(v, str) else 'struct'
+
+
+# Reviews are either quoted strings or dicts (rating/title/text/author). A
+# callable discriminator picks the branch in one step per element instead of
+# pydantic's smart-union trying each one, and keeps the wire shape unchanged.
+Review = Annotated[
+    Union[
+        Annotated[str, Tag('text')],
+        Annotated[Dict[str, Any], Tag('struct')],
+    ],
+    Discriminator(_review_kind),
+]
+
 
 class ProductBase(BaseModel):
     """Base product schema."""
@@ -13,18 +32,21 @@ class ProductBase(BaseModel):
     brand: Optional[str] = None
     category: Optional[str] = None
     price: Optional[str] = None
+    # url fields stay str: HttpUrl parsing is far slower than plain str
     url: Optional[str] = None
     image_url: Optional[str] = None
     description: Optional[str] = None
     specs: Optional[Dict[str, Any]] = None
-    reviews: Optional[List[Union[str, Dict[str, Any]]]] = None  # Accept both strings and dicts
+    reviews: Optional[List[Review]] = None  # Accept both strings and dicts
 
 
 class ProductCreate(ProductBase):
     """Schema for creating a product."""
-    company_id: Union[str, int]
+    company_id: str
     product_external_id: Optional[str] = None
 
+    _coerce_ids = field_validator('company_id', mode='before')(coerce_id)
+
 
 class ProductUpdate(BaseModel):
     """Schema for updating a product."""
@@ -36,18 +58,19 @@ class ProductUpdate(BaseModel):
     image_url: Optional[str] = None
     description: Optional[str] = None
     specs: Optional[Dict[str, Any]] = None
-    reviews: Optional[List[Union[str, Dict[str, Any]]]] = None  # Accept both strings and dicts
+    reviews: Optional[List[Review]] = None  # Accept both strings and dicts
 
 
 class Product(ProductBase):
     """Schema for product in API responses."""
-    id: Union[str, int, None] = None
-    company_id: Union[str, int, None] = None
+    id: Optional[str] = None
+    company_id: Optional[str] = None
     product_external_id: Optional[str] = None
     created_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+    _coerce_ids = field_validator('id', 'company_id', mode='before')(coerce_id)
 
 
 class ProductList(BaseModel):
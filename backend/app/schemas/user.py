@@ -2,9 +2,10 @@
 Pydantic schemas for User model.
 Used for request/response validation and serialization.
 """
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 from typing import Optional
-from datetime import datetime
+
+from .common import AuditedSchema, TimestampedSchema
 
 
 class UserBase(BaseModel):
@@ -24,14 +25,10 @@ class UserUpdate(BaseModel):
     email: Optional[EmailStr] = None
 
 
-class UserInDB(UserBase):
+class UserInDB(UserBase, TimestampedSchema):
     """Schema for user as stored in database."""
     id: int
     auth0_id: str
-    created_at: datetime
-
-    class Config:
-        from_attributes = True
 
 
 class User(UserInDB):
@@ -50,20 +47,19 @@ class SubscriptionCreate(SubscriptionBase):
     user_id: int
     stripe_subscription_id: Optional[str] = None
 
+    model_config = ConfigDict(defer_build=True)
+
 
 class SubscriptionUpdate(BaseModel):
     """Schema for updating a subscription."""
     plan: Optional[str] = None
     status: Optional[str] = None
 
+    model_config = ConfigDict(defer_build=True)
 
-class Subscription(SubscriptionBase):
+
+class Subscription(SubscriptionBase, AuditedSchema):
     """Schema for subscription in API responses."""
     id: int
     user_id: int
     stripe_subscription_id: Optional[str] = None
-    created_at: datetime
-    updated_at: datetime
-
-    class Config:
-        from_attributes = True
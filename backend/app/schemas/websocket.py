@@ -3,9 +3,10 @@ WebSocket message schemas
 These schemas mirror the TypeScript definitions in shared/types/websocket.ts
 """
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from pydantic.dataclasses import dataclass
 from typing import Any, Optional, Literal
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
 
 
@@ -23,61 +24,69 @@ class WebSocketEventType(str, Enum):
     CAMPAIGN_UPDATED = "campaign_updated"
     EMAIL_DRAFT_UPDATED = "email_draft_updated"
 
+    def __str__(self) -> str:
+        return self.value
+
 
 class WebSocketMessage(BaseModel):
     """Base WebSocket message structure"""
     event: WebSocketEventType
     data: Any
     user_id: Optional[str] = None
-    timestamp: datetime = datetime.utcnow()
-
-    class Config:
-        use_enum_values = True
+    timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 
-# Event-specific data schemas
-class JobStartedData(BaseModel):
+# Event-specific data schemas (slotted, frozen: small and short-lived)
+@dataclass(slots=True, frozen=True)
+class JobStartedData:
     job_id: str
     job_type: str
 
 
-class JobProgressData(BaseModel):
+@dataclass(slots=True, frozen=True)
+class JobProgressData:
     job_id: str
     progress: int  # 0-100
     status_message: Optional[str] = None
 
 
-class JobCompletedData(BaseModel):
+@dataclass(slots=True, frozen=True)
+class JobCompletedData:
     job_id: str
     job_type: str
     result: Optional[Any] = None
     domain_count: Optional[int] = None
 
 
-class JobFailedData(BaseModel):
+@dataclass(slots=True, frozen=True)
+class JobFailedData:
     job_id: str
     job_type: str
     error: str
 
 
-class CompanyUpdatedData(BaseModel):
+@dataclass(slots=True, frozen=True)
+class CompanyUpdatedData:
     company_id: str
     status: Optional[str] = None
     enriched_at: Optional[datetime] = None
     fields_updated: Optional[list[str]] = None
 
 
-class CompanyLockedData(BaseModel):
+@dataclass(slots=True, frozen=True)
+class CompanyLockedData:
     company_id: str
     locked_by_user_id: str
     locked_by_user_name: Optional[str] = None
 
 
-class CompanyUnlockedData(BaseModel):
+@dataclass(slots=True, frozen=True)
+class CompanyUnlockedData:
     company_id: str
 
 
-class NotificationData(BaseModel):
+@dataclass(slots=True, frozen=True)
+class NotificationData:
     id: str
     type: Literal["info", "success", "warning", "error"]
     title: str
@@ -85,7 +94,8 @@ class NotificationData(BaseModel):
     action_url: Optional[str] = None
 
 
-class UserActivityData(BaseModel):
+@dataclass(slots=True, frozen=True)
+class UserActivityData:
     user_id: str
     user_name: str
     action: str
@@ -94,15 +104,18 @@ class UserActivityData(BaseModel):
     description: str
 
 
-class CampaignUpdatedData(BaseModel):
+@dataclass(slots=True, frozen=True)
+class CampaignUpdatedData:
     campaign_id: str
     status: Optional[str] = None
     generated_count: Optional[int] = None
     sent_count: Optional[int] = None
 
 
-class EmailDraftUpdatedData(BaseModel):
+@dataclass(slots=True, frozen=True)
+class EmailDraftUpdatedData:
     draft_id: str
     company_id: str
     status: Optional[str] = None
     gmail_draft_id: Optional[str] = None
+
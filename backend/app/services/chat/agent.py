@@ -1,7 +1,8 @@
+import asyncio
 import json
 import os
 import re
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from openai import AsyncOpenAI
 from app.db.repositories import company_repo, product_repo
 from app.services.rag.rag import query_rag as rag_query_service
@@ -154,7 +155,8 @@ class ChatAgent:
     async def search_knowledge_base(self, query: str, domain: Optional[str] = None) -> str:
         """Tool implementation: RAG search"""
         filters = {"domain": domain} if domain else None
-        chunks = rag_query_service(query, filters=filters, top_k=5)
+        # query_rag is blocking; run it off the event loop so it overlaps other tools
+        chunks = await asyncio.to_thread(rag_query_service, query, filters=filters, top_k=5)
         
         results = []
         for c in chunks:
@@ -209,26 +211,9 @@ Updated Summary:"""
             print(f"Summary update failed: {e}")
             return current_summary
 
-    async def run_chat(
-        self, 
-        user_query: str, 
-        company_domain: Optional[str] = None,
-        history: List[Dict[str, str]] = [],
-        current_summary: str = "",
-        msgs_to_summarize: List[Dict[str, str]] = []
-    ) -> Dict[str, Any]:
-        """
-        Main entry point for chat. Handles the ReAct loop (Think -> Act -> Observe).
-        """
-        
-        # 1. Update Summary (Parallel Step)
-        new_summary = current_summary
-        if msgs_to_summarize:
-            new_summary = await self.update_summary(current_summary, msgs_to_summarize)
-
-        # 2. Build Context String
-        history_str = "\n".join([f"{msg['role'].upper()}: {msg['content']}" for msg in history])
-        context_str = f"Summary of past conversation:\n{new_summary}\n\nRecent Chat History:\n{history_str}"
+    def _build_system_prompt(self, company_domain: Optional[str], summary: str, history_str: str) -> str:
+        """Build the system prompt for company-specific or global mode"""
+        context_str = f"Summary of past conversation:\n{summary}\n\nRecent Chat History:\n{history_str}"
 
         if company_domain:
             # === COMPANY SPECIFIC MODE ===
@@ -277,18 +262,107 @@ CONTEXT:
 - **Multiple Sources** > **Single Source**.
 """
 
+        return system_prompt
+
+    async def _dispatch_tool(
+        self,
+        function_name: str,
+        function_args: Dict[str, Any],
+        company_domain: Optional[str]
+    ) -> Tuple[str, Optional[Dict[str, str]]]:
+        """Run one tool call, returning (response content, source entry)"""
+        if company_domain and "domain" in function_args and not function_args["domain"]:
+            function_args["domain"] = company_domain
+
+        function_response = "{}"
+        source = None
+
+        try:
+            if function_name == "get_company_profile":
+                function_response = await self.get_company_profile(
+                    domain=function_args.get("domain") or company_domain
+                )
+                source = {"type": "tool", "name": f"Profile: {function_args.get('domain')}"}
+
+            elif function_name == "list_company_products":
+                target_domain = function_args.get("domain") or company_domain
+                function_response = await self.list_company_products(
+                    domain=target_domain,
+                    limit=function_args.get("limit", 10)
+                )
+                source = {"type": "tool", "name": f"Products: {target_domain}"}
+
+            elif function_name == "search_knowledge_base":
+                target_domain = function_args.get("domain") or company_domain
+                function_response = await self.search_knowledge_base(
+                    query=function_args.get("query"),
+                    domain=target_domain
+                )
+                source = {"type": "tool", "name": "RAG Search"}
+
+            elif function_name == "list_available_companies":
+                function_response = await self.list_available_companies(
+                    limit=function_args.get("limit", 5)
+                )
+                source = {"type": "tool", "name": "Company List"}
+
+        except Exception as e:
+            function_response = json.dumps({"error": str(e)})
+
+        return function_response, source
+
+    async def run_chat(
+        self, 
+        user_query: str, 
+        company_domain: Optional[str] = None,
+        history: List[Dict[str, str]] = [],
+        current_summary: str = "",
+        msgs_to_summarize: List[Dict[str, str]] = []
+    ) -> Dict[str, Any]:
+        """
+        Main entry point for chat. Handles the ReAct loop (Think -> Act -> Observe).
+        """
+        
+        # 1. Update Summary concurrently with the first LLM call. The first
+        # call sees the previous summary; later turns get the updated one.
+        summary_task = None
+        if msgs_to_summarize:
+            summary_task = asyncio.create_task(self.update_summary(current_summary, msgs_to_summarize))
+
+        # 2. Build Context String
+        history_str = "\n".join([f"{msg['role'].upper()}: {msg['content']}" for msg in history])
+        system_prompt = self._build_system_prompt(company_domain, current_summary, history_str)
+
         messages = [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": f"Context: Company Domain = {company_domain}\nQuestion: {user_query}" if company_domain else user_query}
         ]
 
         # First LLM call to decide on tools
-        response = await self.client.chat.completions.create(
-            model=self.model,
-            messages=messages,
-            tools=self.tools,
-            tool_choice="auto"
-        )
+        try:
+            response = await self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                tools=self.tools,
+                tool_choice="auto"
+            )
+        except BaseException:
+            if summary_task:
+                summary_task.cancel()
+            raise
+
+        new_summary = current_summary
+        if summary_task:
+            # update_summary already falls back to the old summary on errors;
+            # return_exceptions guards the response path against anything else
+            (result,) = await asyncio.gather(summary_task, return_exceptions=True)
+            if isinstance(result, str):
+                new_summary = result
+            if new_summary != current_summary:
+                messages[0] = {
+                    "role": "system",
+                    "content": self._build_system_prompt(company_domain, new_summary, history_str)
+                }
 
         response_message = response.choices[0].message
         sources = []
@@ -305,64 +379,48 @@ CONTEXT:
             if response_message.tool_calls:
                 messages.append(response_message)
                 
+                # Pass 1: parse arguments and intercept the final response
+                tool_calls = []
                 for tool_call in response_message.tool_calls:
                     function_name = tool_call.function.name
                     function_args = json.loads(tool_call.function.arguments)
-                    
+
                     # === INTERCEPT FINAL RESPONSE ===
                     if function_name == "provide_final_response":
                         raw_answer = function_args.get("answer", "")
-                        
+
                         # Clean up the answer text to remove duplicate suggestions
                         # This removes "Suggested Questions..." block if the model included it in the text
                         clean_pattern = r"(?:\n|^)(?:Suggested|Follow-up|Recommended)(?:.*)(?:Questions|Queries|Topics)(?:[:\s]*)(?:[\s\S]*)$"
                         clean_answer = re.sub(clean_pattern, "", raw_answer, flags=re.IGNORECASE | re.MULTILINE).strip()
-                        
+
                         final_answer_data = {
                             "answer": clean_answer,
                             "suggested_questions": function_args.get("suggested_questions", [])
                         }
-                        # We found the exit condition. 
-                        # We don't need to append tool output for this, we just return.
+                        # We found the exit condition.
+                        # We don't need to run the other tools or append their output, we just return.
                         break
 
-                    # Normal Tool Execution
-                    if company_domain and "domain" in function_args and not function_args["domain"]:
-                        function_args["domain"] = company_domain
+                    tool_calls.append((tool_call, function_name, function_args))
 
-                    function_response = "{}"
-                    
-                    try:
-                        if function_name == "get_company_profile":
-                            function_response = await self.get_company_profile(
-                                domain=function_args.get("domain") or company_domain
-                            )
-                            sources.append({"type": "tool", "name": f"Profile: {function_args.get('domain')}"})
-                            
-                        elif function_name == "list_company_products":
-                            target_domain = function_args.get("domain") or company_domain
-                            function_response = await self.list_company_products(
-                                domain=target_domain,
-                                limit=function_args.get("limit", 10)
-                            )
-                            sources.append({"type": "tool", "name": f"Products: {target_domain}"})
-                            
-                        elif function_name == "search_knowledge_base":
-                            target_domain = function_args.get("domain") or company_domain
-                            function_response = await self.search_knowledge_base(
-                                query=function_args.get("query"),
-                                domain=target_domain
-                            )
-                            sources.append({"type": "tool", "name": "RAG Search"})
-                        
-                        elif function_name == "list_available_companies":
-                            function_response = await self.list_available_companies(
-                                limit=function_args.get("limit", 5)
-                            )
-                            sources.append({"type": "tool", "name": "Company List"})
-
-                    except Exception as e:
-                        function_response = json.dumps({"error": str(e)})
+                if final_answer_data:
+                    break
+
+                # Pass 2: the remaining tools are independent I/O, run them concurrently
+                results = await asyncio.gather(
+                    *(self._dispatch_tool(name, args, company_domain) for _, name, args in tool_calls),
+                    return_exceptions=True
+                )
+
+                # Tool replies must follow the order of the tool_calls
+                for (tool_call, function_name, _), result in zip(tool_calls, results):
+                    if isinstance(result, BaseException):
+                        function_response = json.dumps({"error": str(result)})
+                    else:
+                        function_response, source = result
+                        if source:
+                            sources.append(source)
 
                     messages.append({
                         "tool_call_id": tool_call.id,
@@ -371,9 +429,6 @@ CONTEXT:
                         "content": function_response,
                     })
 
-                if final_answer_data:
-                    break
-
                 # Next LLM call
                 response = await self.client.chat.completions.create(
                     model=self.model,
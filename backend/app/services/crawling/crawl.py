@@ -5,7 +5,6 @@ import json
 import time
 import asyncio
 import random
-import hashlib
 from typing import List, Dict, Set, Tuple, Optional
 from urllib.parse import urlparse, urljoin, urldefrag
 from urllib import robotparser
@@ -21,20 +20,19 @@ from app.db.repositories.crawling_repo import (
     # Sync versions (for non-async code)
     get_crawl_state_sync,
     update_crawl_state_sync,
-    get_visited_urls_sync,
-    get_content_hashes_sync,
+    get_crawl_bootstrap_sync,
     is_domain_crawled_sync,
     get_crawl_status_batch_sync,
     mark_crawl_complete_sync,
-    save_crawled_page_sync,
+    save_crawled_pages_sync,
     get_crawled_page_count_sync,
     # Async versions (for async code)
-    get_visited_urls,
-    get_content_hashes,
-    save_crawled_page,
+    get_crawl_bootstrap,
+    save_crawled_pages,
     update_crawl_state,
     mark_crawl_complete
 )
+from app.core.hashing import compute_content_digest
 from app.db.mongodb_session import init_db
 
 # Note: deduplicate module needs to be created or these functions need to be implemented here
@@ -67,9 +65,6 @@ def _canonical(u: str) -> str:
     return u
 
 
-def _sha256_text(text: str) -> str:
-    return hashlib.sha256(text.encode("utf-8", errors="ignore")).hexdigest()
-
 
 def _paths(out_dir: str, base_url: str):
     host = _host(base_url).replace(':', '_')
@@ -209,7 +204,7 @@ async def _fetch_page(crawler, url: str, depth: int, host: str) -> Optional[Dict
             "domain": host,
             "title": getattr(res, 'title', None),
             "content": text,
-            "content_hash": _sha256_text(text),
+            "content_digest": compute_content_digest(text),
             "depth": depth,
             "ts": int(time.time()),
             "links": res.links.get("internal", []) if res.links else []
@@ -235,8 +230,8 @@ async def _crawl_one(base_url: str, out_path: str, visited_path: str, hashes_pat
 
     # Try to load state from MongoDB first
     try:
-        visited = set(get_visited_urls_sync(host))  # Convert to set
-        content_hashes = set(get_content_hashes_sync(host))  # Convert to set
+        # Visited URLs and content hashes in one round-trip
+        visited, content_hashes, _ = get_crawl_bootstrap_sync(host)
         use_mongodb = True
         if pbar:
             pbar.write(f"[{host}] Using MongoDB for state management")
@@ -300,32 +295,20 @@ async def _crawl_one(base_url: str, out_path: str, visited_path: str, hashes_pat
                 results = await asyncio.gather(*tasks, return_exceptions=True)
                 
                 # Process results
+                new_hashes = []
+                new_pages = []
                 for (url, depth), result in zip(batch, results):
                     if isinstance(result, Exception) or result is None:
                         continue
 
-                    h = result["content_hash"]
+                    h = result["content_digest"]
                     if h not in content_hashes:
                         content_hashes.add(h)
+                        new_hashes.append(h)
                         pages_found += 1
 
-                        # Save page to MongoDB and/or file
-                        if use_mongodb:
-                            try:
-                                save_crawled_page_sync(
-                                    domain=host,
-                                    url=result["url"],
-                                    title=result.get("title"),
-                                    content=result["content"],
-                                    content_hash=result["content_hash"],
-                                    depth=result["depth"],
-                                    links=result.get("links", [])
-                                )
-                            except Exception as e:
-                                if pbar:
-                                    pbar.write(f"[{host}] Warning: Failed to save page to MongoDB: {e}")
-                                # Fallback to file
-                                use_mongodb = False
+                        # Queue page for the batch insert into MongoDB
+                        new_pages.append({**result, "domain": host})
 
                         # Always save to file as backup
                         row = {k: v for k, v in result.items() if k != "links"}
@@ -344,13 +327,23 @@ async def _crawl_one(base_url: str, out_path: str, visited_path: str, hashes_pat
                             if nxt not in visited:
                                 queue.append((nxt, depth + 1))
                 
-                # Save state after every batch (crash-safe!)
+                # Save this batch's pages in one insert
+                if use_mongodb and new_pages:
+                    try:
+                        save_crawled_pages_sync(new_pages)
+                    except Exception as e:
+                        if pbar:
+                            pbar.write(f"[{host}] Warning: Failed to save pages to MongoDB: {e}")
+                        # Fallback to file
+                        use_mongodb = False
+
+                # Save state after every batch (crash-safe!); only this batch's URLs/hashes are new
                 if use_mongodb:
                     try:
                         update_crawl_state_sync(
                             domain=host,
-                            visited_urls=list(visited),
-                            content_hashes=list(content_hashes),
+                            visited_urls=[url for url, _ in batch],
+                            content_hashes=new_hashes,
                             is_complete=False,
                             pages_crawled=len(content_hashes)
                         )
@@ -371,8 +364,6 @@ async def _crawl_one(base_url: str, out_path: str, visited_path: str, hashes_pat
             try:
                 update_crawl_state_sync(
                     domain=host,
-                    visited_urls=list(visited),
-                    content_hashes=list(content_hashes),
                     is_complete=False,
                     pages_crawled=len(content_hashes)
                 )
@@ -562,8 +553,8 @@ async def _crawl_one_mongodb_only(base_url: str, max_pages: int = 200, max_depth
 
     # Load state from MongoDB (using async versions)
     try:
-        visited = set(await get_visited_urls(host))  # Convert to set
-        content_hashes = set(await get_content_hashes(host))  # Convert to set
+        # Visited URLs and content hashes in one round-trip
+        visited, content_hashes, _ = await get_crawl_bootstrap(host)
         if pbar:
             pbar.write(f"[{host}] Loaded state from MongoDB: {len(visited)} visited, {len(content_hashes)} unique pages")
     except Exception as e:
@@ -625,32 +616,20 @@ async def _crawl_one_mongodb_only(base_url: str, max_pages: int = 200, max_depth
                 results = await asyncio.gather(*tasks, return_exceptions=True)
 
                 # Process results
+                new_hashes = []
+                new_pages = []
                 for (url, depth), result in zip(batch, results):
                     if isinstance(result, Exception) or result is None:
                         continue
 
-                    h = result["content_hash"]
+                    h = result["content_digest"]
                     if h not in content_hashes:
                         content_hashes.add(h)
+                        new_hashes.append(h)
                         pages_found += 1
 
-                        # Save page to MongoDB ONLY (using async version)
-                        try:
-                            await save_crawled_page(
-                                domain=host,
-                                url=result["url"],
-                                title=result.get("title"),
-                                content=result["content"],
-                                content_hash=result["content_hash"],
-                                depth=result["depth"],
-                                links=result.get("links", [])
-                            )
-                        except Exception as e:
-                            import traceback
-                            if pbar:
-                                pbar.write(f"[{host}] ERROR: Failed to save page to MongoDB: {e}")
-                                pbar.write(f"[{host}] Traceback: {traceback.format_exc()}")
-                            raise  # Fail fast if MongoDB is unavailable
+                        # Queue page for the batch insert into MongoDB
+                        new_pages.append({**result, "domain": host})
 
                     # Extract links for next depth
                     if depth < max_depth:
@@ -664,12 +643,23 @@ async def _crawl_one_mongodb_only(base_url: str, max_pages: int = 200, max_depth
                             if nxt not in visited:
                                 queue.append((nxt, depth + 1))
 
-                # Save state after every batch (using async version)
+                # Save this batch's pages in one insert (using async version)
+                if new_pages:
+                    try:
+                        await save_crawled_pages(new_pages)
+                    except Exception as e:
+                        import traceback
+                        if pbar:
+                            pbar.write(f"[{host}] ERROR: Failed to save pages to MongoDB: {e}")
+                            pbar.write(f"[{host}] Traceback: {traceback.format_exc()}")
+                        raise  # Fail fast if MongoDB is unavailable
+
+                # Save state after every batch (using async version); only this batch's URLs/hashes are new
                 try:
                     await update_crawl_state(
                         domain=host,
-                        visited_urls=list(visited),
-                        content_hashes=list(content_hashes),
+                        visited_urls=[url for url, _ in batch],
+                        content_hashes=new_hashes,
                         is_complete=False,
                         pages_crawled=len(content_hashes)
                     )
@@ -685,8 +675,6 @@ async def _crawl_one_mongodb_only(base_url: str, max_pages: int = 200, max_depth
         try:
             await update_crawl_state(
                 domain=host,
-                visited_urls=list(visited),
-                content_hashes=list(content_hashes),
                 is_complete=False,
                 pages_crawled=len(content_hashes)
             )
@@ -730,7 +718,7 @@ async def crawl_domains_mongodb_only(
     This function removes all file I/O operations:
     - No gzip files
     - No visited_path, hashes_path, complete_path
-    - Everything stored in MongoDB via save_crawled_page_sync()
+    - Everything stored in MongoDB via save_crawled_pages()
 
     Args:
         domains: List of domains to crawl
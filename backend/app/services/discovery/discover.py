@@ -19,14 +19,14 @@ from queue import Queue, Empty
 
 # MongoDB repository imports
 from app.db.repositories.discovery_repo import (
-    add_discovered_domain_sync,
+    add_discovered_domains_sync,
     get_discovered_domains_set_sync,
     save_query_cache_sync,
     get_completed_queries_sync,
     save_vetting_result_sync,
     get_vetting_result_sync
 )
-from app.db.mongodb_session import init_db, close_db
+from app.db.mongodb_session import init_db, close_db, run_sync
 import asyncio
 
 # Import unified query generator
@@ -65,7 +65,7 @@ def _ensure_mongodb():
     global _mongodb_initialized
     if not _mongodb_initialized:
         try:
-            asyncio.run(init_db())
+            run_sync(init_db())
             _mongodb_initialized = True
             print("✓ MongoDB initialized for discovery service")
         except Exception as e:
@@ -297,6 +297,16 @@ def _save_query_cache(query: str, engine: str, domains: List[str]):
         print(f"Warning: Failed to save query cache for {engine}::{query}: {e}")
 
 
+def _save_discovered_domains(rows: List[Dict]):
+    """Save a page of discovered domains to MongoDB in one insert"""
+    if not rows:
+        return
+    try:
+        add_discovered_domains_sync(rows)
+    except Exception as e:
+        print(f"Warning: Failed to save {len(rows)} discovered domains: {e}")
+
+
 def discover_domains(industry: str, max_results: int = 500) -> List[str]:
     # Initialize MongoDB if not already initialized
     _ensure_mongodb()
@@ -450,6 +460,7 @@ def discover_domains(industry: str, max_results: int = 500) -> List[str]:
                                 continue
 
                         # accumulate with shared de-dup
+                        new_rows: List[Dict] = []
                         for d in page_domains:
                             with set_lock:
                                 if d in seen:
@@ -465,20 +476,14 @@ def discover_domains(industry: str, max_results: int = 500) -> List[str]:
                             with file_lock:
                                 if len(out) < max_results:
                                     out.append(d)
-                                # Save to MongoDB
-                                try:
-                                    add_discovered_domain_sync(
-                                        domain=d,
-                                        engine=engine_name,
-                                        query=q,
-                                        vetting_result=sv
-                                    )
-                                except Exception as e:
-                                    print(f"Warning: Failed to save discovered domain {d}: {e}")
+                            new_rows.append({"domain": d, "engine": engine_name, "query": q, "vetting_result": sv})
                             domains_for_query.append(d)
                             if len(out) >= max_results:
                                 break
 
+                        # Save this page's domains to MongoDB
+                        _save_discovered_domains(new_rows)
+
                         if len(out) >= max_results:
                             break
 
@@ -587,6 +592,7 @@ def discover_domains(industry: str, max_results: int = 500) -> List[str]:
                             except Exception:
                                 continue
 
+                        new_rows: List[Dict] = []
                         for d in page_domains:
                             if d not in seen:
                                 url = f"https://{d}"
@@ -596,24 +602,19 @@ def discover_domains(industry: str, max_results: int = 500) -> List[str]:
                                 seen.add(d)
                                 out.append(d)
                                 if d not in discovered_set:
-                                    # Save to MongoDB
-                                    try:
-                                        add_discovered_domain_sync(
-                                            domain=d,
-                                            engine=engine,
-                                            query=q,
-                                            vetting_result=sv
-                                        )
-                                    except Exception as e:
-                                        print(f"Warning: Failed to save discovered domain {d}: {e}")
+                                    new_rows.append({"domain": d, "engine": engine, "query": q, "vetting_result": sv})
                                     discovered_set.add(d)
                                 domains_for_query.append(d)
                                 if len(out) >= max_results:
+                                    _save_discovered_domains(new_rows)
                                     _save_query_cache(q, engine, domains_for_query)
                                     pbar.update(1)
                                     pbar.close()
                                     return out
 
+                        # Save this page's domains to MongoDB
+                        _save_discovered_domains(new_rows)
+
                         delay = max(float(pacing.get('base_delay_seconds', 3.0)), delay * 0.9)
 
                     _save_query_cache(q, engine, domains_for_query)
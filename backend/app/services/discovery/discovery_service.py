@@ -15,7 +15,7 @@ from ..vetting.enhanced_vet import vet_domains_batch, extract_domain_root
 from ...db.session import SessionLocal
 from ...db import models
 from ...db.models import Company
-from ...crud import companies as crud_companies
+from ...crud import companies as crud_companies, discovery as crud_discovery
 from ...db.repositories import company_repo
 
 logger = logging.getLogger(__name__)
@@ -377,22 +377,10 @@ class DiscoveryService:
 
         # Create or get existing discovery query record
         query_text = ", ".join(keywords)
-        discovery_query = self.db.query(models.DiscoveryQuery).filter(
-            models.DiscoveryQuery.engine == "multi",
-            models.DiscoveryQuery.query == query_text
-        ).first()
-
-        if not discovery_query:
-            discovery_query = models.DiscoveryQuery(
-                engine="multi",
-                query=query_text
-            )
-            self.db.add(discovery_query)
-            self.db.flush()  # Get the query ID
-        else:
-            logger.info(f"Reusing existing discovery query ID: {discovery_query.id}")
+        discovery_query_id = crud_discovery.get_or_create_discovery_query(self.db, "multi", query_text)
 
         saved_count = 0
+        discovered_rows = []
 
         # Save only approved domains
         for result in results:
@@ -406,20 +394,12 @@ class DiscoveryService:
                 continue
 
             try:
-                # Check if domain already exists
-                existing_domain = self.db.query(models.DiscoveredDomain).filter(
-                    models.DiscoveredDomain.domain == domain,
-                    models.DiscoveredDomain.query_id == discovery_query.id
-                ).first()
-
-                if not existing_domain:
-                    # Create discovered domain record
-                    discovered_domain = models.DiscoveredDomain(
-                        domain=domain,
-                        query_id=discovery_query.id,
-                        engine=result.get("source", "unknown")
-                    )
-                    self.db.add(discovered_domain)
+                # Discovered domain records are inserted in one batch after the loop
+                discovered_rows.append({
+                    "domain": domain,
+                    "query_id": discovery_query_id,
+                    "engine": result.get("source", "unknown")
+                })
 
                 # Only create company record if vetting approved
                 if vet_result["status"] == "approved":
@@ -443,13 +423,13 @@ class DiscoveryService:
                                 )
                                 # Create domain alias record for tracking
                                 try:
-                                    alias = models.DomainAlias(
+                                    crud_discovery.add_domain_alias(
+                                        self.db,
                                         primary_domain=existing.domain,
                                         alias_domain=domain,
                                         confidence=0.9,
                                         source="discovery_deduplication"
                                     )
-                                    self.db.add(alias)
                                 except Exception as alias_error:
                                     logger.debug(f"Could not create alias record: {alias_error}")
                                 break
@@ -500,6 +480,7 @@ class DiscoveryService:
 
         # Commit all changes
         try:
+            crud_discovery.add_discovered_domains(self.db, discovered_rows)
             self.db.commit()
             logger.info(f"Saved {saved_count} approved domains (rejected {len(rejected_vetting)})")
         except Exception as e:
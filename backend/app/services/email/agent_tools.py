@@ -1,7 +1,7 @@
-import os
 import json
 from typing import List, Dict, Optional, Any
-from pymongo import MongoClient
+
+from app.db.mongodb_session import get_sync_database
 
 # Import RAG functions (Synchronous)
 try:
@@ -10,31 +10,9 @@ except ImportError:
     # Fallback if path issues
     from backend.app.services.rag.rag import query_rag
 
-# Global client cache to avoid reconnection overhead per call if reused in same process
-_mongo_client = None
-
 def _get_db():
-    """Get synchronous MongoDB database connection."""
-    global _mongo_client
-    if _mongo_client is None:
-        mongo_uri = os.getenv("DATABASE_URL") or os.getenv("MONGODB_URI", "mongodb://mongodb:27017/b2b_osint")
-        # Parse database name
-        if "/" in mongo_uri and mongo_uri.split("/")[-1]:
-            _mongo_client = MongoClient(mongo_uri.rsplit("/", 1)[0])
-            # db_name handled below or in URI? MongoClient doesn't pick DB from URI path usually unless get_database() used
-            # But standard is client.get_database()
-        else:
-            _mongo_client = MongoClient(mongo_uri)
-    
-    # Determine DB name
-    mongo_uri = os.getenv("DATABASE_URL") or "mongodb://mongodb:27017/b2b_osint"
-    db_name = "b2b_osint"
-    if "/" in mongo_uri and mongo_uri.split("/")[-1]:
-        possible_name = mongo_uri.split("/")[-1].split("?")[0]
-        if possible_name:
-            db_name = possible_name
-            
-    return _mongo_client[db_name]
+    """Get synchronous MongoDB database connection (shared pooled client)."""
+    return get_sync_database()
 
 # ============================================================================
 # Core Company Data Tools (Synchronous)
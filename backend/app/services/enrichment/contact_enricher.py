@@ -14,7 +14,6 @@ import sys
 import json
 import time
 import logging
-import asyncio
 from pathlib import Path
 from typing import Dict, List, Optional, Set
 from dataclasses import dataclass, asdict
@@ -28,7 +27,7 @@ from app.db.repositories.company_repo import (
     get_company_by_domain,
     update_company_enrichment
 )
-from app.db.mongodb_session import init_db
+from app.db.mongodb_session import init_db, run_sync
 
 from app.services.enrichment.contact_patterns import (
     extract_phones,
@@ -51,7 +50,7 @@ def _ensure_mongodb():
     global _mongodb_initialized
     if not _mongodb_initialized:
         try:
-            asyncio.run(init_db())
+            run_sync(init_db())
             _mongodb_initialized = True
             logger.info("✓ MongoDB initialized for enrichment service")
         except Exception as e:
@@ -458,7 +457,7 @@ class ContactEnricher:
             }
 
             # Update in MongoDB
-            asyncio.run(update_company_enrichment(domain, enrichment_data))
+            run_sync(update_company_enrichment(domain, enrichment_data))
 
             logger.info(f"[{domain}] Updated MongoDB with enrichment data")
             return True
@@ -623,7 +622,7 @@ def enrich_company(domain: str, profile: Dict = None) -> EnrichmentResult:
         return enricher.enrich_from_profile(profile)
     else:
         # Load profile from MongoDB only (cloud-safe)
-        company_doc = asyncio.run(get_company_by_domain(domain))
+        company_doc = run_sync(get_company_by_domain(domain))
 
         if not company_doc:
             raise FileNotFoundError(f"Company profile not found in MongoDB for {domain}")
@@ -31,10 +31,8 @@ from app.db.repositories.product_repo import (
 from app.db.repositories.discovery_repo import (
     update_vetting_decision as update_vetting_decision_db
 )
-from app.db.mongodb_session import init_db, close_db
+from app.db.mongodb_session import init_db, close_db, run_sync
 
-# Import the event loop helper from crawling_repo
-from app.db.repositories.crawling_repo import _run_async_in_thread
 from app.core.config import settings
 
 # Path to vetting cache
@@ -112,17 +110,14 @@ def _read_crawled_pages(domain: str, output_dir: str = None, char_limit: int = 5
     Returns:
         List of page dictionaries with url, title, content, depth
     """
-    from app.db.repositories.crawling_repo import get_crawled_pages_sync
+    from app.db.repositories.crawling_repo import iter_crawled_pages_sync
 
     pages = []
     total_chars = 0
 
     try:
-        # Load pages from MongoDB
-        crawled_pages = get_crawled_pages_sync(domain, limit=1000)
-
-        # Convert to dict format expected by extraction code
-        for page in crawled_pages:
+        # Stream pages from MongoDB; stops fetching once char_limit is reached
+        for page in iter_crawled_pages_sync(domain, limit=1000):
             content = page.content or ""
             if total_chars + len(content) > char_limit:
                 break
@@ -570,7 +565,7 @@ def update_vetting_decision(domain: str, new_decision: str):
     """
     try:
         # Update in MongoDB using thread-safe async execution
-        success = _run_async_in_thread(update_vetting_decision_db(domain, new_decision))
+        success = run_sync(update_vetting_decision_db(domain, new_decision))
 
         if success:
             print(f"[{domain}] Updated vetting decision to {new_decision} in MongoDB")
@@ -619,7 +614,7 @@ def delete_crawled_data(domain: str, output_dir: str = None):
     from app.db.repositories.crawling_repo import delete_crawled_pages
 
     try:
-        deleted_count = _run_async_in_thread(delete_crawled_pages(domain))
+        deleted_count = run_sync(delete_crawled_pages(domain))
         if deleted_count > 0:
             print(f"[{domain}] Deleted {deleted_count} crawled pages from MongoDB")
         else:
@@ -638,7 +633,7 @@ def delete_extracted_data(domain: str, base_dir: str = None):
     """
     try:
         # Delete products using thread-safe async execution
-        _run_async_in_thread(delete_products_by_domain(domain))
+        run_sync(delete_products_by_domain(domain))
 
         # Company profile is stored in the Company document, handled elsewhere
         print(f"[{domain}] Deleted extracted data from MongoDB")
@@ -658,7 +653,7 @@ def save_company_data(domain: str, company_profile: Dict, products: List[Dict],
     """
     try:
         # Save company profile to MongoDB using thread-safe async execution
-        _run_async_in_thread(update_company_profile(domain, company_profile))
+        run_sync(update_company_profile(domain, company_profile))
 
         # Save products to MongoDB
         if products:
@@ -667,10 +662,10 @@ def save_company_data(domain: str, company_profile: Dict, products: List[Dict],
                 p['domain'] = domain
 
             # Delete existing products first (to replace)
-            _run_async_in_thread(delete_products_by_domain(domain))
+            run_sync(delete_products_by_domain(domain))
 
             # Create new products
-            _run_async_in_thread(create_products_bulk(products))
+            run_sync(create_products_bulk(products))
 
         print(f"[{domain}] Saved to MongoDB: company profile + {len(products)} products")
 
@@ -774,7 +769,7 @@ def get_company_data(domain: str, base_dir: str = None) -> Optional[Dict]:
     """
     try:
         # Get from MongoDB using thread-safe async execution
-        company_doc = _run_async_in_thread(get_company_by_domain(domain))
+        company_doc = run_sync(get_company_by_domain(domain))
 
         if not company_doc:
             return None
@@ -800,7 +795,7 @@ def get_company_data(domain: str, base_dir: str = None) -> Optional[Dict]:
         }
 
         # Load products using thread-safe async execution
-        products = _run_async_in_thread(get_products_by_domain(domain))
+        products = run_sync(get_products_by_domain(domain))
         if products:
             result["products"] = [
                 {
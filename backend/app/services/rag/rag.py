@@ -13,7 +13,6 @@ import os
 import sys
 import json
 import gzip
-import hashlib
 import asyncio
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
@@ -31,12 +30,11 @@ dotenv.load_dotenv()
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..'))
 
 # MongoDB repository imports
+from app.core.hashing import compute_content_hash
 from app.db.repositories.company_repo import get_company_by_domain
 from app.db.repositories.product_repo import get_products_by_domain
-from app.db.mongodb_session import init_db
+from app.db.mongodb_session import init_db, run_sync
 
-# Import the event loop helper from crawling_repo
-from app.db.repositories.crawling_repo import _run_async_in_thread
 
 # Configuration
 # DEPRECATED: These constants are kept for backward compatibility
@@ -91,10 +89,6 @@ def _get_tokenizer() -> tiktoken.Encoding:
     return tiktoken.encoding_for_model("gpt-4")
 
 
-def _sha256_text(text: str) -> str:
-    """Calculate SHA256 hash of text"""
-    return hashlib.sha256(text.encode("utf-8", errors="ignore")).hexdigest()
-
 
 def _count_tokens(text: str, tokenizer: tiktoken.Encoding) -> int:
     """Count tokens in text"""
@@ -221,19 +215,16 @@ async def prepare_raw_page_chunks_async(domain: str) -> List[Dict]:
     Returns:
         List of chunk dictionaries ready for embedding
     """
-    from app.db.repositories.crawling_repo import get_crawled_pages
+    from app.db.repositories.crawling_repo import iter_crawled_pages
 
     tokenizer = _get_tokenizer()
     chunks = []
 
     try:
-        # Load pages from MongoDB (async)
-        pages = await get_crawled_pages(domain, limit=1000)
-
-        if not pages:
-            return []
-
-        for page_idx, page in enumerate(pages):
+        # Stream pages from MongoDB (async) so only one batch is in memory
+        page_idx = -1
+        async for page in iter_crawled_pages(domain, limit=1000):
+            page_idx += 1
             try:
                 url = page.url or ""
                 title = page.title or ""
@@ -249,7 +240,7 @@ async def prepare_raw_page_chunks_async(domain: str) -> List[Dict]:
                 # Create chunk records
                 for chunk_idx, chunk_text in enumerate(page_chunks):
                     chunk_id = f"{domain}_page_{page_idx}_chunk_{chunk_idx}"
-                    content_hash = _sha256_text(chunk_text)
+                    content_hash = compute_content_hash(chunk_text)
 
                     chunk_record = {
                         "chunk_id": chunk_id,
@@ -287,19 +278,14 @@ def prepare_raw_page_chunks(domain: str, crawled_data_dir: str = None) -> List[D
     Returns:
         List of chunk dictionaries ready for embedding
     """
-    from app.db.repositories.crawling_repo import get_crawled_pages_sync
+    from app.db.repositories.crawling_repo import iter_crawled_pages_sync
 
     tokenizer = _get_tokenizer()
     chunks = []
 
     try:
-        # Load pages from MongoDB
-        pages = get_crawled_pages_sync(domain, limit=1000)
-
-        if not pages:
-            return []
-
-        for page_idx, page in enumerate(pages):
+        # Stream pages from MongoDB so only one batch is in memory
+        for page_idx, page in enumerate(iter_crawled_pages_sync(domain, limit=1000)):
             try:
                 url = page.url or ""
                 title = page.title or ""
@@ -315,7 +301,7 @@ def prepare_raw_page_chunks(domain: str, crawled_data_dir: str = None) -> List[D
                 # Create chunk records
                 for chunk_idx, chunk_text in enumerate(page_chunks):
                     chunk_id = f"{domain}_page_{page_idx}_chunk_{chunk_idx}"
-                    content_hash = _sha256_text(chunk_text)
+                    content_hash = compute_content_hash(chunk_text)
 
                     chunk_record = {
                         "chunk_id": chunk_id,
@@ -358,7 +344,7 @@ def prepare_product_chunks(domain: str, extracted_data_dir: str = None) -> List[
 
     try:
         # Get products from MongoDB using thread-safe async execution
-        product_docs = _run_async_in_thread(get_products_by_domain(domain))
+        product_docs = run_sync(get_products_by_domain(domain))
 
         if not product_docs:
             return []
@@ -386,7 +372,7 @@ def prepare_product_chunks(domain: str, extracted_data_dir: str = None) -> List[
                     parts.append(f"Reviews: {reviews_str}")
 
                 content = "\n".join(parts)
-                content_hash = _sha256_text(content)
+                content_hash = compute_content_hash(content)
 
                 product_record = {
                     "chunk_id": product_doc.product_id or f"{domain}_product_{len(products)}",
@@ -438,7 +424,7 @@ def prepare_company_chunks(domain: str, extracted_data_dir: str = None) -> List[
 
     try:
         # Get company from MongoDB using thread-safe async execution
-        company_doc = _run_async_in_thread(get_company_by_domain(domain))
+        company_doc = run_sync(get_company_by_domain(domain))
 
         if not company_doc:
             return []
@@ -470,7 +456,7 @@ def prepare_company_chunks(domain: str, extracted_data_dir: str = None) -> List[
             parts.append("Contact Information:\n" + "\n".join(contact_parts))
 
         content = "\n".join(parts)
-        content_hash = _sha256_text(content)
+        content_hash = compute_content_hash(content)
 
         company_record = {
             "chunk_id": f"{domain}_company",
@@ -779,21 +765,11 @@ def query_rag(query: str, collection_names: List[str] = None,
 
     # Query MongoDB using sync search function
     try:
-        from pymongo import MongoClient
+        from app.db.mongodb_session import get_sync_database
         from app.db.repositories.rag_repo import search_similar_embeddings_sync
 
-        # Get MongoDB connection
-        mongo_uri = os.getenv("DATABASE_URL") or os.getenv("MONGODB_URI", "mongodb://mongodb:27017/b2b_osint")
-
-        # Parse database name from URI
-        if "/" in mongo_uri and mongo_uri.split("/")[-1]:
-            db_name = mongo_uri.split("/")[-1]
-            mongo_client = MongoClient(mongo_uri.rsplit("/", 1)[0])
-        else:
-            mongo_client = MongoClient(mongo_uri)
-            db_name = os.getenv("MONGODB_DB", "b2b_osint")
-
-        mongo_db = mongo_client[db_name]
+        # Process-wide pooled client, so each query reuses open connections
+        mongo_db = get_sync_database()
 
         # Search MongoDB
         domain_filter = filters.get("domain") if filters else None
@@ -806,8 +782,6 @@ def query_rag(query: str, collection_names: List[str] = None,
             min_similarity=0.0
         )
 
-        mongo_client.close()
-
         # Format results to match expected output
         results = []
         for result in search_results:
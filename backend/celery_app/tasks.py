@@ -215,9 +215,10 @@ def crawl_company_website_task(self: Task, company_id: Union[str, int]) -> Dict[
             await crawling_repo.update_crawl_state(company_domain, is_complete=False)
             
             # Update Company model in Mongo
-            mongo_company.crawl_status = 'crawling'
-            mongo_company.crawl_progress = 0
-            await mongo_company.save()
+            await company_repo.update_company(company_domain, {
+                'crawl_status': 'crawling',
+                'crawl_progress': 0
+            })
             
         else:
             # Try SQL Fallback
@@ -254,14 +255,13 @@ def crawl_company_website_task(self: Task, company_id: Union[str, int]) -> Dict[
             
             # Update status to completed
             if mongo_company:
-                # Fetch fresh in case of race conditions, though unlikely in this flow
-                c = await company_repo.get_company_by_domain(company_domain)
-                if c:
-                    c.crawl_status = 'completed'
-                    c.crawl_progress = 100
-                    c.crawled_pages = pages_crawled
-                    c.crawled_at = datetime.utcnow()
-                    await c.save()
+                # Single $set, so fields written elsewhere meanwhile are kept
+                await company_repo.update_company(company_domain, {
+                    'crawl_status': 'completed',
+                    'crawl_progress': 100,
+                    'crawled_pages': pages_crawled,
+                    'crawled_at': datetime.utcnow()
+                })
             else:
                 # Update SQL
                 sql_company = company_crud.get_company(db, int(company_id))
@@ -285,11 +285,10 @@ def crawl_company_website_task(self: Task, company_id: Union[str, int]) -> Dict[
         else:
             # Crawl failed
             if mongo_company:
-                c = await company_repo.get_company_by_domain(company_domain)
-                if c:
-                    c.crawl_status = 'failed'
-                    c.crawl_progress = 0
-                    await c.save()
+                await company_repo.update_company(company_domain, {
+                    'crawl_status': 'failed',
+                    'crawl_progress': 0
+                })
             else:
                 sql_company = company_crud.get_company(db, int(company_id))
                 if sql_company:
@@ -365,8 +364,7 @@ def crawl_companies_batch_task(self: Task, company_ids: List[Union[str, int]], u
                     
                     # Update status
                     if source == "mongo":
-                        company.crawl_status = 'queued'
-                        await company.save()
+                        await company_repo.update_company(company.domain, {'crawl_status': 'queued'})
                     else:
                         company.crawl_status = 'queued'
                         # SQL commit later
@@ -414,11 +412,12 @@ def crawl_companies_batch_task(self: Task, company_ids: List[Union[str, int]], u
                     pages = domain_result.get("pages_crawled", 0)
                     # Update success
                     if source == "mongo":
-                        company.crawl_status = 'completed'
-                        company.crawl_progress = 100
-                        company.crawled_pages = pages
-                        company.crawled_at = datetime.utcnow()
-                        await company.save()
+                        await company_repo.update_company(company.domain, {
+                            'crawl_status': 'completed',
+                            'crawl_progress': 100,
+                            'crawled_pages': pages,
+                            'crawled_at': datetime.utcnow()
+                        })
                     else:
                         company.crawl_status = 'completed'
                         company.crawl_progress = 100
@@ -431,9 +430,10 @@ def crawl_companies_batch_task(self: Task, company_ids: List[Union[str, int]], u
                 else:
                     # Update failure
                     if source == "mongo":
-                        company.crawl_status = 'failed'
-                        company.crawl_progress = 0
-                        await company.save()
+                        await company_repo.update_company(company.domain, {
+                            'crawl_status': 'failed',
+                            'crawl_progress': 0
+                        })
                     else:
                         company.crawl_status = 'failed'
                         company.crawl_progress = 0
@@ -962,54 +962,37 @@ def embed_company_rag_task(self: Task, company_id: Union[str, int]) -> Dict[str,
         # Update variable to use resolved Mongo ID
         mongo_id_str = target_id
 
-        # Get company from MongoDB
-        from pymongo import MongoClient
+        # Get company from MongoDB (process-wide pooled pymongo client)
         from bson import ObjectId
-        import os
-
-        mongo_uri = os.getenv("DATABASE_URL") or os.getenv("MONGODB_URI", "mongodb://mongodb:27017/b2b_osint")
+        from app.db.mongodb_session import get_sync_database
 
-        # Parse database name from URI
-        if "/" in mongo_uri and mongo_uri.split("/")[-1]:
-            db_name = mongo_uri.split("/")[-1]
-            mongo_client_init = MongoClient(mongo_uri.rsplit("/", 1)[0])
-        else:
-            mongo_client_init = MongoClient(mongo_uri)
-            db_name = os.getenv("MONGODB_DB", "b2b_osint")
-
-        mongo_db_init = mongo_client_init[db_name]
+        mongo_db = get_sync_database()
 
         # Get company document
-        company_doc_for_check = mongo_db_init.companies.find_one({"_id": ObjectId(mongo_id_str)})
+        company_doc_for_check = mongo_db.companies.find_one({"_id": ObjectId(mongo_id_str)})
         if not company_doc_for_check:
-            mongo_client_init.close()
             raise ValueError(f"Company {mongo_id_str} not found")
 
         company_domain = company_doc_for_check["domain"]
-        mongo_client_init.close()
+
+        def mark_embedded():
+            """Set embedded_at and drop the owner's cached only_embedded listings/counts"""
+            from app.db.repositories.company_repo import invalidate_company_cache_sync
+
+            mongo_db.companies.update_one(
+                {"_id": ObjectId(mongo_id_str)},
+                {"$set": {"embedded_at": datetime.utcnow()}}
+            )
+            invalidate_company_cache_sync(company_doc_for_check.get("user_id"))
 
         # Embed domain data into MongoDB RAG (fully synchronous approach)
         print(f"[{company_domain}] Embedding company data into RAG...")
 
         try:
-            from app.services.rag.rag import semantic_chunk_text, _get_tokenizer, _sha256_text, _count_tokens
+            from app.services.rag.rag import semantic_chunk_text, _get_tokenizer, _count_tokens
+            from app.core.hashing import compute_content_hash
             from openai import OpenAI
             import os
-            from pymongo import MongoClient
-
-            # Get MongoDB connection
-            # Use DATABASE_URL which is set in docker-compose.yml
-            mongo_uri = os.getenv("DATABASE_URL") or os.getenv("MONGODB_URI", "mongodb://mongodb:27017/b2b_osint")
-
-            # Parse database name from URI if it's in the URI, otherwise use env var
-            if "/" in mongo_uri and mongo_uri.split("/")[-1]:
-                db_name = mongo_uri.split("/")[-1]
-                mongo_client = MongoClient(mongo_uri.rsplit("/", 1)[0])
-            else:
-                mongo_client = MongoClient(mongo_uri)
-                db_name = os.getenv("MONGODB_DB", "b2b_osint")
-
-            mongo_db = mongo_client[db_name]
 
             # Get crawled pages
             pages_cursor = mongo_db.crawled_pages.find({"domain": company_domain}).limit(1000)
@@ -1045,7 +1028,7 @@ def embed_company_rag_task(self: Task, company_id: Union[str, int]) -> Dict[str,
                     # Create chunk records
                     for chunk_idx, chunk_text in enumerate(page_chunks):
                         chunk_id = f"{company_domain}_page_{page_idx}_chunk_{chunk_idx}"
-                        content_hash = _sha256_text(chunk_text)
+                        content_hash = compute_content_hash(chunk_text)
 
                         chunk_record = {
                             "chunk_id": chunk_id,
@@ -1106,7 +1089,7 @@ def embed_company_rag_task(self: Task, company_id: Union[str, int]) -> Dict[str,
 
                     for chunk_idx, chunk_text in enumerate(product_chunks):
                         chunk_id = f"{company_domain}_product_{prod_idx}_chunk_{chunk_idx}"
-                        content_hash = _sha256_text(chunk_text)
+                        content_hash = compute_content_hash(chunk_text)
 
                         chunk_record = {
                             "chunk_id": chunk_id,
@@ -1153,7 +1136,7 @@ def embed_company_rag_task(self: Task, company_id: Union[str, int]) -> Dict[str,
 
                         for chunk_idx, chunk_text in enumerate(company_chunks):
                             chunk_id = f"{company_domain}_company_chunk_{chunk_idx}"
-                            content_hash = _sha256_text(chunk_text)
+                            content_hash = compute_content_hash(chunk_text)
 
                             chunk_record = {
                                 "chunk_id": chunk_id,
@@ -1177,7 +1160,6 @@ def embed_company_rag_task(self: Task, company_id: Union[str, int]) -> Dict[str,
             print(f"[{company_domain}] Prepared {len(raw_chunks)} chunks from pages, products, and company data")
 
             if not raw_chunks:
-                mongo_client.close()
                 return {
                     "company_id": company_id,
                     "domain": company_domain,
@@ -1204,7 +1186,6 @@ def embed_company_rag_task(self: Task, company_id: Union[str, int]) -> Dict[str,
             print(f"[{company_domain}] {len(chunks_to_embed)} new chunks to embed, {len(raw_chunks) - len(chunks_to_embed)} skipped")
 
             if not chunks_to_embed:
-                mongo_client.close()
                 return {
                     "company_id": company_id,
                     "domain": company_domain,
@@ -1217,6 +1198,7 @@ def embed_company_rag_task(self: Task, company_id: Union[str, int]) -> Dict[str,
 
             # Generate embeddings and add to MongoDB
             from openai import OpenAI
+            from app.db.repositories.rag_repo import create_embeddings_bulk_sync
             from datetime import datetime
             import time
             client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
@@ -1256,9 +1238,8 @@ def embed_company_rag_task(self: Task, company_id: Union[str, int]) -> Dict[str,
                     }
                     embedding_docs.append(embedding_doc)
 
-                # Insert into MongoDB
-                if embedding_docs:
-                    mongo_db.rag_embeddings.insert_many(embedding_docs)
+                # Insert into MongoDB (unordered; chunks embedded by a concurrent run are skipped)
+                create_embeddings_bulk_sync(embedding_docs, mongo_db)
 
                 total_embedded += len(batch)
                 print(f"[{company_domain}] Embedded batch {i//batch_size + 1}: {total_embedded}/{len(chunks_to_embed)} chunks")
@@ -1270,17 +1251,8 @@ def embed_company_rag_task(self: Task, company_id: Union[str, int]) -> Dict[str,
 
             print(f"[{company_domain}] Embedding complete: {embedding_stats.get('new_embeddings', 0)} new chunks")
 
-            # Close MongoDB connection
-            mongo_client.close()
-
             # Update company embedded_at timestamp in MongoDB
-            mongo_client_update = MongoClient(mongo_uri.rsplit("/", 1)[0] if "/" in mongo_uri and mongo_uri.split("/")[-1] else mongo_uri)
-            mongo_db_update = mongo_client_update[db_name]
-            mongo_db_update.companies.update_one(
-                {"_id": ObjectId(mongo_id_str)},
-                {"$set": {"embedded_at": datetime.utcnow()}}
-            )
-            mongo_client_update.close()
+            mark_embedded()
 
             return {
                 "company_id": str(mongo_id_str),
@@ -1298,23 +1270,11 @@ def embed_company_rag_task(self: Task, company_id: Union[str, int]) -> Dict[str,
             import traceback
             traceback.print_exc()
 
-            # Close MongoDB connection if it exists
-            try:
-                mongo_client.close()
-            except:
-                pass
-
             # Still update embedded_at to avoid re-attempting immediately
             # Note: 'company' variable is not available here, it was 'company_doc' dict
             # We need to update using pymongo directly
             try:
-                mongo_client_fail = MongoClient(mongo_uri.rsplit("/", 1)[0] if "/" in mongo_uri and mongo_uri.split("/")[-1] else mongo_uri)
-                mongo_db_fail = mongo_client_fail[db_name]
-                mongo_db_fail.companies.update_one(
-                    {"_id": ObjectId(mongo_id_str)},
-                    {"$set": {"embedded_at": datetime.utcnow()}}
-                )
-                mongo_client_fail.close()
+                mark_embedded()
             except:
                 pass
 
@@ -0,0 +1,16 @@
+-- Add full-text search vector to companies table
+-- Replaces the three ILIKE '%term%' scans in search_companies with a GIN-indexed tsvector lookup
+
+ALTER TABLE companies
+ADD COLUMN IF NOT EXISTS search_vector TSVECTOR
+GENERATED ALWAYS AS (
+    to_tsvector(
+        'english',
+        coalesce(company_name, '') || ' ' || coalesce(domain, '') || ' ' || coalesce(description, '')
+    )
+) STORED;
+
+-- GIN index for @@ lookups
+CREATE INDEX IF NOT EXISTS idx_companies_search_vector ON companies USING GIN (search_vector);
+
+COMMIT;
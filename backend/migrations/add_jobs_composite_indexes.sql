@@ -0,0 +1,10 @@
+-- Composite indexes for job listing
+-- get_jobs_by_user filters by user_id (+ optional status) and sorts by created_at DESC
+
+CREATE INDEX IF NOT EXISTS idx_jobs_user_created ON jobs(user_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_jobs_user_status_created ON jobs(user_id, status, created_at DESC);
+
+-- Covered by the (user_id, created_at) prefix
+DROP INDEX IF EXISTS idx_jobs_user_id;
+
+COMMIT;
@@ -0,0 +1,14 @@
+-- Convert jobs.id from VARCHAR ('job_' + 12 hex chars) to a native 16-byte UUID
+-- Smaller primary key index and fixed-width comparisons on every job lookup
+
+-- Legacy 'job_xxxxxxxxxxxx' IDs are mapped deterministically through md5();
+-- IDs that are already UUID strings are cast directly
+ALTER TABLE jobs
+ALTER COLUMN id TYPE uuid USING (
+    CASE
+        WHEN id LIKE 'job\_%' THEN md5(id)::uuid
+        ELSE id::uuid
+    END
+);
+
+COMMIT;
@@ -0,0 +1,19 @@
+-- Convert jobs.status from VARCHAR to a native ENUM
+-- Smaller index entries, cheaper comparisons, and invalid statuses are rejected by the database
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'job_status') THEN
+        CREATE TYPE job_status AS ENUM ('queued', 'running', 'completed', 'failed', 'cancelled');
+    END IF;
+END$$;
+
+-- Indexes on status are rebuilt around the type change
+DROP INDEX IF EXISTS idx_jobs_user_status_created;
+
+ALTER TABLE jobs
+ALTER COLUMN status TYPE job_status USING status::job_status;
+
+CREATE INDEX IF NOT EXISTS idx_jobs_user_status_created ON jobs(user_id, status, created_at DESC);
+
+COMMIT;
@@ -0,0 +1,18 @@
+-- Convert JSON-in-TEXT columns to native JSONB
+-- Values were previously written with json.dumps, so a direct cast is safe; empty strings become NULL
+
+ALTER TABLE jobs
+ALTER COLUMN config TYPE JSONB USING NULLIF(config, '')::jsonb,
+ALTER COLUMN result TYPE JSONB USING NULLIF(result, '')::jsonb;
+
+ALTER TABLE products
+ALTER COLUMN specs TYPE JSONB USING NULLIF(specs, '')::jsonb,
+ALTER COLUMN reviews TYPE JSONB USING NULLIF(reviews, '')::jsonb;
+
+ALTER TABLE contacts
+ALTER COLUMN extra_metadata TYPE JSONB USING NULLIF(extra_metadata, '')::jsonb;
+
+ALTER TABLE enrichment_history
+ALTER COLUMN details TYPE JSONB USING NULLIF(details, '')::jsonb;
+
+COMMIT;
@@ -0,0 +1,50 @@
+"""
+Rescale stored RAG embedding vectors to unit length.
+
+New vectors are normalized at ingest and flagged normalized, so search
+scores them with a plain dot product; unflagged legacy rows are normalized
+at load time until this has run. Run once to upgrade them:
+
+    python migrations/normalize_rag_embedding_vectors.py
+
+Vectors are rewritten as BSON float32 vectors with fresh 1-bit codes.
+"""
+import os
+import sys
+
+from pymongo import MongoClient, UpdateOne
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.core.config import get_settings  # noqa: E402
+from app.db.mongodb_models import RAGEmbeddingVector  # noqa: E402
+
+BATCH_SIZE = 500
+
+
+def main() -> None:
+    settings = get_settings()
+    client = MongoClient(settings.DATABASE_URL)
+    vectors = client.get_default_database(settings.MONGODB_DB)[RAGEmbeddingVector.Settings.name]
+
+    updates = []
+    rewritten = 0
+    for doc in vectors.find({"normalized": {"$ne": True}}, {"embedding": 1}):
+        unit = RAGEmbeddingVector.normalize_vector(RAGEmbeddingVector.unpack_vector(doc["embedding"]))
+        updates.append(UpdateOne({"_id": doc["_id"]}, {"$set": {
+            "embedding": RAGEmbeddingVector.pack_vector(unit),
+            "embedding_bq": RAGEmbeddingVector.quantize_vector(unit),
+            "normalized": True
+        }}))
+        if len(updates) >= BATCH_SIZE:
+            rewritten += vectors.bulk_write(updates, ordered=False).modified_count
+            updates = []
+    if updates:
+        rewritten += vectors.bulk_write(updates, ordered=False).modified_count
+
+    print(f"Normalized {rewritten} embedding vectors")
+    client.close()
+
+
+if __name__ == "__main__":
+    main()
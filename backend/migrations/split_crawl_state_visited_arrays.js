@@ -0,0 +1,35 @@
+// Move the legacy visited_urls / visited_hashes arrays out of crawl_states
+// into the visited_urls and crawl_content_hashes collections (one document
+// per URL / hash), so resumed crawls see what was visited before the split
+//
+// Run with mongosh against the application database after the app has started
+// once (init_beanie creates the unique (domain, url) and (domain, content_hash)
+// indexes $merge relies on):
+//   mongosh "$MONGODB_URI" migrations/split_crawl_state_visited_arrays.js
+
+const now = new Date();
+
+db.crawl_states.aggregate([
+    { $match: { "visited_urls.0": { $exists: true } } },
+    { $unwind: "$visited_urls" },
+    { $group: { _id: { domain: "$domain", url: "$visited_urls" } } },
+    { $project: { _id: 0, domain: "$_id.domain", url: "$_id.url", visited_at: now } },
+    { $merge: { into: "visited_urls", on: ["domain", "url"], whenMatched: "keepExisting", whenNotMatched: "insert" } }
+]);
+
+db.crawl_states.aggregate([
+    { $match: { "visited_hashes.0": { $exists: true } } },
+    { $unwind: "$visited_hashes" },
+    { $group: { _id: { domain: "$domain", content_hash: "$visited_hashes" } } },
+    { $project: { _id: 0, domain: "$_id.domain", content_hash: "$_id.content_hash", seen_at: now } },
+    { $merge: { into: "crawl_content_hashes", on: ["domain", "content_hash"], whenMatched: "keepExisting", whenNotMatched: "insert" } }
+]);
+
+// Keep the visited count the status endpoints report, then drop the arrays
+db.crawl_states.updateMany(
+    { $or: [{ visited_urls: { $exists: true } }, { visited_hashes: { $exists: true } }] },
+    [
+        { $set: { urls_visited: { $max: [{ $ifNull: ["$urls_visited", 0] }, { $size: { $ifNull: ["$visited_urls", []] } }] } } },
+        { $unset: ["visited_urls", "visited_hashes"] }
+    ]
+);
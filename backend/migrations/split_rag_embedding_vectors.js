@@ -0,0 +1,25 @@
+// Move embedding vectors out of rag_embeddings into rag_embedding_vectors
+// Chunk metadata stays in rag_embeddings; vectors are joined back on chunk_id
+//
+// Run with mongosh against the application database after the app has started
+// once (init_beanie creates the unique chunk_id index $merge relies on):
+//   mongosh "$MONGODB_URI" migrations/split_rag_embedding_vectors.js
+
+db.rag_embeddings.aggregate([
+    { $match: { embedding: { $exists: true } } },
+    { $project: { _id: 0, chunk_id: 1, domain: 1, collection_name: 1, embedding: 1, embedding_bq: 1 } },
+    { $merge: { into: "rag_embedding_vectors", on: "chunk_id", whenMatched: "keepExisting", whenNotMatched: "insert" } }
+]);
+
+db.rag_embeddings.updateMany(
+    { embedding: { $exists: true } },
+    { $unset: { embedding: "", embedding_bq: "" } }
+);
+
+// With Atlas Vector Search enabled the app creates the index on
+// rag_embedding_vectors; drop the old one (default RAG_VECTOR_INDEX_NAME) on rag_embeddings
+try {
+    db.rag_embeddings.dropSearchIndex("rag_embedding_vector");
+} catch (e) {
+    print(`No vector search index to drop on rag_embeddings: ${e.message}`);
+}